@@ -1,5 +1,13 @@
 # Stat file parsing
 from .stat_file_parser import StatObj, EventSearch, EventObj, HudObj
+from .compiled_game import CompiledGame
+from .event_query import Q
+from .corpus_index import CorpusIndex
+from .corpus_store import CorpusStore
+from .event_store import EventStore
+from .event_file import EventFile, write_event_file
+from .game_dedup import DedupIndex
+from .hud_watcher import HudTailer, AsyncHudWatcher
 
 # Lookup tables and translation
 from .lookup import (
@@ -22,6 +30,7 @@ from .api import (
 
 # Web API client
 from .rio_web import RioWeb
+from .async_rio_web import AsyncRioWeb
 
 # Custom exceptions
 from .exceptions import RioAPIError, RioAuthError, RioNotFoundError
@@ -0,0 +1,340 @@
+"""Asyncio client for the Project Rio API's data endpoints.
+
+Dashboards fan out dozens of stat queries at once (per character, per user);
+through RioWeb's synchronous session they run one after another. AsyncRioWeb
+mirrors RioWeb's data methods as coroutines over one pooled aiohttp session,
+so they can be awaited together:
+
+    async with AsyncRioWeb(max_concurrency=8) as client:
+        frames = await asyncio.gather(*(client.get_stats(char_id=c, by_user=True)
+                                         for c in range(54)))
+
+Parameters, errors (RioAPIError and subclasses) and the returned DataFrames
+(or ``raw=True`` dicts) are the same as RioWeb's; the response processing is
+RioWeb's own. At most ``max_concurrency`` requests are in flight at a time,
+which also bounds the connections the pool opens; the rest wait their turn.
+The game-mode names get_games resolves come from the same CompleterCache,
+filled off the event loop.
+
+Season-scale get_events / get_landing_data pulls time out or balloon in one
+response. With ``split="games"`` (the ``games`` list) or ``split="time"``
+(the ``start_time``/``end_time`` window) the request is cut into pieces that
+are fetched concurrently and concatenated, in order, into one frame:
+
+    landing = await client.get_landing_data(tag=["Ranked"], start_time=t0, end_time=t1,
+                                            split="time")
+
+Pieces are carved as slots free up, and their size adapts so that a response
+takes about ``target_seconds``: it grows (at most 2x per response) while
+responses are fast and shrinks while they are slow. A piece that times out,
+loses its connection or gets a 5xx is split in half and fetched again; only
+a failure at the smallest size (one game, one minute) is raised. Time
+windows are inclusive and don't overlap; the last one ends at ``end_time``.
+RioWeb's get_events / get_landing_data take the same ``split=`` (from a
+running event loop, as in Jupyter, they fetch on a worker thread).
+
+Requires aiohttp: ``pip install pyrio[async]``.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Callable, Optional, Union
+
+import pandas as pd
+
+from . import json_backend
+from .api import (
+    Endpoint,
+    EventsParameterList,
+    GamesParameterList,
+    LandingDataParameterList,
+    StarChancesParameterList,
+    StatsParameterList,
+)
+from .exceptions import RioAPIError, raise_for_status
+from .rio_web import BASE_URL, RioWeb, _load_key_from_file
+
+logger = logging.getLogger(__name__)
+
+# per split mode: the first piece size and the smallest one (games / seconds)
+_SPLIT_START = {"games": 100, "time": 7 * 86400}
+_SPLIT_MIN = {"games": 1, "time": 60}
+_SPLIT_GROWTH = 2.0
+
+
+def _aiohttp():
+    try:
+        import aiohttp
+    except ImportError:
+        raise ImportError("AsyncRioWeb requires aiohttp. Install it with `pip install pyrio[async]`.") from None
+    return aiohttp
+
+
+def _query_items(params: dict) -> list[tuple[str, str]]:
+    # the query string requests builds: lists as repeated keys, values as str()
+    items = []
+    for key, value in params.items():
+        for item in value if isinstance(value, (list, tuple)) else [value]:
+            items.append((key, str(item)))
+    return items
+
+
+def _event_rows(response: dict) -> list:
+    return response.get("Events", response.get("events", []))
+
+
+def _landing_rows(response: dict) -> list:
+    return response.get("Data", [])
+
+
+class _Chunker:
+    """Carves a request into pieces on demand; the piece size follows response times.
+
+    A piece is a half-open range of positions in the games list, or of seconds.
+    """
+
+    def __init__(self, split: str, params: dict, size: Optional[int], target_seconds: float):
+        if split not in _SPLIT_START:
+            raise ValueError(f'Invalid split {split!r}. Choose "games" or "time".')
+        self.split = split
+        self.params = params
+        self.target_seconds = target_seconds
+        self.min_size = _SPLIT_MIN[split]
+        self.size = float(max(size or _SPLIT_START[split], self.min_size))
+        self._retry: list[tuple[int, int]] = []
+        if split == "games":
+            self._key = next((key for key in ("games", "game_list") if params.get(key)), None)
+            if self._key is None:
+                raise ValueError('split="games" needs a games (or game_list) parameter')
+            self._items = list(params[self._key])
+            self._next, self._stop = 0, len(self._items)
+        else:
+            if params.get("start_time") is None:
+                raise ValueError('split="time" needs a start_time parameter')
+            end_time = params.get("end_time")
+            self._next = int(params["start_time"])
+            # the request's window is inclusive; pieces are half-open
+            self._stop = int(end_time if end_time is not None else time.time()) + 1
+
+    def next_piece(self) -> Optional[tuple[int, int]]:
+        if self._retry:
+            return self._retry.pop()
+        if self._next >= self._stop:
+            return None
+        low = self._next
+        self._next = min(low + int(self.size), self._stop)
+        return low, self._next
+
+    def params_for(self, piece: tuple[int, int]) -> dict:
+        low, high = piece
+        params = dict(self.params)
+        if self.split == "games":
+            params[self._key] = self._items[low:high]
+        else:
+            params["start_time"], params["end_time"] = low, high - 1
+        return params
+
+    def finished(self, seconds: float) -> None:
+        ratio = self.target_seconds / max(seconds, 1e-3)
+        ratio = min(_SPLIT_GROWTH, max(1 / _SPLIT_GROWTH, ratio))
+        self.size = max(self.min_size, self.size * ratio)
+
+    def failed(self, piece: tuple[int, int]) -> bool:
+        """Queues the two halves of a failed piece; False if it can't be split."""
+        low, high = piece
+        self.size = max(self.min_size, self.size / 2)
+        if high - low <= self.min_size:
+            return False
+        middle = (low + high) // 2
+        self._retry += [(middle, high), (low, middle)]
+        return True
+
+
+class _Response:
+    # the parts of a requests.Response that raise_for_status reads
+    def __init__(self, status: int, headers, text: str):
+        self.status_code = status
+        self.ok = status < 400
+        self.headers = headers
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class AsyncRioWeb:
+    """Async counterpart of RioWeb's data endpoints.
+
+    Usage:
+        async with AsyncRioWeb() as client:          # key from env or rio_key.json
+            games_df = await client.get_games(tag=["tournament"])
+
+    Close it (or use ``async with``) to release the pooled connections.
+    """
+
+    def __init__(self, rio_key: str = None, base_url: str = BASE_URL, cache_dir: str = None,
+                 max_concurrency: int = 8, timeout: float = 300):
+        if max_concurrency < 1:
+            raise ValueError(f'Invalid max_concurrency {max_concurrency}. Must be at least 1.')
+        self.rio_key = rio_key or os.environ.get("PYRIO_KEY") or _load_key_from_file()
+        if not self.rio_key:
+            print("WARNING: No Rio API key found. Set PYRIO_KEY env var, pass rio_key=, or create rio_key.json.")
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._cache_dir = cache_dir
+        self._session = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._sync_client: Optional[RioWeb] = None
+
+    @property
+    def cache(self):
+        """The CompleterCache of game mode / user lookups (shared with a RioWeb)."""
+        if self._sync_client is None:
+            self._sync_client = RioWeb(rio_key=self.rio_key, base_url=self.base_url, cache_dir=self._cache_dir)
+        return self._sync_client.cache
+
+    # -------------------------------------------------------------------------
+    # Session
+    # -------------------------------------------------------------------------
+
+    def _open(self):
+        # created on first use, inside the running loop
+        if self._session is None or self._session.closed:
+            aiohttp = _aiohttp()
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                headers={"Content-Type": "application/json"},
+                timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> AsyncRioWeb:
+        self._open()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _get(self, endpoint: str, params: dict = None) -> dict:
+        session = self._open()
+        async with self._semaphore:
+            async with session.get(self.base_url + endpoint, params=_query_items(params or {})) as response:
+                body = await response.read()
+                if response.status >= 400:
+                    raise_for_status(_Response(response.status, response.headers,
+                                               body.decode("utf-8", errors="replace")))
+        return json_backend.loads(body)
+
+    @staticmethod
+    def _retryable(ex: BaseException) -> bool:
+        if isinstance(ex, RioAPIError):
+            return ex.status_code >= 500
+        return isinstance(ex, (asyncio.TimeoutError, _aiohttp().ClientError))
+
+    async def _timed_get(self, endpoint: str, params: dict, timeout: float) -> tuple[float, dict]:
+        start = time.monotonic()
+        response = await asyncio.wait_for(self._get(endpoint, params), timeout)
+        return time.monotonic() - start, response
+
+    async def _get_split(self, endpoint: str, serialized: dict, rows_of: Callable[[dict], list],
+                         split: str, chunk_size: Optional[int], target_seconds: float) -> list:
+        """The rows of every piece of a split request, in request order."""
+        chunker = _Chunker(split, serialized, chunk_size, target_seconds)
+        # a slow piece is shrunk for next time; only a hung one is cut off
+        timeout = min(self.timeout, max(10 * target_seconds, 30.0))
+        results: dict[int, list] = {}
+        pending: dict[asyncio.Future, tuple[int, int]] = {}
+        try:
+            while True:
+                while len(pending) < self.max_concurrency:
+                    piece = chunker.next_piece()
+                    if piece is None:
+                        break
+                    fetch = self._timed_get(endpoint, chunker.params_for(piece), timeout)
+                    pending[asyncio.ensure_future(fetch)] = piece
+                if not pending:
+                    break
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    piece = pending.pop(task)
+                    try:
+                        seconds, response = task.result()
+                    except Exception as ex:
+                        if not self._retryable(ex) or not chunker.failed(piece):
+                            raise
+                        logger.info("%s piece %s failed (%r); fetching it in halves", endpoint, piece, ex)
+                        continue
+                    chunker.finished(seconds)
+                    results[piece[0]] = rows_of(response)
+        finally:
+            for task in pending:
+                task.cancel()
+        return [row for low in sorted(results) for row in results[low]]
+
+    # -------------------------------------------------------------------------
+    # Data endpoints (GET) - return DataFrames by default, raw=True for dict
+    # -------------------------------------------------------------------------
+
+    async def get_games(self, params: Union[GamesParameterList, dict] = None, raw: bool = False, **kwargs) -> Union[pd.DataFrame, dict]:
+        """Fetch games data. Returns a DataFrame with winner/loser columns, timestamps, and resolved names."""
+        serialized = RioWeb._serialize_params(params, kwargs)
+        response = await self._get(Endpoint.GAMES, serialized)
+        if raw:
+            return response
+        # the game-mode lookup may hit the network; keep it off the loop
+        await asyncio.to_thread(self.cache.game_mode_dictionary)
+        return RioWeb._process_games(self, response)
+
+    async def get_stats(self, params: Union[StatsParameterList, dict] = None, raw: bool = False, **kwargs) -> Union[pd.DataFrame, dict]:
+        """Fetch stats data. Returns a DataFrame with grouping columns and flat stat columns (Category_stat)."""
+        serialized = RioWeb._serialize_params(params, kwargs)
+        response = await self._get(Endpoint.STATS, serialized)
+        if raw:
+            return response
+        return RioWeb._process_stats(response, serialized)
+
+    async def get_events(self, params: Union[EventsParameterList, dict] = None, raw: bool = False,
+                         split: str = None, chunk_size: int = None, target_seconds: float = 10.0,
+                         **kwargs) -> Union[pd.DataFrame, dict]:
+        """Fetch event-level data. ``split`` fetches it in concurrent pieces (see module docs)."""
+        serialized = RioWeb._serialize_params(params, kwargs)
+        if split is not None:
+            rows = await self._get_split(Endpoint.EVENTS, serialized, _event_rows,
+                                         split, chunk_size, target_seconds)
+            return {"Events": rows} if raw else pd.DataFrame(rows)
+        response = await self._get(Endpoint.EVENTS, serialized)
+        if raw:
+            return response
+        return pd.DataFrame(response.get("Events", response.get("events", [])))
+
+    async def get_landing_data(self, params: Union[LandingDataParameterList, dict] = None, raw: bool = False,
+                               split: str = None, chunk_size: int = None, target_seconds: float = 10.0,
+                               **kwargs) -> Union[pd.DataFrame, dict]:
+        """Fetch landing data (ball contact/landing positions). ``split`` as in get_events."""
+        serialized = RioWeb._serialize_params(params, kwargs)
+        if split is not None:
+            rows = await self._get_split(Endpoint.LANDING_DATA, serialized, _landing_rows,
+                                         split, chunk_size, target_seconds)
+            return {"Data": rows} if raw else pd.DataFrame(rows)
+        response = await self._get(Endpoint.LANDING_DATA, serialized)
+        if raw:
+            return response
+        return pd.DataFrame(response.get("Data", []))
+
+    async def get_star_chances(self, params: Union[StarChancesParameterList, dict] = None, raw: bool = False, **kwargs) -> Union[pd.DataFrame, dict]:
+        """Fetch star chance data."""
+        serialized = RioWeb._serialize_params(params, kwargs)
+        response = await self._get(Endpoint.STAR_CHANCES, serialized)
+        if raw:
+            return response
+        return pd.DataFrame(response.get("Star Chances", response.get("star_chances", [])))
@@ -0,0 +1,371 @@
+"""Columnar ("compiled") view of a stat file's events.
+
+A decoded stat file stores its events as a list of nested dicts, and every
+EventObj accessor walks ``statJson['Events'][i]`` again. For corpus-wide work
+that dict walking dominates, so this module compiles the events of one game
+into a struct-of-arrays: one NumPy array per field, indexed by event position
+(the same index EventObj and EventSearch use).
+
+    cg = stat.compiled()                 # built once per StatObj, then cached
+    cg.inning                            # int16 array, one entry per event
+                                         # (decoded on first access, then cached)
+    cg["pitch_type"][cg.has_pitch]       # encoded pitch types of real pitches
+    np.flatnonzero(cg.has_contact)       # event indices with a contact
+
+Conventions:
+  - Categorical fields are stored ENCODED (the LookupDicts code), whichever
+    flavor of stat file they came from; unknown labels encode as -1.
+  - The nested Pitch / Contact / First Fielder dicts have validity masks
+    (``has_pitch``, ``has_contact``, ``has_fielder``). Where a mask is False,
+    integer columns hold -1 and float columns hold NaN.
+  - Comma-grouped numeric strings ("1,722") are parsed as numbers.
+"""
+from __future__ import annotations
+
+import functools
+import math
+from collections.abc import Mapping
+from typing import Callable
+
+import numpy as np
+
+from .lookup import LookupDicts
+
+MISSING_INT = -1
+
+
+def _reverse(table: dict) -> dict:
+    # label -> code, keeping the first code for labels listed twice
+    # (e.g. FIELDER_BOBBLES "None" is both 0 and 255).
+    rev = {}
+    for code, label in table.items():
+        if isinstance(code, int):
+            rev.setdefault(label, code)
+    return rev
+
+
+def _to_int(value) -> int:
+    if value is None:
+        return MISSING_INT
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    try:
+        return int(str(value).replace(',', ''))
+    except ValueError:
+        return MISSING_INT
+
+
+def _to_float(value) -> float:
+    if value is None:
+        return math.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace(',', ''))
+    except ValueError:
+        return math.nan
+
+
+def _encoder(table: dict):
+    rev = _reverse(table)
+    codes = set(rev.values())
+
+    def encode(value) -> int:
+        if isinstance(value, int):
+            return value if value in codes else MISSING_INT
+        return rev.get(value, MISSING_INT)
+    return encode
+
+
+_CHAR = _encoder(LookupDicts.CHAR_NAME)
+
+# (column, stat-file key, dtype, converter) per nesting level.
+EVENT_FIELDS = [
+    ('event_num', 'Event Num', np.int32, _to_int),
+    ('inning', 'Inning', np.int16, _to_int),
+    ('half_inning', 'Half Inning', np.int8, _to_int),
+    ('away_score', 'Away Score', np.int16, _to_int),
+    ('home_score', 'Home Score', np.int16, _to_int),
+    ('balls', 'Balls', np.int8, _to_int),
+    ('strikes', 'Strikes', np.int8, _to_int),
+    ('outs', 'Outs', np.int8, _to_int),
+    ('star_chance', 'Star Chance', np.int8, _to_int),
+    ('away_stars', 'Away Stars', np.int8, _to_int),
+    ('home_stars', 'Home Stars', np.int8, _to_int),
+    ('pitcher_stamina', 'Pitcher Stamina', np.int8, _to_int),
+    ('chem_links', 'Chemistry Links on Base', np.int8, _to_int),
+    ('pitcher_roster_loc', 'Pitcher Roster Loc', np.int8, _to_int),
+    ('batter_roster_loc', 'Batter Roster Loc', np.int8, _to_int),
+    ('catcher_roster_loc', 'Catcher Roster Loc', np.int8, _to_int),
+    ('rbi', 'RBI', np.int8, _to_int),
+    ('outs_during_play', 'Num Outs During Play', np.int8, _to_int),
+    ('result_of_ab', 'Result of AB', np.int16, _encoder(LookupDicts.FINAL_RESULT)),
+]
+
+PITCH_FIELDS = [
+    ('pitch_type', 'Pitch Type', np.int16, _encoder(LookupDicts.PITCH_TYPE)),
+    ('charge_type', 'Charge Type', np.int16, _encoder(LookupDicts.CHARGE_TYPE)),
+    ('star_pitch', 'Star Pitch', np.int8, _to_int),
+    ('pitch_speed', 'Pitch Speed', np.int16, _to_int),
+    ('ball_position_strikezone', 'Ball Position - Strikezone', np.float64, _to_float),
+    ('in_strikezone', 'In Strikezone', np.int8, _to_int),
+    ('bat_contact_x', 'Bat Contact Pos - X', np.float64, _to_float),
+    ('bat_contact_z', 'Bat Contact Pos - Z', np.float64, _to_float),
+    ('dickball', 'DB', np.int8, _to_int),
+    ('swing_type', 'Type of Swing', np.int16, _encoder(LookupDicts.TYPE_OF_SWING)),
+]
+
+CONTACT_FIELDS = [
+    ('contact_type', 'Type of Contact', np.int16, _encoder(LookupDicts.CONTACT_TYPE)),
+    ('charge_power_up', 'Charge Power Up', np.float64, _to_float),
+    ('charge_power_down', 'Charge Power Down', np.float64, _to_float),
+    ('five_star_swing', 'Star Swing Five-Star', np.int8, _to_int),
+    ('stick_direction', 'Input Direction - Stick', np.int16, _encoder(LookupDicts.STICK_DIRECTION)),
+    ('contact_frame', 'Frame of Swing Upon Contact', np.int16, _to_int),
+    ('ball_power', 'Ball Power', np.int32, _to_int),
+    ('vert_angle', 'Vert Angle', np.int32, _to_int),
+    ('horiz_angle', 'Horiz Angle', np.int32, _to_int),
+    ('contact_absolute', 'Contact Absolute', np.float64, _to_float),
+    ('contact_quality', 'Contact Quality', np.float64, _to_float),
+    ('rng1', 'RNG1', np.int32, _to_int),
+    ('rng2', 'RNG2', np.int32, _to_int),
+    ('rng3', 'RNG3', np.int32, _to_int),
+    ('velocity_x', 'Ball Velocity - X', np.float64, _to_float),
+    ('velocity_y', 'Ball Velocity - Y', np.float64, _to_float),
+    ('velocity_z', 'Ball Velocity - Z', np.float64, _to_float),
+    ('contact_x', 'Ball Contact Pos - X', np.float64, _to_float),
+    ('contact_z', 'Ball Contact Pos - Z', np.float64, _to_float),
+    ('landing_x', 'Ball Landing Position - X', np.float64, _to_float),
+    ('landing_y', 'Ball Landing Position - Y', np.float64, _to_float),
+    ('landing_z', 'Ball Landing Position - Z', np.float64, _to_float),
+    ('max_height', 'Ball Max Height', np.float64, _to_float),
+    ('hang_time', 'Ball Hang Time', np.int32, _to_int),
+    ('primary_result', 'Contact Result - Primary', np.int16, _encoder(LookupDicts.PRIMARY_CONTACT_RESULT)),
+    ('secondary_result', 'Contact Result - Secondary', np.int16, _encoder(LookupDicts.SECONDARY_CONTACT_RESULT)),
+]
+
+FIELDER_FIELDS = [
+    ('fielder_roster_loc', 'Fielder Roster Location', np.int8, _to_int),
+    ('fielder_position', 'Fielder Position', np.int16, _encoder(LookupDicts.POSITION)),
+    ('fielder_char', 'Fielder Character', np.int16, _CHAR),
+    ('fielder_action', 'Fielder Action', np.int16, _encoder(LookupDicts.FIELDER_ACTIONS)),
+    ('fielder_bobble', 'Fielder Bobble', np.int16, _encoder(LookupDicts.FIELDER_BOBBLES)),
+    ('fielder_manual_select', 'Fielder Manual Selected', np.int16, _encoder(LookupDicts.MANUAL_SELECT)),
+    ('fielder_x', 'Fielder Position - X', np.float64, _to_float),
+    ('fielder_y', 'Fielder Position - Y', np.float64, _to_float),
+    ('fielder_z', 'Fielder Position - Z', np.float64, _to_float),
+]
+
+_RUNNER_KEYS = ('Runner 1B', 'Runner 2B', 'Runner 3B')
+_STEAL = _encoder(LookupDicts.STEAL_TYPE)
+_NO_STEAL = (0, 255)
+
+# Columns derived from the event rather than copied from one key.
+DERIVED_FIELDS = [
+    ('runner_1b', np.bool_),
+    ('runner_2b', np.bool_),
+    ('runner_3b', np.bool_),
+    ('steal', np.bool_),
+    ('batter_char', np.int16),
+    ('pitcher_char', np.int16),
+    ('has_pitch', np.bool_),
+    ('has_contact', np.bool_),
+    ('has_fielder', np.bool_),
+]
+
+# Full schema: column -> dtype.
+SCHEMA = {name: np.dtype(dtype) for name, _key, dtype, _conv in
+          EVENT_FIELDS + PITCH_FIELDS + CONTACT_FIELDS + FIELDER_FIELDS}
+SCHEMA.update({name: np.dtype(dtype) for name, dtype in DERIVED_FIELDS})
+
+
+def _missing(dtype) -> object:
+    return math.nan if np.dtype(dtype).kind == 'f' else MISSING_INT
+
+
+def _column(values: list, dtype) -> np.ndarray:
+    return np.asarray(values, dtype=dtype) if values else np.empty(0, dtype=dtype)
+
+
+class _Sections:
+    # the Pitch / Contact / First Fielder dict of every event ({} if absent),
+    # shared by the columns of a section
+    def __init__(self, events: list[dict]):
+        self._events = events
+
+    @functools.cached_property
+    def pitch(self) -> list[dict]:
+        return [ev.get('Pitch') or {} for ev in self._events]
+
+    @functools.cached_property
+    def contact(self) -> list[dict]:
+        return [(pitch.get('Contact') or {}) if pitch else {} for pitch in self.pitch]
+
+    @functools.cached_property
+    def fielder(self) -> list[dict]:
+        return [(contact.get('First Fielder') or {}) if contact else {} for contact in self.contact]
+
+
+def _event_column(events, key, dtype, conv) -> np.ndarray:
+    return _column([conv(ev.get(key)) for ev in events], dtype)
+
+
+def _section_column(sections, section, key, dtype, conv) -> np.ndarray:
+    missing = _missing(dtype)
+    return _column([conv(values.get(key)) if values else missing
+                    for values in getattr(sections, section)], dtype)
+
+
+def _mask_column(sections, section) -> np.ndarray:
+    return _column([bool(values) for values in getattr(sections, section)], np.bool_)
+
+
+def _runner_column(events, runner_key) -> np.ndarray:
+    return _column([bool(ev.get(runner_key)) for ev in events], np.bool_)
+
+
+def _steal_column(events) -> np.ndarray:
+    def steal(ev) -> bool:
+        for runner_key in _RUNNER_KEYS:
+            runner = ev.get(runner_key)
+            if runner and _STEAL(runner.get('Steal')) not in _NO_STEAL:
+                return True
+        return False
+    return _column([steal(ev) for ev in events], np.bool_)
+
+
+def _char_column(events, roster_codes, batting: bool) -> np.ndarray:
+    # the batter's or pitcher's character, from the roster of the side at bat
+    # or in the field
+    if roster_codes is None:
+        return np.full(len(events), MISSING_INT, dtype=np.int16)
+    key = 'Batter Roster Loc' if batting else 'Pitcher Roster Loc'
+    chars = []
+    for ev in events:
+        char = MISSING_INT
+        half = ev.get('Half Inning')
+        if half in (0, 1):
+            try:
+                char = roster_codes[half if batting else 1 - half][ev[key]]
+            except (KeyError, IndexError, TypeError):
+                pass
+        chars.append(char)
+    return _column(chars, np.int16)
+
+
+class LazyColumns(Mapping):
+    """Column mapping whose columns are built on first access, then cached."""
+
+    def __init__(self, builders: dict[str, Callable[[], np.ndarray]]):
+        self._builders = builders
+        self._built: dict[str, np.ndarray] = {}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        column = self._built.get(name)
+        if column is None:
+            column = self._built[name] = self._builders[name]()
+        return column
+
+    def __iter__(self):
+        return iter(self._builders)
+
+    def __len__(self) -> int:
+        return len(self._builders)
+
+    def built(self) -> list[str]:
+        """The columns built so far."""
+        return list(self._built)
+
+
+class CompiledGame:
+    """Struct-of-arrays view of one game's events.
+
+    Columns are read with ``cg["inning"]`` or ``cg.inning``; ``len(cg)`` is the
+    number of events. Build one with ``StatObj.compiled()`` (cached) or
+    ``CompiledGame.from_statobj``.
+    """
+
+    def __init__(self, columns: Mapping[str, np.ndarray], n_events: int):
+        self._columns = columns
+        self.n_events = n_events
+
+    @classmethod
+    def from_events(cls, events: list[dict], roster_names=None) -> CompiledGame:
+        """Compile a raw ``Events`` list.
+
+        Each column is decoded by its own pass over the events the first time
+        it is read, so a consumer only pays for the columns it uses.
+
+        ``roster_names`` is an optional pair of 9-name lists (team 0, team 1)
+        used to resolve the batter/pitcher character columns; without it those
+        columns are all -1.
+        """
+        if roster_names is not None:
+            roster_codes = [[_CHAR(name) for name in roster_names[t]] for t in (0, 1)]
+        else:
+            roster_codes = None
+
+        sections = _Sections(events)
+        builders = {}
+        for name, key, dtype, conv in EVENT_FIELDS:
+            builders[name] = functools.partial(_event_column, events, key, dtype, conv)
+        for fields, section in ((PITCH_FIELDS, 'pitch'), (CONTACT_FIELDS, 'contact'),
+                                (FIELDER_FIELDS, 'fielder')):
+            builders['has_' + section] = functools.partial(_mask_column, sections, section)
+            for name, key, dtype, conv in fields:
+                builders[name] = functools.partial(_section_column, sections, section, key, dtype, conv)
+        for name, runner_key in zip(('runner_1b', 'runner_2b', 'runner_3b'), _RUNNER_KEYS):
+            builders[name] = functools.partial(_runner_column, events, runner_key)
+        builders['steal'] = functools.partial(_steal_column, events)
+        builders['batter_char'] = functools.partial(_char_column, events, roster_codes, batting=True)
+        builders['pitcher_char'] = functools.partial(_char_column, events, roster_codes, batting=False)
+        return cls(LazyColumns({name: builders[name] for name in SCHEMA}), len(events))
+
+    @classmethod
+    def from_statobj(cls, stat) -> CompiledGame:
+        """Compile a StatObj's events, resolving batter/pitcher characters."""
+        try:
+            roster_names = (stat.characterName(0), stat.characterName(1))
+        except KeyError:
+            roster_names = None
+        return cls.from_events(stat.events(), roster_names)
+
+    def __len__(self) -> int:
+        return self.n_events
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        try:
+            return self.__dict__['_columns'][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def columns(self) -> list[str]:
+        return list(self._columns)
+
+    def as_dict(self) -> Mapping[str, np.ndarray]:
+        """The underlying column mapping (shared, not copied)."""
+        return self._columns
+
+    def score(self, teamNum: int) -> np.ndarray:
+        # 0 == away, 1 == home (event scores are never version flipped)
+        return self._columns['away_score'] if teamNum == 0 else self._columns['home_score']
+
+    def team_stars(self, teamNum: int) -> np.ndarray:
+        return self._columns['away_stars'] if teamNum == 0 else self._columns['home_stars']
+
+    def runner_count(self) -> np.ndarray:
+        return (self._columns['runner_1b'].astype(np.int8) + self._columns['runner_2b']
+                + self._columns['runner_3b'])
+
+    def to_dataframe(self):
+        """All columns as a pandas DataFrame, one row per event."""
+        import pandas as pd
+        return pd.DataFrame({name: self._columns[name] for name in self._columns})
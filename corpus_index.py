@@ -0,0 +1,323 @@
+"""Persistent, corpus-wide event index.
+
+EventSearch answers questions about one game, so a corpus query used to mean
+parsing and indexing every stat file again. CorpusIndex stores the compiled
+event columns (see compiled_game) of many games on disk and answers every
+EventSearch facet, and Q expressions, across all of them at once:
+
+    from pyrio import CorpusIndex, Q
+    index = CorpusIndex("rio_index")                # created if missing
+    index.add(load_statobjs_from_directory("stat_files"))
+    q = (Q.strikes(2) & Q.pitch_type('Curve') & Q.runners([-1, 2, -3])
+         & Q.facet('dateRangeEvents', datetime(2025, 1, 1))
+         & Q.facet('tagSetEvents', ranked_tag_set_ids))
+    index.query(q)                                  # {(game_id, event_num), ...}
+
+Layout on disk:
+    <path>/manifest.json        game metadata and event offsets, in add order
+    <path>/seg-00000/<col>.npy  one file per CompiledGame column
+
+Each call to ``add`` writes one new segment and rewrites the manifest, so new
+games are ingested incrementally; ``compact`` merges the segments back into
+one. Columns are loaded with ``numpy.load(mmap_mode='r')``, so opening an
+index doesn't read the events, and only the columns a query touches are paged
+in. Events are identified by (game_id, event_num): ``StatObj.gameID()`` and
+the event's position in its game, the same number EventSearch returns.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from typing import Iterable, Optional
+
+import numpy as np
+
+from .compiled_game import CompiledGame, LazyColumns, SCHEMA
+from .lookup import LookupDicts
+from .stat_file_parser import EventResult, EventSearch, StatObj, _facet, _frozen, _value_masks
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def _game_record(stat: StatObj, start: int, count: int) -> dict:
+    return {
+        "game_id": stat.gameID(),
+        "start": start,
+        "count": count,
+        "version": stat.version(),
+        "tag_set": stat.gameMode(),
+        "date": stat.startDate().strftime(_DATE_FORMAT),
+        "stadium": stat.stadium(),
+        "players": [stat.player(0), stat.player(1)],
+        "scores": [stat.score(0), stat.score(1)],
+        "innings_played": stat.inningsPlayed(),
+    }
+
+
+def _concatenated(segments, col: str) -> np.ndarray:
+    return np.concatenate([seg[col] for seg in segments])
+
+
+class CorpusIndex(EventSearch):
+    """EventSearch over every game in an on-disk index.
+
+    Facet methods return sets of (game_id, event_num) keys, or masks over the
+    whole corpus with ``as_mask=True``. Game-level facets (``gameEvents``,
+    ``tagSetEvents``, ``dateRangeEvents``) select every event of the matching
+    games.
+    """
+
+    def __init__(self, path: str, as_mask: bool = False):
+        # there is no single StatObj behind a corpus
+        super().__init__(None, as_mask)
+        self.path = path
+        self._games: list[dict] = []
+        self._segments: list[dict[str, np.ndarray]] = []
+        self._segment_names: list[str] = []
+
+        manifest_path = os.path.join(path, MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+            if manifest.get("format") != FORMAT_VERSION:
+                raise ValueError(f"Unsupported corpus index format {manifest.get('format')!r} in {path}")
+            self._games = manifest["games"]
+            for name in manifest["segments"]:
+                self._segments.append(self._load_segment(name))
+                self._segment_names.append(name)
+
+    # --- storage -------------------------------------------------------------
+
+    def _load_segment(self, name: str) -> dict[str, np.ndarray]:
+        directory = os.path.join(self.path, name)
+        return {col: np.load(os.path.join(directory, f"{col}.npy"), mmap_mode="r") for col in SCHEMA}
+
+    def _write_segment(self, columns: dict[str, np.ndarray]) -> str:
+        number = len(self._segment_names)
+        while os.path.exists(os.path.join(self.path, f"seg-{number:05d}")):
+            number += 1
+        name = f"seg-{number:05d}"
+        directory = os.path.join(self.path, name)
+        os.makedirs(directory)
+        for col, values in columns.items():
+            np.save(os.path.join(directory, f"{col}.npy"), values)
+        return name
+
+    def _write_manifest(self) -> None:
+        # write-then-rename so a crash never leaves a half written manifest
+        manifest_path = os.path.join(self.path, MANIFEST)
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"format": FORMAT_VERSION, "segments": self._segment_names,
+                       "games": self._games}, f)
+        os.replace(tmp_path, manifest_path)
+
+    def _invalidate(self) -> None:
+        # drop every cached index; they are rebuilt on the next query
+        for name in list(vars(self)):
+            if isinstance(getattr(type(self), name, None), functools.cached_property):
+                del self.__dict__[name]
+
+    def add(self, stats: Iterable[StatObj]) -> int:
+        """Appends games to the index as a new segment.
+
+        Games whose GameID is already indexed are skipped. Returns the number
+        of games added.
+        """
+        known = {game["game_id"] for game in self._games}
+        start = self._num_events
+        compiled, records = [], []
+        for stat in stats:
+            game_id = stat.gameID()
+            if game_id in known:
+                logger.debug("Skipping already indexed game %s", game_id)
+                continue
+            cg = stat.compiled()
+            records.append(_game_record(stat, start, len(cg)))
+            compiled.append(cg)
+            known.add(game_id)
+            start += len(cg)
+
+        if not records:
+            return 0
+
+        os.makedirs(self.path, exist_ok=True)
+        columns = {col: np.concatenate([cg[col] for cg in compiled]).astype(dtype, copy=False)
+                   for col, dtype in SCHEMA.items()}
+        name = self._write_segment(columns)
+        self._segment_names.append(name)
+        self._segments.append(self._load_segment(name))
+        self._games.extend(records)
+        self._write_manifest()
+        self._invalidate()
+        return len(records)
+
+    def compact(self) -> None:
+        """Merges all segments into one."""
+        if len(self._segments) <= 1:
+            return
+        columns = {col: np.concatenate([seg[col] for seg in self._segments]) for col in SCHEMA}
+        old_names = self._segment_names
+        name = self._write_segment(columns)
+        # release the memmaps before the old files go away
+        self._segments = []
+        self._invalidate()
+        self._segment_names = [name]
+        self._segments = [self._load_segment(name)]
+        self._write_manifest()
+        for old in old_names:
+            shutil.rmtree(os.path.join(self.path, old), ignore_errors=True)
+
+    # --- corpus -------------------------------------------------------------
+
+    def games(self) -> list[dict]:
+        """Metadata of every indexed game, in the order they were added."""
+        return list(self._games)
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def __contains__(self, game_id: int) -> bool:
+        return game_id in self._game_rows
+
+    @functools.cached_property
+    def _compiled(self) -> CompiledGame:
+        if len(self._segments) == 1:
+            columns = dict(self._segments[0])
+        elif self._segments:
+            # a column is joined across segments only once a query reads it
+            segments = tuple(self._segments)
+            columns = LazyColumns({col: functools.partial(_concatenated, segments, col) for col in SCHEMA})
+        else:
+            columns = {col: np.empty(0, dtype=dtype) for col, dtype in SCHEMA.items()}
+        return CompiledGame(columns, sum(game["count"] for game in self._games))
+
+    @functools.cached_property
+    def _num_events(self) -> int:
+        return sum(game["count"] for game in self._games)
+
+    @functools.cached_property
+    def _game_rows(self) -> dict[int, int]:
+        return {game["game_id"]: row for row, game in enumerate(self._games)}
+
+    @functools.cached_property
+    def _game_starts(self) -> np.ndarray:
+        return np.array([game["start"] for game in self._games], dtype=np.int64)
+
+    @functools.cached_property
+    def _event_game(self) -> np.ndarray:
+        # game row of every event
+        counts = [game["count"] for game in self._games]
+        return np.repeat(np.arange(len(counts), dtype=np.int32), counts)
+
+    def _game_events(self, game_mask: np.ndarray) -> np.ndarray:
+        # expands a mask over games to a mask over their events
+        return game_mask[self._event_game] if len(self._games) else self._empty.copy()
+
+    def events_from_mask(self, mask: np.ndarray) -> set[tuple[int, int]]:
+        # converts an event mask to the (game_id, event_num) keys it selects
+        rows = np.flatnonzero(mask)
+        games = self._event_game[rows]
+        event_nums = (rows - self._game_starts[games]).tolist()
+        return {(self._games[game]["game_id"], num) for game, num in zip(games.tolist(), event_nums)}
+
+    def mask_from_events(self, events) -> np.ndarray:
+        # converts a collection of (game_id, event_num) keys to an event mask
+        mask = np.zeros(self._num_events, dtype=bool)
+        for game_id, event_num in events:
+            game = self._games[self._game_rows[game_id]]
+            if not 0 <= event_num < game["count"]:
+                raise IndexError(f'Invalid event num: Event {event_num} does not exist in game {game_id}')
+            mask[game["start"] + event_num] = True
+        return mask
+
+    # --- facets that depend on the game, not the event ---------------------
+
+    @functools.cached_property
+    def _inning_dict(self) -> dict[int, np.ndarray]:
+        last_inning = max((game["innings_played"] for game in self._games), default=0)
+        return _value_masks(self._compiled.inning, range(1, last_inning+1))
+
+    @functools.cached_property
+    def _away_score_dict(self) -> dict[int, np.ndarray]:
+        top = max((game["scores"][0] for game in self._games), default=0)
+        return _value_masks(self._compiled.away_score, range(0, top+1))
+
+    @functools.cached_property
+    def _home_score_dict(self) -> dict[int, np.ndarray]:
+        top = max((game["scores"][1] for game in self._games), default=0)
+        return _value_masks(self._compiled.home_score, range(0, top+1))
+
+    @functools.cached_property
+    def character_action_dict(self) -> dict[str, dict[str, np.ndarray]]:
+        # games are mixed, so characters come from the encoded character
+        # columns rather than from a roster
+        cg = self._compiled
+        character_actions = {}
+        for code, char_id in LookupDicts.CHAR_NAME.items():
+            if not isinstance(code, int):
+                continue
+            character_actions[char_id] = {
+                'AtBat': _frozen(cg.batter_char == code),
+                'Pitching': _frozen(cg.pitcher_char == code),
+                'Fielding': _frozen(cg.fielder_char == code),
+            }
+        return character_actions
+
+    @_facet
+    def walkoffEvents(self) -> EventResult:
+        # returns the final event of every game that ended on a run scoring play
+        counts = np.array([game["count"] for game in self._games], dtype=np.int64)
+        final_events = (self._game_starts + counts - 1)[counts > 0]
+        result = self._empty.copy()
+        result[final_events[self._compiled.rbi[final_events] != 0]] = True
+        return result
+
+    def _player_events(self, player: str, batting: bool) -> np.ndarray:
+        player = player.lower()
+        away = np.array([game["players"][0].lower() == player for game in self._games], dtype=bool)
+        home = np.array([game["players"][1].lower() == player for game in self._games], dtype=bool)
+        # the away team bats in the top (0) of the inning
+        top = self._compiled.half_inning == 0
+        if not batting:
+            top = ~top
+        return (self._game_events(away) & top) | (self._game_events(home) & ~top)
+
+    @_facet
+    def playerBattingEvents(self, playerBatting) -> EventResult:
+        return self._player_events(playerBatting, batting=True)
+
+    @_facet
+    def playerPitchingEvents(self, playerPitching) -> EventResult:
+        return self._player_events(playerPitching, batting=False)
+
+    @_facet
+    def gameEvents(self, gameIDs) -> EventResult:
+        # returns every event of the given game(s)
+        gameIDList = gameIDs if isinstance(gameIDs, (list, set, tuple)) else [gameIDs]
+        games = np.zeros(len(self._games), dtype=bool)
+        for game_id in gameIDList:
+            if game_id in self._game_rows:
+                games[self._game_rows[game_id]] = True
+        return self._game_events(games)
+
+    @_facet
+    def tagSetEvents(self, tagSetIDs) -> EventResult:
+        # returns every event of games played with the given tag set(s)
+        tagSetList = tagSetIDs if isinstance(tagSetIDs, (list, set, tuple)) else [tagSetIDs]
+        return self._game_events(np.array([game["tag_set"] in tagSetList for game in self._games], dtype=bool))
+
+    @_facet
+    def dateRangeEvents(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> EventResult:
+        # returns every event of games started in [start, end)
+        dates = [datetime.strptime(game["date"], _DATE_FORMAT) for game in self._games]
+        return self._game_events(np.array(
+            [(start is None or date >= start) and (end is None or date < end) for date in dates], dtype=bool))
@@ -0,0 +1,311 @@
+"""Columnar (Parquet) store of decoded stat files.
+
+Re-parsing a season of JSON for every notebook is slow. CorpusStore converts
+stat files once into a Parquet dataset that pandas, pyarrow, DuckDB or Polars
+read directly (requires pyarrow):
+
+    from pyrio.corpus_store import CorpusStore
+    store = CorpusStore("rio_store")
+    store.add_directory("stat_files", workers=16)     # only new games are added
+    pitches = store.read("pitches", columns=["game_id", "pitch_type", "swing_type"])
+    games = store.read("games", filters=[("tag_set", "==", 7)])
+
+Tables, keyed by ``game_id`` (``StatObj.gameID()``) and, below the game,
+``event_num``:
+
+    games     one row per game: header fields, players, scores, dates
+    rosters   one row per (game, team, roster slot): character and box score
+    events    one row per event: count, score and situation, runners on base
+    pitches   one row per event with a pitch
+    contacts  one row per event with batted-ball contact
+    fielding  one row per event with a first fielder
+    runners   one row per runner (batter included) per event
+
+Column names and encodings follow compiled_game: categorical fields hold the
+LookupDicts code whichever flavor of stat file they came from, and missing
+numbers are -1 (ints) or NaN (floats). Team 0 is away and 1 is home for every
+version.
+
+Layout on disk:
+    <path>/<table>/part-00000.parquet
+
+Every append writes one new part per table and never touches existing parts.
+Parts are written under a dot-prefixed temporary name (which pyarrow skips)
+and renamed into place, and the ``games`` part is renamed last: a part of
+the other tables without its ``games`` counterpart is left over from an
+interrupted append, is never read, and is removed by the next append. So a
+game is only considered stored once all its rows are.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from . import parallel_loader
+from .compiled_game import (CONTACT_FIELDS, DERIVED_FIELDS, EVENT_FIELDS, FIELDER_FIELDS,
+                            MISSING_INT, PITCH_FIELDS, _CHAR, _STEAL, _encoder, _to_int)
+from .lookup import LookupDicts
+from .stat_file_parser import BOX_SCORE_BATTING, BOX_SCORE_PITCHING, StatObj
+
+logger = logging.getLogger(__name__)
+
+TABLES = ("games", "rosters", "events", "pitches", "contacts", "fielding", "runners")
+
+_RUNNER_KEYS = ('Runner Batter', 'Runner 1B', 'Runner 2B', 'Runner 3B')
+RUNNER_FIELDS = [
+    ('runner_roster_loc', 'Runner Roster Loc', np.int8, _to_int),
+    ('runner_char', 'Runner Char Id', np.int16, _CHAR),
+    ('initial_base', 'Runner Initial Base', np.int8, _to_int),
+    ('result_base', 'Runner Result Base', np.int8, _to_int),
+    ('out_type', 'Out Type', np.int16, _encoder(LookupDicts.OUT_TYPE)),
+    ('out_location', 'Out Location', np.int8, _to_int),
+    ('steal', 'Steal', np.int16, _STEAL),
+]
+
+_HAND = _encoder(LookupDicts.HAND)
+
+
+def _int_or_missing(value) -> int:
+    return MISSING_INT if value is None else _to_int(value)
+
+
+def _games_table(stat: StatObj, n_events: int) -> pd.DataFrame:
+    statJson = stat.statJson
+    row = {
+        "game_id": stat.gameID(),
+        "version": stat.version(),
+        "tag_set": _int_or_missing(statJson.get("TagSetID")),
+        "date_start": stat._start_date,
+        "date_end": stat._end_date,
+        "stadium": str(stat._stadium or ""),
+        "away_player": stat.player(0),
+        "home_player": stat.player(1),
+        "away_score": stat.score(0),
+        "home_score": stat.score(1),
+        "innings_selected": _int_or_missing(statJson.get("Innings Selected")),
+        "innings_played": _int_or_missing(statJson.get("Innings Played")),
+        "quitter": str(statJson.get("Quitter Team", "")),
+        "ping": _int_or_missing(statJson.get("Average Ping")),
+        "lag_spikes": _int_or_missing(statJson.get("Lag Spikes")),
+        "n_events": n_events,
+    }
+    df = pd.DataFrame([row])
+    for col in ("date_start", "date_end"):
+        df[col] = pd.to_datetime(df[col])
+    return df
+
+
+def _rosters_table(stat: StatObj, game_id: int) -> pd.DataFrame:
+    columns = {name: [] for name in ('team', 'roster', 'char', 'char_id', 'captain', 'superstar',
+                                     'batting_hand', 'fielding_hand')}
+    columns.update({name: [] for name in BOX_SCORE_BATTING})
+    columns.update({name: [] for name in BOX_SCORE_PITCHING})
+    for teamNum in (0, 1):
+        ro = stat.roster_obj(teamNum)
+        captain = ro.captain_index()
+        for rosterNum in range(9):
+            offense = ro.offensive_stats(rosterNum)
+            defense = ro.defensive_stats(rosterNum)
+            columns['team'].append(teamNum)
+            columns['roster'].append(rosterNum)
+            columns['char'].append(_CHAR(ro.char_id(rosterNum)))
+            columns['char_id'].append(str(ro.char_id(rosterNum)))
+            columns['captain'].append(rosterNum == captain)
+            columns['superstar'].append(ro.is_starred(rosterNum))
+            columns['batting_hand'].append(_HAND(ro.batting_hand(rosterNum)))
+            columns['fielding_hand'].append(_HAND(ro.fielding_hand(rosterNum)))
+            for name, key in BOX_SCORE_BATTING.items():
+                columns[name].append(_to_int(offense.get(key)))
+            for name, key in BOX_SCORE_PITCHING.items():
+                columns[name].append(_to_int(defense.get(key)))
+    df = pd.DataFrame(columns)
+    df.insert(0, 'game_id', np.int64(game_id))
+    return df.astype({'team': np.int8, 'roster': np.int8, 'char': np.int16,
+                      'batting_hand': np.int8, 'fielding_hand': np.int8})
+
+
+def _runners_table(stat: StatObj, game_id: int) -> pd.DataFrame:
+    values = {name: [] for name, *_ in RUNNER_FIELDS}
+    event_nums = []
+    for ev in stat.events():
+        for runner_key in _RUNNER_KEYS:
+            runner = ev.get(runner_key)
+            if not runner:
+                continue
+            event_nums.append(_to_int(ev.get('Event Num')))
+            for name, key, _dtype, conv in RUNNER_FIELDS:
+                values[name].append(conv(runner.get(key)))
+    columns = {'game_id': np.full(len(event_nums), game_id, dtype=np.int64),
+               'event_num': np.asarray(event_nums, dtype=np.int32)}
+    columns.update({name: np.asarray(values[name], dtype=dtype) for name, _key, dtype, _conv in RUNNER_FIELDS})
+    return pd.DataFrame(columns)
+
+
+def game_tables(stat: StatObj) -> dict[str, pd.DataFrame]:
+    """One game's rows of every table, keyed by table name."""
+    cg = stat.compiled()
+    game_id = stat.gameID()
+
+    def table(fields, mask=None) -> pd.DataFrame:
+        event_num = cg['event_num'] if mask is None else cg['event_num'][mask]
+        columns = {'game_id': np.full(len(event_num), game_id, dtype=np.int64), 'event_num': event_num}
+        for name in fields:
+            columns.setdefault(name, cg[name] if mask is None else cg[name][mask])
+        return pd.DataFrame(columns)
+
+    return {
+        "games": _games_table(stat, len(cg)),
+        "rosters": _rosters_table(stat, game_id),
+        "events": table([name for name, *_ in EVENT_FIELDS] + [name for name, _ in DERIVED_FIELDS]),
+        "pitches": table([name for name, *_ in PITCH_FIELDS], cg.has_pitch),
+        "contacts": table([name for name, *_ in CONTACT_FIELDS], cg.has_contact),
+        "fielding": table([name for name, *_ in FIELDER_FIELDS], cg.has_fielder),
+        "runners": _runners_table(stat, game_id),
+    }
+
+
+class CorpusStore:
+    """A Parquet dataset of stat files, one directory per table."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def table_path(self, table: str) -> str:
+        if table not in TABLES:
+            raise ValueError(f"Unknown table {table!r}. Choose from {TABLES}.")
+        return os.path.join(self.path, table)
+
+    def _files(self, table: str) -> list[str]:
+        directory = self.table_path(table)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name for name in os.listdir(directory) if name.endswith(".parquet"))
+
+    def _parts(self, table: str) -> list[str]:
+        """The committed parts of a table: those whose ``games`` part exists."""
+        committed = self._files("games")
+        if table == "games":
+            return committed
+        committed = set(committed)
+        return [name for name in self._files(table) if name in committed]
+
+    def read(self, table: str, columns: Optional[list[str]] = None, filters=None) -> pd.DataFrame:
+        """Reads a table (optionally only some columns / matching rows) into a DataFrame.
+
+        ``filters`` uses pyarrow's syntax, e.g. ``[("game_id", "in", ids)]``.
+        """
+        import pyarrow.parquet as pq
+
+        parts = self._parts(table)
+        if not parts:
+            return pd.DataFrame(columns=columns or [])
+        paths = [os.path.join(self.table_path(table), name) for name in parts]
+        return pq.read_table(paths, columns=columns, filters=filters).to_pandas()
+
+    def game_ids(self) -> set[int]:
+        """GameIDs of every stored game."""
+        return set(self.read("games", columns=["game_id"])["game_id"].tolist())
+
+    def __len__(self) -> int:
+        return len(self.game_ids())
+
+    def __contains__(self, game_id: int) -> bool:
+        return game_id in self.game_ids()
+
+    # --- writing -------------------------------------------------------------
+
+    def _remove_uncommitted(self) -> None:
+        # parts and temporary files left by an interrupted append
+        committed = set(self._files("games"))
+        for table in TABLES:
+            directory = self.table_path(table)
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                if name.endswith(".tmp") or (name.endswith(".parquet") and name not in committed):
+                    logger.info("Removing %s left by an interrupted append", os.path.join(directory, name))
+                    os.remove(os.path.join(directory, name))
+
+    def _write_part(self, tables: dict[str, list[pd.DataFrame]]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._remove_uncommitted()
+        number = len(self._parts("games"))
+        while any(os.path.exists(os.path.join(self.table_path(t), f"part-{number:05d}.parquet"))
+                  for t in TABLES):
+            number += 1
+        name = f"part-{number:05d}.parquet"
+        # games last: a game is only listed once the rest of its rows exist
+        for table in TABLES[1:] + TABLES[:1]:
+            directory = self.table_path(table)
+            os.makedirs(directory, exist_ok=True)
+            df = pd.concat(tables[table], ignore_index=True)
+            tmp_path = os.path.join(directory, f".{name}.tmp")
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path)
+            os.replace(tmp_path, os.path.join(directory, name))
+
+    def _append_tables(self, per_game: Iterable[dict[str, pd.DataFrame]], games_per_part: int) -> int:
+        known = self.game_ids()
+        batch = {table: [] for table in TABLES}
+        batched = added = 0
+        for tables in per_game:
+            game_id = int(tables["games"]["game_id"].iloc[0])
+            if game_id in known:
+                logger.debug("Skipping already stored game %s", game_id)
+                continue
+            known.add(game_id)
+            for table in TABLES:
+                batch[table].append(tables[table])
+            batched += 1
+            if batched == games_per_part:
+                self._write_part(batch)
+                added += batched
+                batch = {table: [] for table in TABLES}
+                batched = 0
+        if batched:
+            self._write_part(batch)
+            added += batched
+        return added
+
+    def append(self, stats: Iterable[StatObj], games_per_part: int = 5000) -> int:
+        """Stores games not already in the store. Returns how many were added.
+
+        Each ``games_per_part`` games become one new part file per table.
+        """
+        return self._append_tables((game_tables(stat) for stat in stats), games_per_part)
+
+    def add_directory(self, directory, workers: Optional[int] = None,
+                      games_per_part: int = 5000, dedup=None) -> int:
+        """Stores the new games of a directory of decoded stat files.
+
+        The tables are built in a process pool (see parallel_loader); files
+        that fail to load are logged and skipped. ``dedup`` skips copies of
+        the same game before they are parsed (see game_dedup).
+        """
+        results = parallel_loader.load_directory(
+            directory, game_tables, workers=workers, ordered=True, dedup=dedup,
+            on_error=lambda path, ex: logger.warning("Skipping %s: %s", path, ex))
+        return self._append_tables((tables for _, tables in results), games_per_part)
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Convert decoded stat files into a Parquet corpus store")
+    parser.add_argument("directory", help="directory of decoded stat files")
+    parser.add_argument("store", help="corpus store directory (created if missing)")
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("--dedup", default=None,
+                        help="duplicate-game index file; copies of an already stored game are skipped")
+    args = parser.parse_args(argv)
+    added = CorpusStore(args.store).add_directory(args.directory, workers=args.workers, dedup=args.dedup)
+    print(f"Added {added} game(s) to {args.store}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
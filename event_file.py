@@ -0,0 +1,156 @@
+"""Fixed-width binary event file, read through numpy.memmap.
+
+One file holds the compiled events (see compiled_game) of many games as
+packed fixed-width records. Opening it maps the file instead of reading it,
+so any number of analysis processes share one copy of the corpus through
+the page cache, and loading takes no time whatever the corpus size:
+
+    from pyrio.event_file import EventFile, write_event_file
+    write_event_file("season.rioev", load_statobjs_from_directory("stat_files"))
+
+    events = EventFile("season.rioev")
+    cg = events.compiled(game_id)          # CompiledGame of zero-copy views
+    events.record(game_id, 12)["pitch_type"]
+    EventSearch-style masks over everything: events.compiled().strikes == 2
+
+Record layout: every CompiledGame column, little-endian and packed, with
+categorical fields as their LookupDicts codes (int8/int16/int32, -1 when
+missing), flags as one byte, and every float column (positions, velocities,
+strikezone, charge, contact quality) stored as float32 (NaN when missing).
+
+File layout:
+    [0, 4096)           magic + JSON header (fields, counts, table offset)
+    [4096, ...)         n_events records, game after game
+    [table_offset, ...) per-game table: (game_id, start, count) as int64
+"""
+from __future__ import annotations
+
+import json
+import os
+import struct
+from typing import Iterable
+
+import numpy as np
+
+from .compiled_game import SCHEMA, CompiledGame
+from .stat_file_parser import StatObj
+
+MAGIC = b"RIOEVT\x00\x01"
+FORMAT_VERSION = 1
+HEADER_SIZE = 4096
+
+GAME_TABLE_DTYPE = np.dtype([("game_id", "<i8"), ("start", "<i8"), ("count", "<i8")])
+
+
+def _record_field(dtype: np.dtype) -> np.dtype:
+    if dtype.kind == "f":
+        return np.dtype("<f4")
+    return dtype.newbyteorder("<")
+
+
+RECORD_DTYPE = np.dtype([(name, _record_field(dtype)) for name, dtype in SCHEMA.items()])
+
+
+def _records(cg: CompiledGame, dtype: np.dtype = RECORD_DTYPE) -> np.ndarray:
+    records = np.empty(len(cg), dtype=dtype)
+    for name in dtype.names:
+        records[name] = cg[name]
+    return records
+
+
+def write_event_file(path, stats: Iterable[StatObj]) -> int:
+    """Writes the events of ``stats`` to an event file. Returns the number of games.
+
+    Records are streamed to disk game by game; only the small per-game table
+    is held in memory. Games with a GameID already written are skipped.
+    """
+    table = []
+    seen = set()
+    n_events = 0
+    tmp_path = os.fspath(path) + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(b"\0" * HEADER_SIZE)
+        for stat in stats:
+            game_id = stat.gameID()
+            if game_id in seen:
+                continue
+            seen.add(game_id)
+            records = _records(stat.compiled())
+            f.write(records.tobytes())
+            table.append((game_id, n_events, len(records)))
+            n_events += len(records)
+
+        table_offset = f.tell()
+        f.write(np.array(table, dtype=GAME_TABLE_DTYPE).tobytes())
+
+        header = json.dumps({
+            "format": FORMAT_VERSION,
+            "fields": [[name, RECORD_DTYPE[name].str] for name in RECORD_DTYPE.names],
+            "n_games": len(table),
+            "n_events": n_events,
+            "records_offset": HEADER_SIZE,
+            "table_offset": table_offset,
+        }).encode()
+        if len(MAGIC) + 4 + len(header) > HEADER_SIZE:
+            raise ValueError("Event file header does not fit in its reserved block")
+        f.seek(0)
+        f.write(MAGIC + struct.pack("<I", len(header)) + header)
+    os.replace(tmp_path, path)
+    return len(table)
+
+
+class EventFile:
+    """A memory-mapped event file. Nothing is read until a column is used."""
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            block = f.read(HEADER_SIZE)
+        if block[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path} is not a pyrio event file")
+        (length,) = struct.unpack_from("<I", block, len(MAGIC))
+        header = json.loads(block[len(MAGIC) + 4:len(MAGIC) + 4 + length])
+        if header.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported event file format {header.get('format')!r} in {self.path}")
+
+        self.dtype = np.dtype([(name, dtype) for name, dtype in header["fields"]])
+        self.n_events = header["n_events"]
+        self.records = self._map(self.dtype, header["records_offset"], self.n_events)
+        self.games = self._map(GAME_TABLE_DTYPE, header["table_offset"], header["n_games"])
+        self._rows = {int(game_id): row for row, game_id in enumerate(self.games["game_id"].tolist())}
+
+    def _map(self, dtype: np.dtype, offset: int, count: int) -> np.ndarray:
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self.path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def __contains__(self, game_id: int) -> bool:
+        return game_id in self._rows
+
+    def game_ids(self) -> list[int]:
+        return list(self._rows)
+
+    def _span(self, game_id: int) -> slice:
+        try:
+            game = self.games[self._rows[game_id]]
+        except KeyError:
+            raise KeyError(f"Game {game_id} is not in {self.path}") from None
+        return slice(int(game["start"]), int(game["start"] + game["count"]))
+
+    def compiled(self, game_id=None) -> CompiledGame:
+        """CompiledGame view of one game, or of every event with no game_id.
+
+        The columns are strided views into the mapped file, not copies.
+        """
+        records = self.records if game_id is None else self.records[self._span(game_id)]
+        return CompiledGame({name: records[name] for name in self.dtype.names}, len(records))
+
+    def record(self, game_id: int, event_num: int) -> np.void:
+        """One event's record; fields are read with ``record["inning"]``."""
+        span = self._span(game_id)
+        if not 0 <= event_num < span.stop - span.start:
+            raise IndexError(f'Invalid event num: Event {event_num} does not exist in game {game_id}')
+        return self.records[span.start + event_num]
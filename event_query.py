@@ -0,0 +1,322 @@
+"""Composable queries over EventSearch facets.
+
+Chaining facet calls materializes a full set of event indices at every step.
+A query expression instead describes the search up front, so it can be
+planned and evaluated on boolean event masks in one go:
+
+    from pyrio import EventSearch, Q
+    search = EventSearch(stat)
+    q = Q.inning(7) & Q.pitch_type('Curve') & ~Q.star_chance()
+    search.query(q)                   # set of event indices
+    search.query(q, as_mask=True)     # numpy bool mask
+    q.plan()                          # the expression in evaluation order
+
+Planning: the children of an ``&`` are evaluated most selective first and
+evaluation stops as soon as the running intersection is empty; the children
+of an ``|`` are evaluated least selective first and evaluation stops once
+every event is selected. Selectivity is a static prior per facet (the rough
+fraction of a game's events a facet keeps), so planning never touches the
+events. A facet repeated within one query is only evaluated once.
+
+Every leaf is a call to an existing EventSearch facet method; ``Q.facet``
+reaches any facet that doesn't have a shortcut here.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import numpy as np
+
+_DEFAULT_SELECTIVITY = 0.5
+
+
+def _count(value) -> int:
+    # facets accept a single value or a list/set of them
+    return len(value) if isinstance(value, (list, set, tuple)) else 1
+
+
+def _fraction(value, per_value: float) -> float:
+    # negative inputs select a range of values, so assume half the game
+    values = value if isinstance(value, (list, set, tuple)) else [value]
+    if any(isinstance(v, int) and v < 0 for v in values):
+        return _DEFAULT_SELECTIVITY
+    return min(1.0, per_value * _count(value))
+
+
+class Q(ABC):
+    """A query expression over EventSearch facets. Combine with & | ~."""
+
+    @abstractmethod
+    def selectivity(self) -> float:
+        """The rough fraction of a game's events the expression keeps."""
+
+    def plan(self) -> Q:
+        """Returns the expression with its operands in evaluation order."""
+        return self
+
+    @abstractmethod
+    def mask(self, search, _memo: Optional[dict] = None) -> np.ndarray:
+        """Evaluates the expression against an EventSearch as an event mask."""
+
+    def __and__(self, other: Q) -> Q:
+        if not isinstance(other, Q):
+            return NotImplemented
+        return _And(_operands(self, _And) + _operands(other, _And))
+
+    def __or__(self, other: Q) -> Q:
+        if not isinstance(other, Q):
+            return NotImplemented
+        return _Or(_operands(self, _Or) + _operands(other, _Or))
+
+    def __invert__(self) -> Q:
+        if isinstance(self, _Not):
+            return self.operand
+        return _Not(self)
+
+    def __bool__(self):
+        raise TypeError("Use & | ~ to combine queries, not 'and', 'or', 'not'.")
+
+    # --- leaves ------------------------------------------------------------
+
+    @staticmethod
+    def facet(method_name: str, *args, selectivity: float = _DEFAULT_SELECTIVITY, **kwargs) -> Q:
+        """Any EventSearch facet method, e.g. Q.facet('contactFrameEvents', 3)."""
+        return _Facet(method_name, args, kwargs, selectivity)
+
+    @staticmethod
+    def inning(inningNum) -> Q:
+        return _Facet('inningEvents', (inningNum,), {}, _fraction(inningNum, 1 / 9))
+
+    @staticmethod
+    def half_inning(halfInningNum: int) -> Q:
+        return _Facet('halfInningEvents', (halfInningNum,), {}, 0.5)
+
+    @staticmethod
+    def balls(ballNum) -> Q:
+        return _Facet('ballEvents', (ballNum,), {}, _fraction(ballNum, 0.3))
+
+    @staticmethod
+    def strikes(strikeNum) -> Q:
+        return _Facet('strikeEvents', (strikeNum,), {}, _fraction(strikeNum, 0.3))
+
+    @staticmethod
+    def outs(outsNum: int) -> Q:
+        return _Facet('outsInInningEvents', (outsNum,), {}, _fraction(outsNum, 1 / 3))
+
+    @staticmethod
+    def rbi(rbiNum) -> Q:
+        return _Facet('rbiEvents', (rbiNum,), {}, _fraction(rbiNum, 0.1))
+
+    @staticmethod
+    def away_score(awayScore) -> Q:
+        return _Facet('awayScoreEvents', (awayScore,), {}, _fraction(awayScore, 0.2))
+
+    @staticmethod
+    def home_score(homeScore) -> Q:
+        return _Facet('homeScoreEvents', (homeScore,), {}, _fraction(homeScore, 0.2))
+
+    @staticmethod
+    def chem_on_base(chemNum) -> Q:
+        return _Facet('chemOnBaseEvents', (chemNum,), {}, _fraction(chemNum, 0.25))
+
+    @staticmethod
+    def pitcher_stamina(stamina) -> Q:
+        return _Facet('pitcherStaminaEvents', (stamina,), {}, _fraction(stamina, 0.1))
+
+    @staticmethod
+    def star_chance(isStarChance: bool = True) -> Q:
+        return _Facet('starChanceEvents', (isStarChance,), {}, 0.05 if isStarChance else 0.95)
+
+    @staticmethod
+    def runners(baseNums: list) -> Q:
+        return _Facet('runnerOnBaseEvents', (baseNums,), {}, 0.3)
+
+    @staticmethod
+    def pitch_type(pitchType) -> Q:
+        return _Facet('pitchTypeEvents', (pitchType,), {}, _fraction(pitchType, 0.3))
+
+    @staticmethod
+    def swing_type(swingType) -> Q:
+        return _Facet('swingTypeEvents', (swingType,), {}, _fraction(swingType, 0.2))
+
+    @staticmethod
+    def contact_type(contactType) -> Q:
+        return _Facet('contactTypeEvents', (contactType,), {}, _fraction(contactType, 0.1))
+
+    @staticmethod
+    def contact_frame(contactFrame) -> Q:
+        return _Facet('contactFrameEvents', (contactFrame,), {}, _fraction(contactFrame, 0.05))
+
+    @staticmethod
+    def in_strikezone() -> Q:
+        return _Facet('inStrikezoneEvents', (), {}, 0.5)
+
+    @staticmethod
+    def star_pitch() -> Q:
+        return _Facet('starPitchEvents', (), {}, 0.05)
+
+    @staticmethod
+    def first_pitch_of_ab() -> Q:
+        return _Facet('firstPitchOfABEvents', (), {}, 0.25)
+
+    @staticmethod
+    def last_pitch_of_ab() -> Q:
+        return _Facet('lastPitchOfABEvents', (), {}, 0.25)
+
+    @staticmethod
+    def hit(numberOfBases: int = 0) -> Q:
+        return _Facet('hitResultEvents', (numberOfBases,), {}, 0.08 if numberOfBases else 0.2)
+
+    @staticmethod
+    def out() -> Q:
+        return _Facet('allOutResultEvents', (), {}, 0.2)
+
+    @staticmethod
+    def strikeout() -> Q:
+        return _Facet('strikeoutResultEvents', (), {}, 0.05)
+
+    @staticmethod
+    def walk(include_hbp: bool = True, include_bb: bool = True) -> Q:
+        return _Facet('walkResultEvents', (include_hbp, include_bb), {}, 0.03)
+
+    @staticmethod
+    def steal() -> Q:
+        return _Facet('stealEvents', (), {}, 0.03)
+
+    @staticmethod
+    def lead_changed() -> Q:
+        return _Facet('leadChangedEvents', (), {}, 0.01)
+
+    @staticmethod
+    def walkoff() -> Q:
+        return _Facet('walkoffEvents', (), {}, 0.001)
+
+    @staticmethod
+    def character_at_bat(char_id: str) -> Q:
+        return _Facet('characterAtBatEvents', (char_id,), {}, 1 / 18)
+
+    @staticmethod
+    def character_pitching(char_id: str) -> Q:
+        return _Facet('characterPitchingEvents', (char_id,), {}, 0.4)
+
+    @staticmethod
+    def character_fielding(char_id: str) -> Q:
+        return _Facet('characterFieldingEvents', (char_id,), {}, 0.02)
+
+    @staticmethod
+    def fielder_position(fielderPos: str) -> Q:
+        return _Facet('positionFieldingEvents', (fielderPos,), {}, 0.02)
+
+    @staticmethod
+    def player_batting(player: str) -> Q:
+        return _Facet('playerBattingEvents', (player,), {}, 0.5)
+
+    @staticmethod
+    def player_pitching(player: str) -> Q:
+        return _Facet('playerPitchingEvents', (player,), {}, 0.5)
+
+
+def _operands(expr: Q, node_type: type) -> list[Q]:
+    # flattens a & (b & c) into one node so the planner sees every operand
+    return list(expr.operands) if isinstance(expr, node_type) else [expr]
+
+
+class _Facet(Q):
+    def __init__(self, method_name: str, args: tuple, kwargs: dict, selectivity: float):
+        self.method_name = method_name
+        self.args = args
+        self.kwargs = kwargs
+        self._selectivity = selectivity
+        self._key = repr((method_name, args, sorted(kwargs.items())))
+
+    def selectivity(self) -> float:
+        return self._selectivity
+
+    def mask(self, search, _memo: Optional[dict] = None) -> np.ndarray:
+        if _memo is None:
+            _memo = {}
+        if self._key not in _memo:
+            method = getattr(search, self.method_name)
+            _memo[self._key] = method(*self.args, **self.kwargs, as_mask=True)
+        return _memo[self._key]
+
+    def __repr__(self) -> str:
+        params = [repr(a) for a in self.args] + [f'{k}={v!r}' for k, v in self.kwargs.items()]
+        return f"{self.method_name}({', '.join(params)})"
+
+
+class _Not(Q):
+    def __init__(self, operand: Q):
+        self.operand = operand
+
+    def selectivity(self) -> float:
+        return 1.0 - self.operand.selectivity()
+
+    def plan(self) -> Q:
+        return _Not(self.operand.plan())
+
+    def mask(self, search, _memo: Optional[dict] = None) -> np.ndarray:
+        return ~self.operand.mask(search, _memo)
+
+    def __repr__(self) -> str:
+        return f'~{self.operand!r}'
+
+
+class _And(Q):
+    def __init__(self, operands: list[Q]):
+        self.operands = operands
+
+    def selectivity(self) -> float:
+        return float(np.prod([op.selectivity() for op in self.operands]))
+
+    def plan(self) -> Q:
+        return _And(sorted((op.plan() for op in self.operands), key=lambda op: op.selectivity()))
+
+    def mask(self, search, _memo: Optional[dict] = None) -> np.ndarray:
+        if _memo is None:
+            _memo = {}
+        result = None
+        for op in sorted(self.operands, key=lambda op: op.selectivity()):
+            negated = isinstance(op, _Not)
+            other = (op.operand if negated else op).mask(search, _memo)
+            if result is None:
+                result = ~other if negated else other.copy()
+            elif negated:
+                result[other] = False   # a & ~b without materializing ~b
+            else:
+                result &= other
+            if not result.any():
+                break
+        return result
+
+    def __repr__(self) -> str:
+        return '(' + ' & '.join(repr(op) for op in self.operands) + ')'
+
+
+class _Or(Q):
+    def __init__(self, operands: list[Q]):
+        self.operands = operands
+
+    def selectivity(self) -> float:
+        return min(1.0, sum(op.selectivity() for op in self.operands))
+
+    def plan(self) -> Q:
+        return _Or(sorted((op.plan() for op in self.operands), key=lambda op: -op.selectivity()))
+
+    def mask(self, search, _memo: Optional[dict] = None) -> np.ndarray:
+        if _memo is None:
+            _memo = {}
+        result = None
+        for op in sorted(self.operands, key=lambda op: -op.selectivity()):
+            other = op.mask(search, _memo)
+            if result is None:
+                result = other.copy()
+            else:
+                result |= other
+            if result.all():
+                break
+        return result
+
+    def __repr__(self) -> str:
+        return '(' + ' | '.join(repr(op) for op in self.operands) + ')'
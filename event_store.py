@@ -0,0 +1,396 @@
+"""Local SQLite event store, queried with EventsParameterList.
+
+Exploratory queries against the /events/ endpoint are slow and rate limited.
+EventStore keeps events in a local SQLite database, indexed on the dimensions
+EventsParameterList filters on, and answers the same parameter lists in
+milliseconds:
+
+    from pyrio import EventsParameterList
+    from pyrio.event_store import EventStore
+    store = EventStore("events.sqlite")
+    store.add_directory("stat_files", workers=16)       # decoded stat files
+    store.add_events(client.get_events(params))         # or API pulls
+    store.query(EventsParameterList(batter_char=[0], strikes=[2], contact=[2, 3]))
+
+Filters use the API's encodings (LookupDicts codes for characters, pitch and
+swing types, contact, final result, hands and positions); the returned
+DataFrame has one row per event, ordered by (game_id, event_num).
+
+Users: stat files name users, the API identifies them by id as well. The
+``username`` style parameters match names case-insensitively, and
+``users_as_batter`` / ``users_as_pitcher`` accept names or ids. Game-level
+filters (``start_time``, ``end_time``, ``stadium``) need the game's header, so
+they only match games added from stat files or with ``add_games``. Parameters
+the store can't answer locally (tags, captains, ...) raise ValueError rather
+than being ignored.
+"""
+from __future__ import annotations
+
+import calendar
+import json
+import logging
+import sqlite3
+from dataclasses import asdict
+from typing import Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from . import parallel_loader
+from .api import EventsParameterList
+from .compiled_game import MISSING_INT, _encoder
+from .lookup import LookupDicts
+from .stat_file_parser import StatObj
+
+logger = logging.getLogger(__name__)
+
+# EventsParameterList filter -> events column
+EVENT_FILTERS = {
+    "games": "game_id",
+    "pitcher_char": "pitcher_char",
+    "batter_char": "batter_char",
+    "fielder_char": "fielder_char",
+    "fielder_pos": "fielder_pos",
+    "contact": "contact",
+    "swing": "swing",
+    "pitch": "pitch",
+    "chem_link": "chem_link",
+    "pitcher_hand": "pitcher_hand",
+    "batter_hand": "batter_hand",
+    "inning": "inning",
+    "half_inning": "half_inning",
+    "balls": "balls",
+    "strikes": "strikes",
+    "outs": "outs",
+    "star_chance": "star_chance",
+    "final_result": "final_result",
+}
+INT_COLUMNS = ["game_id", "event_num"] + [col for col in EVENT_FILTERS.values() if col != "game_id"] \
+    + ["batter_user_id", "pitcher_user_id"]
+TEXT_COLUMNS = ["batter_user", "pitcher_user", "payload"]
+EVENT_COLUMNS = INT_COLUMNS + TEXT_COLUMNS
+GAME_COLUMNS = ["game_id", "start_time", "stadium", "tag_set", "away_user", "home_user"]
+
+# EventsParameterList fields the store answers; anything else set is an error
+_SUPPORTED = set(EVENT_FILTERS) | {
+    "username", "vs_username", "exclude_username", "users_as_batter", "users_as_pitcher",
+    "start_time", "end_time", "stadium", "limit_games", "limit_events",
+    # presentation-only flags of the API, no effect on which events match
+    "include_teams", "include_linescore",
+}
+
+# API row key(s) -> events column, first present key wins
+API_KEYS = {
+    "game_id": ("game_id",),
+    "event_num": ("event_num",),
+    "pitcher_char": ("pitcher_char_id", "pitcher_char"),
+    "batter_char": ("batter_char_id", "batter_char"),
+    "fielder_char": ("fielder_char_id", "fielder_char"),
+    "fielder_pos": ("fielder_position", "fielder_pos"),
+    "contact": ("type_of_contact", "contact"),
+    "swing": ("type_of_swing", "swing"),
+    "pitch": ("pitch_type", "pitch"),
+    "chem_link": ("chem_links_ob", "chem_link"),
+    "pitcher_hand": ("pitching_hand", "pitcher_hand"),
+    "batter_hand": ("batting_hand", "batter_hand"),
+    "inning": ("inning",),
+    "half_inning": ("half_inning",),
+    "balls": ("balls",),
+    "strikes": ("strikes",),
+    "outs": ("outs",),
+    "star_chance": ("star_chance",),
+    "final_result": ("final_result", "result_of_ab"),
+    "batter_user": ("batter_username", "batter_user"),
+    "pitcher_user": ("pitcher_username", "pitcher_user"),
+    "batter_user_id": ("batter_user_id",),
+    "pitcher_user_id": ("pitcher_user_id",),
+}
+
+_HAND = _encoder(LookupDicts.HAND)
+_STADIUM = _encoder(LookupDicts.STADIUM)
+
+
+def _code(value) -> Optional[int]:
+    # stored form of an encoded value: -1 / missing -> NULL
+    if value is None:
+        return None
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return None
+    return None if value == MISSING_INT else value
+
+
+def _as_list(value) -> list:
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+
+def stat_rows(stat: StatObj) -> tuple[tuple, list[tuple]]:
+    """The games row and events rows of one StatObj."""
+    cg = stat.compiled()
+    game_id = stat.gameID()
+    players = (stat.player(0), stat.player(1))
+    hands = [[(_HAND(stat.battingHand(team, slot)), _HAND(stat.fieldingHand(team, slot)))
+              for slot in range(9)] for team in (0, 1)]
+    try:
+        start_time = calendar.timegm(stat.startDate().timetuple())
+    except (KeyError, ValueError):
+        start_time = None
+    game = (game_id, start_time, _code(_STADIUM(stat.stadium())), stat.statJson.get("TagSetID"),
+            players[0], players[1])
+
+    columns = {name: cg[name].tolist() for name in (
+        "event_num", "pitcher_char", "batter_char", "fielder_char", "fielder_position",
+        "contact_type", "swing_type", "pitch_type", "chem_links", "inning", "half_inning",
+        "balls", "strikes", "outs", "star_chance", "result_of_ab",
+        "batter_roster_loc", "pitcher_roster_loc")}
+    events = []
+    for i in range(len(cg)):
+        half = columns["half_inning"][i]
+        batting, pitching = (half, 1 - half) if half in (0, 1) else (None, None)
+        batter_hand = pitcher_hand = None
+        if batting is not None:
+            batter_slot = columns["batter_roster_loc"][i]
+            pitcher_slot = columns["pitcher_roster_loc"][i]
+            if 0 <= batter_slot < 9:
+                batter_hand = _code(hands[batting][batter_slot][0])
+            if 0 <= pitcher_slot < 9:
+                pitcher_hand = _code(hands[pitching][pitcher_slot][1])
+        events.append((
+            game_id, columns["event_num"][i],
+            _code(columns["pitcher_char"][i]), _code(columns["batter_char"][i]),
+            _code(columns["fielder_char"][i]), _code(columns["fielder_position"][i]),
+            _code(columns["contact_type"][i]), _code(columns["swing_type"][i]),
+            _code(columns["pitch_type"][i]), _code(columns["chem_links"][i]),
+            pitcher_hand, batter_hand,
+            columns["inning"][i], half, columns["balls"][i], columns["strikes"][i],
+            columns["outs"][i], columns["star_chance"][i], _code(columns["result_of_ab"][i]),
+            None, None,
+            None if batting is None else players[batting],
+            None if batting is None else players[pitching],
+            None,
+        ))
+    return game, events
+
+
+class EventStore:
+    """Events in a local SQLite database (``":memory:"`` works too)."""
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        columns = ", ".join([f"{col} INTEGER" for col in INT_COLUMNS] + [f"{col} TEXT" for col in TEXT_COLUMNS])
+        with self.connection:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS events ({columns}, PRIMARY KEY (game_id, event_num))")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS games (game_id INTEGER PRIMARY KEY, start_time INTEGER, "
+                "stadium INTEGER, tag_set INTEGER, away_user TEXT, home_user TEXT)")
+            for col in EVENT_FILTERS.values():
+                if col != "game_id":
+                    self.connection.execute(f"CREATE INDEX IF NOT EXISTS events_{col} ON events ({col})")
+            for col in ("batter_user", "pitcher_user"):
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS events_{col} ON events ({col} COLLATE NOCASE)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS games_start_time ON games (start_time)")
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> EventStore:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    # --- loading -------------------------------------------------------------
+
+    def _insert(self, games: Iterable[tuple], events: Iterable[tuple]) -> None:
+        # re-adding a game replaces its rows
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO games VALUES ({', '.join('?' * len(GAME_COLUMNS))})", games)
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO events VALUES ({', '.join('?' * len(EVENT_COLUMNS))})", events)
+
+    def add_stats(self, stats: Iterable[StatObj]) -> int:
+        """Adds StatObjs' games and events. Returns the number of games."""
+        return self._add_rows(stat_rows(stat) for stat in stats)
+
+    def add_directory(self, directory, workers: Optional[int] = None, dedup=None) -> int:
+        """Adds every decoded stat file of a directory (parsed in a process pool).
+
+        ``dedup`` skips copies of the same game before they are parsed (see game_dedup).
+        """
+        results = parallel_loader.load_directory(
+            directory, stat_rows, workers=workers, dedup=dedup,
+            on_error=lambda path, ex: logger.warning("Skipping %s: %s", path, ex))
+        return self._add_rows(rows for _, rows in results)
+
+    def _add_rows(self, rows, batch_size: int = 500) -> int:
+        games, events, count = [], [], 0
+        for game, game_events in rows:
+            games.append(game)
+            events.extend(game_events)
+            count += 1
+            if len(games) == batch_size:
+                self._insert(games, events)
+                games, events = [], []
+        self._insert(games, events)
+        return count
+
+    def add_events(self, rows: Union[pd.DataFrame, dict, list]) -> int:
+        """Adds event rows pulled from the API (get_events / get_landing_data).
+
+        Accepts the DataFrame, the raw response, or a list of row dicts. The
+        whole row is kept in the ``payload`` column. Returns the number of rows.
+        """
+        if isinstance(rows, dict):
+            rows = rows.get("Events", rows.get("events", rows.get("Data", [])))
+        if isinstance(rows, pd.DataFrame):
+            rows = rows.to_dict("records")
+
+        events = []
+        for row in rows:
+            values = {}
+            for col, keys in API_KEYS.items():
+                for key in keys:
+                    if key in row and not _is_missing(row[key]):
+                        values[col] = row[key]
+                        break
+            if "game_id" not in values or "event_num" not in values:
+                raise ValueError("API rows need game_id and event_num to be stored")
+            event = [_code(values.get(col)) for col in INT_COLUMNS]
+            event += [values.get("batter_user"), values.get("pitcher_user"),
+                      json.dumps(row, default=_json_default)]
+            events.append(tuple(event))
+        self._insert([], events)
+        return len(events)
+
+    def add_games(self, games: Union[pd.DataFrame, list]) -> int:
+        """Adds game headers (e.g. ``RioWeb.get_games``) so game-level filters apply
+        to API-pulled events."""
+        if isinstance(games, pd.DataFrame):
+            games = games.to_dict("records")
+        rows = []
+        for game in games:
+            start = game.get("date_time_start")
+            if isinstance(start, pd.Timestamp):
+                start = int(start.timestamp())
+            stadium = game.get("stadium")
+            rows.append((int(game["game_id"]), _code(start),
+                         _code(_STADIUM(stadium)) if isinstance(stadium, str) else _code(stadium),
+                         _code(game.get("tag_set", game.get("game_mode_id"))),
+                         game.get("away_user"), game.get("home_user")))
+        self._insert(rows, [])
+        return len(rows)
+
+    # --- querying -------------------------------------------------------------
+
+    def query(self, params: Union[EventsParameterList, dict, None] = None,
+              include_payload: bool = False, **kwargs) -> pd.DataFrame:
+        """Events matching an EventsParameterList (or the same fields as kwargs)."""
+        filters = {}
+        if params is not None:
+            filters.update(asdict(params) if isinstance(params, EventsParameterList) else params)
+        filters.update(kwargs)
+        filters = {k: v for k, v in filters.items() if v is not None}
+
+        unsupported = sorted(set(filters) - _SUPPORTED)
+        if unsupported:
+            raise ValueError(f"EventStore can't filter on {', '.join(unsupported)} locally")
+
+        where, args = self._where(filters)
+        limit_games = filters.get("limit_games")
+        if limit_games is not None and not isinstance(limit_games, bool):
+            # the most recent N matching games
+            game_ids = [row[0] for row in self.connection.execute(
+                f"SELECT e.game_id FROM events e LEFT JOIN games g USING (game_id) {where} "
+                f"GROUP BY e.game_id ORDER BY MAX(g.start_time) DESC, e.game_id DESC LIMIT ?",
+                args + [int(limit_games)])]
+            where += (" AND " if where else "WHERE ") + f"e.game_id IN ({', '.join('?' * len(game_ids))})"
+            args = args + game_ids
+
+        sql = f"SELECT e.* FROM events e LEFT JOIN games g USING (game_id) {where} ORDER BY e.game_id, e.event_num"
+        limit_events = filters.get("limit_events")
+        if limit_events is not None and not isinstance(limit_events, bool):
+            sql += " LIMIT ?"
+            args.append(int(limit_events))
+
+        df = pd.read_sql_query(sql, self.connection, params=args)
+        payload = df.pop("payload")
+        if include_payload and payload.notna().any():
+            expanded = pd.DataFrame([json.loads(p) if p else {} for p in payload], index=df.index)
+            df = df.join(expanded[[c for c in expanded.columns if c not in df.columns]])
+        return df
+
+    @staticmethod
+    def _where(filters: dict) -> tuple[str, list]:
+        clauses, args = [], []
+
+        def any_of(sql: str, values) -> None:
+            values = _as_list(values)
+            clauses.append(f"{sql} IN ({', '.join('?' * len(values))})")
+            args.extend(values)
+
+        for name, col in EVENT_FILTERS.items():
+            if name in filters:
+                any_of(f"e.{col}", filters[name])
+
+        for name, col in (("users_as_batter", "batter"), ("users_as_pitcher", "pitcher")):
+            if name in filters:
+                users = _as_list(filters[name])
+                ids = [u for u in users if not isinstance(u, str)]
+                names = [u.lower() for u in users if isinstance(u, str)]
+                parts = []
+                if ids:
+                    parts.append(f"e.{col}_user_id IN ({', '.join('?' * len(ids))})")
+                if names:
+                    parts.append(f"lower(e.{col}_user) IN ({', '.join('?' * len(names))})")
+                clauses.append("(" + " OR ".join(parts) + ")")
+                args.extend(ids + names)
+
+        def user_clause(users) -> str:
+            names = [u.lower() for u in _as_list(users)]
+            marks = ", ".join("?" * len(names))
+            args.extend(names + names)
+            return f"(lower(e.batter_user) IN ({marks}) OR lower(e.pitcher_user) IN ({marks}))"
+
+        if "username" in filters:
+            clauses.append(user_clause(filters["username"]))
+        if "vs_username" in filters:
+            clauses.append(user_clause(filters["vs_username"]))
+        if "exclude_username" in filters:
+            clauses.append("NOT " + user_clause(filters["exclude_username"]))
+
+        if "start_time" in filters:
+            clauses.append("g.start_time >= ?")
+            args.append(int(filters["start_time"]))
+        if "end_time" in filters:
+            clauses.append("g.start_time <= ?")
+            args.append(int(filters["end_time"]))
+        if "stadium" in filters:
+            any_of("g.stadium", filters["stadium"])
+
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+
+def _is_missing(value) -> bool:
+    try:
+        return value is None or bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def _json_default(obj):
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    return str(obj)
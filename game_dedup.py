@@ -0,0 +1,161 @@
+"""Duplicate game detection for directory ingest.
+
+Both netplay participants can upload the same game, and stat-file folders
+also collect re-exports, so one game often sits in a folder more than once.
+Loaded naively every copy is counted: aggregates are inflated and the work
+is done twice. A DedupIndex recognises the copies before their events are
+parsed:
+
+    with DedupIndex("stat_files.dedup.json") as index:
+        paths = index.unique(decoded_paths("stat_files"))
+
+The directory loaders take the same thing as ``dedup=``: an index file path
+(kept between runs), a DedupIndex, or True for an index of this run only.
+
+A game is identified by ``StatObj.gameID()`` together with a fingerprint of
+its Events array: the header is parsed on its own (see
+stat_file_parser._split_events) and the still-encoded Events text is hashed
+with whitespace removed, so copies that differ only in formatting or in
+header metadata still match, while two different games that happen to share a
+GameID do not. The first path seen for a game owns it; later copies are
+skipped.
+
+The index is persistent: per file it keeps size, mtime and the identity, so a
+rerun only re-reads new or changed files, and a game stays owned by its file
+across runs, so a later folder holding a copy of an already ingested game is
+skipped too. Like the ingest manifest, a missing or corrupt index is an empty
+one and it is written atomically. Files that can't be read are never treated
+as duplicates; they are left for the loader to report.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from typing import Iterable, Optional
+
+from .stat_file_parser import StatObj, _split_events
+from .stat_sources import read_source, source_exists, source_stat
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+_WHITESPACE = b" \t\r\n"
+
+
+def game_identity(path) -> tuple[int, str]:
+    """``(gameID, events fingerprint)`` of a stat file source, without parsing its events."""
+    text = read_source(path).decode("utf-8")
+    header, events_span = _split_events(text)
+    if events_span is not None:
+        start, end = events_span
+        events = text[start:end].encode("utf-8")
+    else:
+        events = json.dumps(header.get("Events", []), separators=(",", ":")).encode("utf-8")
+    fingerprint = hashlib.blake2b(events.translate(None, _WHITESPACE), digest_size=16).hexdigest()
+    return StatObj(header).gameID(), fingerprint
+
+
+class DedupIndex:
+    """Persistent gameID + content fingerprint index of ingested stat files."""
+
+    def __init__(self, path=None):
+        self.path = None if path is None else os.fspath(path)
+        # abspath -> {"size", "mtime_ns", "game"}; game -> owning abspath
+        self._files: dict[str, dict] = {}
+        self._games: dict[str, str] = {}
+        self.duplicates: list[tuple[str, str]] = []
+
+        if self.path is None:
+            return
+        try:
+            with open(self.path, "r") as f:
+                blob = json.load(f)
+        except (OSError, ValueError) as ex:
+            if os.path.exists(self.path):
+                logger.warning("Ignoring unreadable dedup index %s: %s", self.path, ex)
+            return
+        if not isinstance(blob, dict) or blob.get("format") != FORMAT_VERSION:
+            logger.info("Ignoring dedup index %s written by another version", self.path)
+            return
+        self._files = blob.get("files", {})
+        self._games = blob.get("games", {})
+
+    def _game_key(self, abspath: str) -> Optional[str]:
+        # "<gameID>:<fingerprint>", re-read only when the file changed
+        try:
+            size, mtime_ns = source_stat(abspath)
+        except OSError:
+            return None
+        entry = self._files.get(abspath)
+        if entry is not None and (entry["size"], entry["mtime_ns"]) == (size, mtime_ns):
+            return entry["game"]
+        try:
+            game_id, fingerprint = game_identity(abspath)
+        except (ValueError, KeyError, TypeError, OSError) as ex:
+            logger.debug("Can't identify %s: %s", abspath, ex)
+            self._files.pop(abspath, None)
+            return None
+        key = f"{game_id}:{fingerprint}"
+        self._files[abspath] = {"size": size, "mtime_ns": mtime_ns, "game": key}
+        return key
+
+    def original(self, path) -> Optional[str]:
+        """The path of the earlier copy if ``path`` is a duplicate, else None.
+
+        A path that is not a duplicate becomes the owner of its game.
+        """
+        abspath = os.path.abspath(os.fspath(path))
+        key = self._game_key(abspath)
+        if key is None:
+            return None
+        owner = self._games.get(key)
+        # the owner may have been deleted or rewritten since it was indexed
+        if owner is not None and owner != abspath and self._game_key(owner) == key:
+            self.duplicates.append((os.fspath(path), owner))
+            return owner
+        self._games[key] = abspath
+        return None
+
+    def unique(self, paths: Iterable) -> list:
+        """The paths that are not copies of a game already seen, in order."""
+        before = len(self.duplicates)
+        unique = [path for path in paths if self.original(path) is None]
+        skipped = len(self.duplicates) - before
+        if skipped:
+            logger.info("Skipping %d duplicate stat file(s)", skipped)
+        return unique
+
+    def save(self) -> None:
+        """Writes the index (atomically), dropping files that no longer exist."""
+        if self.path is None:
+            return
+        files = {path: entry for path, entry in self._files.items() if source_exists(path)}
+        games = {key: owner for key, owner in self._games.items() if owner in files}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"format": FORMAT_VERSION, "files": files, "games": games}, f)
+        os.replace(tmp_path, self.path)
+
+    def __enter__(self) -> DedupIndex:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.save()
+
+
+def unique_paths(paths: Iterable, dedup=None) -> list:
+    """``paths`` without duplicate games; ``dedup`` as taken by the directory loaders.
+
+    None or False keeps every path, True dedups within this call, a DedupIndex
+    is used as is, and anything else names a persistent index file.
+    """
+    if dedup is None or dedup is False:
+        return list(paths)
+    if isinstance(dedup, DedupIndex):
+        return dedup.unique(paths)
+    with DedupIndex(None if dedup is True else dedup) as index:
+        return index.unique(paths)
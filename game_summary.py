@@ -17,7 +17,6 @@ Usage:
 """
 from __future__ import annotations
 
-import json
 from pathlib import Path
 
 import matplotlib
@@ -148,8 +147,7 @@ def _draw_hit_profile(ax, contacts: list[ha.ContactRecord]):
 # ---------------------------------------------------------------- driver
 
 def render_game_summary(stat_path, out_path=None) -> Path:
-    with open(stat_path) as f:
-        stat = StatObj(json.load(f))
+    stat = StatObj.from_path(stat_path)
     contacts = ha.simulate_contacts(stat)
     highlight_lines = ha.format_highlights(
         ha.game_highlights(contacts, stadium=stat.stadium()))
@@ -188,8 +186,7 @@ def main(argv=None):
     args = parser.parse_args(argv)
     out = render_game_summary(args.path, args.out)
     print(f"saved {out}")
-    with open(args.path) as f:
-        stat = StatObj(json.load(f))
+    stat = StatObj.from_path(args.path)
     contacts = ha.simulate_contacts(stat)
     for line in ha.format_highlights(ha.game_highlights(contacts, stadium=stat.stadium())):
         print(line)
@@ -23,7 +23,7 @@ from typing import Optional
 from . import hit_simulation as hs
 from .. import stadiums
 from .hit_simulation import HitResult
-from ..stat_file_parser import StatObj, EventObj
+from ..stat_file_parser import StatObj
 
 _SUPPORTED_SWINGS = ("Slap", "Charge", "Star")
 
@@ -98,11 +98,10 @@ def simulate_contacts(stat: StatObj) -> list[ContactRecord]:
     hit_sim_validation's skip behavior).
     """
     records = []
-    for i in range(len(stat.events())):
-        event = EventObj(stat, i)
+    # Only contact events can be simulated; a single EventObj cursor visits each one.
+    for event in stat.iter_events(stat.contact_events()):
+        i = event.eventIndex
         contact = event.contact_dict()
-        if not contact:
-            continue
         swing = event.pitch_dict().get("Type of Swing")
         if swing not in _SUPPORTED_SWINGS:
             continue
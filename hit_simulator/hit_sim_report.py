@@ -17,7 +17,7 @@ know how to pull a value out of its record type) and feeds this report.
 from __future__ import annotations
 
 import math
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import Callable, Optional
 
 from .. import stadiums
@@ -103,6 +103,23 @@ class ValidationReport:
             mine.expected_examples += st.expected_examples
         return self
 
+    def to_dict(self) -> dict:
+        """JSON-serializable form (tuples become lists; see from_dict)."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ValidationReport":
+        def tuples(value):
+            return tuple(tuples(v) for v in value) if isinstance(value, list) else value
+        fields = {}
+        for name, st in data["fields"].items():
+            fields[name] = FieldStat(name, st["matches"], st["total"], st["expected"],
+                                     [tuples(m) for m in st["mismatches"]],
+                                     [tuples(e) for e in st["expected_examples"]])
+        return cls(fields, data["total_events"], data["contact_events"], data["simulated"],
+                   [tuples(s) for s in data["skipped"]], [tuples(e) for e in data["errors"]],
+                   data["files"])
+
     def all_fields_perfect(self) -> bool:
         return all(st.failures == 0 for st in self.fields.values())
 
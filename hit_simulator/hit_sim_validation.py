@@ -20,13 +20,15 @@ Usage:
     print(report.summary())
 
     report = v.validate_directory(r"path/to/StatFiles")     # aggregates
+    report = v.validate_directory(r"path/to/StatFiles", workers=16)
     # or programmatically inspect report.fields[...].mismatches
 
 CLI:
-    python -m pyrio.hit_sim_validation <file-or-directory> [--landing]
+    python -m pyrio.hit_sim_validation <file-or-directory> [--landing] [-j WORKERS]
 """
 from __future__ import annotations
 
+import functools
 import json
 from dataclasses import dataclass
 from pathlib import Path
@@ -38,7 +40,11 @@ from ..constants import game_constants as G
 from ..lookup import LookupDicts
 from .hit_sim_report import (FieldSpec, ValidationReport, ci,
                              note_block_deflected, resolve_landing)
+from ..game_dedup import unique_paths
+from ..ingest_manifest import IngestManifest
+from ..parallel_loader import map_stat_files
 from ..stat_file_parser import StatObj, EventObj
+from ..stat_sources import list_sources, stat_name
 
 # game Type of Swing codes that the simulator supports: 1 Slap, 2 Charge, 3 Star.
 _SUPPORTED_SWING_CODES = (1, 2, 3)
@@ -231,12 +237,10 @@ def validate_statobj(stat: StatObj, *, include_landing: bool = False,
     if include_landing:
         specs = specs + _landing_field_specs(landing_tol)
 
-    for i, _ev in enumerate(stat.events()):
-        report.total_events += 1
-        event = EventObj(stat, i)
+    report.total_events += len(stat.events())
+    for event in stat.iter_events(stat.contact_events()):
+        i = event.eventIndex
         contact = event.contact_dict()
-        if not contact:
-            continue
         report.contact_events += 1
 
         swing = event.pitch_dict().get("Type of Swing")
@@ -305,24 +309,49 @@ def validate_statobj(stat: StatObj, *, include_landing: bool = False,
 
 def validate_file(path, **opts) -> ValidationReport:
     """Validate a single decoded stat-file path."""
-    with open(path) as f:
-        stat = StatObj(json.load(f))
+    stat = StatObj.from_path(path)
     return validate_statobj(stat, **opts)
 
 
-def _iter_decoded_files(directory) -> Iterable[Path]:
-    for p in sorted(Path(directory).iterdir()):
-        if p.is_file() and "decoded" in p.name and p.suffix == ".json":
-            yield p
+def _iter_decoded_files(directory) -> Iterable[str]:
+    # compressed files and bundle members too, see stat_sources.py
+    for source in list_sources(directory):
+        if stat_name(source).endswith(".json"):
+            yield source
+
+
+def validate_directory(directory, workers: Optional[int] = None, manifest=None,
+                       dedup=None, **opts) -> ValidationReport:
+    """Validate every decoded stat file in a directory (aggregated report).
+
+    ``workers`` validates the files in a process pool (see parallel_loader);
+    the per-file reports are merged in file order, so the result is the same
+    as the serial run.
 
+    ``manifest`` names an ingest manifest file (see ingest_manifest) holding
+    each file's report; a rerun only validates new or changed files. Files
+    that failed to load are retried on every run.
+
+    ``dedup`` skips copies of the same game (both players' uploads,
+    re-exports) before they are parsed; see game_dedup.
+    """
+    paths = unique_paths(_iter_decoded_files(directory), dedup)
+    if manifest is not None:
+        return _validate_directory_incremental(paths, workers, manifest, opts)
 
-def validate_directory(directory, **opts) -> ValidationReport:
-    """Validate every decoded stat file in a directory (aggregated report)."""
     report = ValidationReport()
-    for path in _iter_decoded_files(directory):
+    if workers is not None:
+        results = map_stat_files(
+            paths, functools.partial(validate_statobj, **opts),
+            workers=workers, ordered=True,
+            on_error=lambda path, ex: report.errors.append((str(path), -1, f"load failed: {ex}")))
+        for _, file_report in results:
+            report.merge(file_report)
+        return report
+
+    for path in paths:
         try:
-            with open(path) as f:
-                stat = StatObj(json.load(f))
+            stat = StatObj.from_path(path)
         except (json.JSONDecodeError, OSError) as ex:
             report.errors.append((str(path), -1, f"load failed: {ex}"))
             continue
@@ -330,6 +359,35 @@ def validate_directory(directory, **opts) -> ValidationReport:
     return report
 
 
+def _validate_directory_incremental(paths, workers, manifest_path, opts) -> ValidationReport:
+    reports: dict[str, ValidationReport] = {}
+    load_errors: dict[str, str] = {}
+    with IngestManifest(manifest_path, params={"job": "hit_sim_validation", **opts}) as manifest:
+        changed = []
+        for path in paths:
+            stored = manifest.lookup(path)
+            if stored is None:
+                changed.append(path)
+            else:
+                reports[path] = ValidationReport.from_dict(stored)
+
+        results = map_stat_files(
+            changed, functools.partial(validate_statobj, **opts),
+            workers=0 if workers is None else workers, ordered=True,
+            on_error=lambda path, ex: load_errors.__setitem__(path, f"load failed: {ex}"))
+        for path, file_report in results:
+            manifest.record(path, file_report.to_dict())
+            reports[path] = file_report
+
+    report = ValidationReport()
+    for path in paths:
+        if path in load_errors:
+            report.errors.append((str(path), -1, load_errors[path]))
+        else:
+            report.merge(reports[path])
+    return report
+
+
 def validate(path, **opts) -> ValidationReport:
     """Validate a file or directory (dispatches on path type)."""
     return validate_directory(path, **opts) if Path(path).is_dir() else validate_file(path, **opts)
@@ -359,8 +417,16 @@ def main(argv=None):
     parser.add_argument("--no-tags", action="store_true",
                         help="don't resolve match tags from the ProjectRio API; "
                              "known-mod exceptions (e.g. Remove slice) won't be excused")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="validate a directory's files in this many processes")
+    parser.add_argument("--manifest", default=None,
+                        help="ingest manifest file; reruns only validate new or changed files")
+    parser.add_argument("--dedup", default=None,
+                        help="duplicate-game index file; copies of the same game are validated once")
     args = parser.parse_args(argv)
-    report = validate(args.path, include_landing=args.landing,
+    opts = ({"workers": args.workers, "manifest": args.manifest, "dedup": args.dedup}
+            if Path(args.path).is_dir() else {})
+    report = validate(args.path, **opts, include_landing=args.landing,
                       landing_exclude_caught=not args.include_caught_landing,
                       walls=args.walls, bounces=args.bounces,
                       active_tags=frozenset() if args.no_tags else None)
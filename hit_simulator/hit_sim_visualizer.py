@@ -45,6 +45,7 @@ if __package__:
     from .. import rio_tags
     from .. import stadiums
     from ..constants import game_constants as G
+    from ..ingest_manifest import IngestManifest
     from ..lookup import LookupDicts
     from ..stat_file_parser import StatObj, EventObj
 else:
@@ -56,6 +57,7 @@ else:
     import rio_tags
     import stadiums
     from ..constants import game_constants as G
+    from ..ingest_manifest import IngestManifest
     from ..lookup import LookupDicts
     from ..stat_file_parser import StatObj, EventObj
 
@@ -137,10 +139,10 @@ def _collect_events(paths):
             tags = rio_tags.active_tags_for_stat(stat)
         except Exception:
             tags = frozenset()
-        for i in range(len(list(stat.events()))):
+        for i in stat.contact_events():
             event = EventObj(stat, i)
             contact = event.contact_dict()
-            if contact and "Ball Landing Position - X" in contact:
+            if "Ball Landing Position - X" in contact:
                 yield event, contact, stadium_code, stadium_name, tags
 
 
@@ -279,10 +281,8 @@ def _render(by_stadium, n_ok, n_total, threshold, out, show, suptitle=None):
         plt.show()
 
 
-def visualize(paths, threshold=1.0, out=None, show=True):
-    """Build one figure per stadium found across `paths` (stat files)."""
-    by_stadium: dict = {}
-    n_ok = n_total = 0
+def _rows_for_paths(paths, threshold):
+    """Yield (stadium_code, _Row) for every drawable contact event in `paths`."""
     for event, contact, stadium_code, stadium_name, tags in _collect_events(paths):
         try:
             result = hs.simulate_hit_from_event(event, tags)
@@ -291,13 +291,41 @@ def visualize(paths, threshold=1.0, out=None, show=True):
             continue
         landing = _effective_landing(event, contact, result, stadium_name, tags)
         cat, err = _classify(contact, result, landing, stadium_name, threshold)
-        by_stadium.setdefault(stadium_code, []).append(
-            _Row(result.trajectory, result.garlic_trajectory, tuple(landing),
-                 _recorded_landing(contact), f"ev{event.event_num()} {event.batter()}",
-                 cat, err))
-        if cat in (_OK, _MISS):
+        yield stadium_code, _Row(result.trajectory, result.garlic_trajectory, tuple(landing),
+                                 _recorded_landing(contact),
+                                 f"ev{event.event_num()} {event.batter()}", cat, err)
+
+
+def _cached_rows(paths, threshold, manifest_path):
+    """_rows_for_paths, reusing each unchanged file's rows from an ingest manifest."""
+    def points(value):
+        return None if value is None else [tuple(p) for p in value]
+
+    with IngestManifest(manifest_path, params={"job": "hit_sim_visualizer", "threshold": threshold}) as manifest:
+        for path in paths:
+            stored = manifest.lookup(path)
+            if stored is None:
+                stored = [[code, *row] for code, row in _rows_for_paths([path], threshold)]
+                manifest.record(path, stored)
+            for code, traj, garlic, sim_landing, rec_landing, label, cat, err in stored:
+                yield code, _Row(points(traj), points(garlic), tuple(sim_landing),
+                                 None if rec_landing is None else tuple(rec_landing), label, cat, err)
+
+
+def visualize(paths, threshold=1.0, out=None, show=True, manifest=None):
+    """Build one figure per stadium found across `paths` (stat files).
+
+    `manifest` names an ingest manifest file (see ingest_manifest) caching each
+    file's simulated rows, so a rerun only simulates new or changed files.
+    """
+    by_stadium: dict = {}
+    n_ok = n_total = 0
+    rows = _rows_for_paths(paths, threshold) if manifest is None else _cached_rows(paths, threshold, manifest)
+    for stadium_code, row in rows:
+        by_stadium.setdefault(stadium_code, []).append(row)
+        if row.cat in (_OK, _MISS):
             n_total += 1
-            n_ok += cat == _OK
+            n_ok += row.cat == _OK
 
     _render(by_stadium, n_ok, n_total, threshold, out, show)
 
@@ -376,6 +404,7 @@ def main(argv=None):
     ap.add_argument("--threshold", type=float, default=1.0, help="match threshold in units (default 1.0)")
     ap.add_argument("--out", help="save figure(s) to this PNG path (stadium suffix added if >1)")
     ap.add_argument("--no-show", dest="show", action="store_false", help="don't open a window")
+    ap.add_argument("--manifest", help="ingest manifest file; reruns only simulate new or changed files")
     # API mode: pull games from ProjectRio's /landing_data/ instead of local files.
     ap.add_argument("--api", action="store_true",
                     help="pull events from the /landing_data/ endpoint instead of stat files")
@@ -395,7 +424,7 @@ def main(argv=None):
     paths = [Path(p) for p in args.paths] or sorted(_DEFAULT_DIR.glob("*.json"))
     if not paths:
         ap.error(f"no input files (looked in {_DEFAULT_DIR})")
-    visualize(paths, threshold=args.threshold, out=args.out, show=args.show)
+    visualize(paths, threshold=args.threshold, out=args.out, show=args.show, manifest=args.manifest)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,441 @@
+"""Following a live HUD file.
+
+Project Rio rewrites its HUD JSON after every pitch and play. Overlays used
+to re-read and re-parse it on a timer, paying for a parse every tick and
+adding up to a tick of lag. A HudTailer parses only when the file changed
+and hands out HudObj snapshots as soon as it does:
+
+    with HudTailer("decoded.hud.json") as tailer:
+        for hud in tailer:                  # blocks until the next change
+            draw(hud)
+
+    hud = tailer.poll()                     # or from a render loop: never blocks,
+                                            # None when nothing changed
+
+A change is detected from the file's (inode, size, mtime) signature, so an
+unchanged file costs one stat() per check; a file rewritten with identical
+content is not re-parsed either. On Linux the directory is watched with
+inotify and a write wakes the tailer at once; elsewhere (or when inotify is
+unavailable) it polls every ``interval`` seconds, which bounds the latency.
+
+The writer may be caught half way: a file that does not parse yet (truncated
+JSON, or a HUD without its fields) is skipped without raising, and the
+snapshot is emitted once the write completes. Both in-place writes and
+atomic replaces (write to a temp file, rename over) are followed.
+
+For many HUD files at once (one per setup on a tournament stream) the
+AsyncHudWatcher follows them all from one asyncio loop in one process and
+publishes updates to any number of async subscribers:
+
+    async with AsyncHudWatcher({"setup1": "s1/decoded.hud.json",
+                                "setup2": "s2/decoded.hud.json"}) as watcher:
+        async for update in watcher.subscribe(diffs=True):
+            redraw(update.stream, update.changes)      # see HudObj.diff
+
+Each file is parsed once per change however many subscribers there are,
+and the diff is computed once and shared. A subscriber's buffer is bounded;
+with ``overflow="wait"`` (lossless) a full buffer holds back that stream's
+publisher until the subscriber catches up, while ``overflow="latest"``
+never blocks and keeps only the newest pending update per stream (diffs of
+replaced updates are merged into it), which suits a renderer that only
+needs the current state.
+"""
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, Union
+
+from . import json_backend
+from .stat_file_parser import HudObj
+
+logger = logging.getLogger(__name__)
+
+# inotify(7)
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")
+
+# with inotify the file is still re-checked this often, in case an event is missed
+_INOTIFY_RECHECK = 1.0
+
+
+class Inotify:
+    """Minimal inotify binding: which watched files were written since the last read.
+
+    Directories are watched rather than files, so a file replaced by a rename
+    keeps being followed. ``fileno()`` becomes readable when there are events,
+    for select() or an event loop's add_reader.
+    """
+
+    MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+        self._libc = libc
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories: dict[int, str] = {}
+        self._watched: set[str] = set()
+
+    @classmethod
+    def create(cls) -> Optional[Inotify]:
+        """An Inotify, or None where the platform has none."""
+        try:
+            return cls()
+        except (OSError, AttributeError) as ex:
+            logger.debug("inotify unavailable, polling instead: %s", ex)
+            return None
+
+    def watch(self, path) -> None:
+        path = os.path.abspath(os.fspath(path))
+        directory = os.path.dirname(path)
+        if directory not in self._directories.values():
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"Can't watch {directory}")
+            self._directories[wd] = directory
+        self._watched.add(path)
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def read(self) -> set[str]:
+        """The watched paths with pending events (does not block)."""
+        changed = set()
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(buffer):
+                wd, _, _, length = _EVENT.unpack_from(buffer, offset)
+                offset += _EVENT.size
+                name = buffer[offset:offset + length].rstrip(b"\0")
+                offset += length
+                directory = self._directories.get(wd)
+                if directory is not None:
+                    path = os.path.join(directory, os.fsdecode(name))
+                    if path in self._watched:
+                        changed.add(path)
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class HudTailer:
+    """Follows one HUD file and emits a HudObj each time its content changes."""
+
+    def __init__(self, path, interval: float = 0.1, use_inotify: bool = True):
+        self.path = os.path.abspath(os.fspath(path))
+        self.interval = interval
+        self.latest: Optional[HudObj] = None
+        self._signature = None
+        self._data: Optional[bytes] = None
+        self._inotify = Inotify.create() if use_inotify else None
+        if self._inotify is not None:
+            self._inotify.watch(self.path)
+
+    def poll(self) -> Optional[HudObj]:
+        """The new snapshot if the file changed since the last one, else None.
+
+        Never blocks: a missing, unreadable or half-written file is None too.
+        """
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+        if signature == self._signature:
+            return None
+        self._signature = signature
+
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if data == self._data:
+            return None
+        try:
+            hud = HudObj(json_backend.loads(data))
+            # the fields diff() reads; a snapshot missing one is not published
+            hud._state()
+        except (ValueError, KeyError, TypeError) as ex:
+            # caught mid-write; read again on the next check, even if the
+            # rest of the write lands within the same mtime tick
+            logger.debug("HUD file %s not complete yet: %s", self.path, ex)
+            self._signature = None
+            return None
+        self._data = data
+        self.latest = hud
+        return hud
+
+    def _sleep(self, seconds: float) -> None:
+        if self._inotify is None:
+            time.sleep(seconds)
+            return
+        readable, _, _ = select.select([self._inotify], [], [], seconds)
+        if readable:
+            self._inotify.read()
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[HudObj]:
+        """Blocks until the next snapshot; None if ``timeout`` seconds pass first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            hud = self.poll()
+            if hud is not None:
+                return hud
+            pause = self.interval if self._inotify is None else _INOTIFY_RECHECK
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                pause = min(pause, remaining)
+            self._sleep(pause)
+
+    def __iter__(self) -> Iterator[HudObj]:
+        while True:
+            yield self.wait()
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def __enter__(self) -> HudTailer:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ---------------------------------------------------------------- asyncio
+
+@dataclass(frozen=True)
+class HudUpdate:
+    """One new snapshot of one stream; ``changes`` is ``hud.diff(previous)`` for diff subscribers."""
+    stream: str
+    hud: HudObj
+    changes: Optional[dict] = None
+
+
+def _merge_changes(older: dict, newer: dict) -> dict:
+    merged = {**older, **newer}
+    if "defensive_diamond" in older and "defensive_diamond" in newer:
+        merged["defensive_diamond"] = {**older["defensive_diamond"], **newer["defensive_diamond"]}
+    return merged
+
+
+class HudSubscription:
+    """Async iterator of HudUpdates for one subscriber, see AsyncHudWatcher.subscribe."""
+
+    def __init__(self, streams: Optional[set], maxsize: int, diffs: bool, overflow: str):
+        if overflow not in ("wait", "latest"):
+            raise ValueError(f'Invalid overflow {overflow!r}. Choose "wait" or "latest".')
+        if maxsize < 1:
+            raise ValueError(f'Invalid maxsize {maxsize}. Must be at least 1.')
+        self.streams = streams
+        self.maxsize = maxsize
+        self.diffs = diffs
+        self.overflow = overflow
+        self.replaced = 0
+        self._fifo: deque = deque()
+        self._latest: OrderedDict = OrderedDict()
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._fifo) + len(self._latest)
+
+    def wants(self, update: HudUpdate) -> bool:
+        if self.streams is not None and update.stream not in self.streams:
+            return False
+        return not self.diffs or bool(update.changes)
+
+    async def put(self, update: HudUpdate) -> None:
+        if self.overflow == "latest":
+            pending = self._latest.pop(update.stream, None)
+            if pending is not None:
+                self.replaced += 1
+                if self.diffs:
+                    update = HudUpdate(update.stream, update.hud,
+                                       _merge_changes(pending.changes, update.changes))
+            self._latest[update.stream] = update
+        else:
+            while len(self._fifo) >= self.maxsize and not self._closed:
+                self._writable.clear()
+                await self._writable.wait()
+            if self._closed:
+                return
+            self._fifo.append(update)
+        self._readable.set()
+
+    async def get(self) -> HudUpdate:
+        """The next update; raises StopAsyncIteration once closed and drained."""
+        while not self._fifo and not self._latest:
+            if self._closed:
+                raise StopAsyncIteration
+            self._readable.clear()
+            await self._readable.wait()
+        if self._fifo:
+            update = self._fifo.popleft()
+            self._writable.set()
+        else:
+            _, update = self._latest.popitem(last=False)
+        return update
+
+    def close(self) -> None:
+        self._closed = True
+        self._readable.set()
+        self._writable.set()
+
+    def __aiter__(self) -> HudSubscription:
+        return self
+
+    async def __anext__(self) -> HudUpdate:
+        return await self.get()
+
+
+class AsyncHudWatcher:
+    """Follows many HUD files in one asyncio loop and publishes to subscribers.
+
+    ``paths`` maps stream names to HUD files (an iterable of paths uses the
+    paths as names). One task per stream polls its HudTailer; with inotify
+    they sleep until the shared inotify descriptor reports their file,
+    otherwise they poll every ``interval`` seconds.
+    """
+
+    def __init__(self, paths: Union[dict, Iterable], interval: float = 0.1, use_inotify: bool = True):
+        if not isinstance(paths, dict):
+            paths = {os.fspath(path): path for path in paths}
+        self.interval = interval
+        self._inotify = Inotify.create() if use_inotify else None
+        self._tailers = {name: HudTailer(path, interval, use_inotify=False) for name, path in paths.items()}
+        self._wakeups: dict[str, asyncio.Event] = {}
+        self._subscriptions: list[HudSubscription] = []
+        self._tasks: list[asyncio.Task] = []
+        self._running = False
+        if self._inotify is not None:
+            for tailer in self._tailers.values():
+                self._inotify.watch(tailer.path)
+
+    @property
+    def streams(self) -> list[str]:
+        return list(self._tailers)
+
+    def latest(self, stream: str) -> Optional[HudObj]:
+        """The last snapshot published for a stream."""
+        return self._tailers[stream].latest
+
+    def subscribe(self, streams: Optional[Iterable[str]] = None, maxsize: int = 16,
+                  diffs: bool = False, overflow: str = "wait") -> HudSubscription:
+        """A new subscriber to every stream, or only to ``streams``.
+
+        With ``diffs`` an update carries ``changes`` and updates that changed
+        none of HudObj.diff's fields are not delivered. A subscriber that
+        stops consuming should be closed (or unsubscribed) so "wait" doesn't
+        hold its streams back.
+        """
+        subscription = HudSubscription(None if streams is None else set(streams), maxsize, diffs, overflow)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: HudSubscription) -> None:
+        subscription.close()
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def _on_inotify(self) -> None:
+        changed = self._inotify.read()
+        for name, tailer in self._tailers.items():
+            if tailer.path in changed:
+                self._wakeups[name].set()
+
+    async def _publish(self, update: HudUpdate) -> None:
+        for subscription in list(self._subscriptions):
+            if subscription.wants(update):
+                await subscription.put(update)
+
+    async def _follow(self, name: str, tailer: HudTailer) -> None:
+        wakeup = self._wakeups[name]
+        previous = None
+        while self._running:
+            hud = tailer.poll()
+            if hud is not None:
+                wants_diffs = any(subscription.diffs for subscription in self._subscriptions)
+                try:
+                    changes = hud.diff(previous) if wants_diffs else None
+                except Exception:
+                    # one bad snapshot must not end the stream
+                    logger.exception("Can't diff HUD snapshot %s of %s", hud.event_number, name)
+                    continue
+                await self._publish(HudUpdate(name, hud, changes))
+                previous = hud
+                continue
+            if self._inotify is None:
+                await asyncio.sleep(self.interval)
+                continue
+            wakeup.clear()
+            try:
+                await asyncio.wait_for(wakeup.wait(), _INOTIFY_RECHECK)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Starts following, in the running event loop."""
+        if self._tasks:
+            return
+        loop = asyncio.get_running_loop()
+        self._running = True
+        self._wakeups = {name: asyncio.Event() for name in self._tailers}
+        if self._inotify is not None:
+            loop.add_reader(self._inotify.fileno(), self._on_inotify)
+        self._tasks = [loop.create_task(self._follow(name, tailer), name=f"hud:{name}")
+                       for name, tailer in self._tailers.items()]
+
+    async def stop(self) -> None:
+        """Stops following and ends every subscription."""
+        # a flag and a wakeup, not just cancel(): wait_for can swallow a
+        # cancellation that races with the wakeup it is waiting on
+        self._running = False
+        for subscription in self._subscriptions:
+            subscription.close()
+        for wakeup in self._wakeups.values():
+            wakeup.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._inotify is not None:
+            asyncio.get_running_loop().remove_reader(self._inotify.fileno())
+            self._inotify.close()
+            self._inotify = None
+
+    async def __aenter__(self) -> AsyncHudWatcher:
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
@@ -0,0 +1,189 @@
+"""Incremental re-runs of directory jobs.
+
+Stat-file folders grow by a few files at a time, but a directory job (the
+pitch CSV, hit-sim validation, the visualizer) used to re-parse every file on
+every run. An IngestManifest remembers, per input file, its size, mtime and
+content hash, and keeps the output the job derived from it in a sidecar file
+named by that hash, so a rerun only processes new or changed files:
+
+    with IngestManifest("pitches.manifest.json", params={"char_attrs": True}) as manifest:
+        for path in paths:
+            rows = manifest.lookup(path)
+            if rows is None:
+                rows = build_rows(path)
+                manifest.record(path, rows)
+
+A file whose size and mtime are unchanged is trusted without reading it; one
+whose mtime moved is re-hashed, and only reprocessed if its content changed.
+``params`` describes the job's options: when they differ from the stored ones
+every entry is stale. Outputs are stored as JSON, so they must be JSON
+serializable (the job converts richer results itself).
+
+The manifest itself holds only the fingerprints; the outputs live in the
+``<manifest>.d`` directory, one ``<content hash>.json`` per file, written
+once when recorded and read only when looked up. A run touching a few files
+reads and writes a few outputs, however large the folder's outputs are.
+
+Like the web cache, a missing, corrupt or incompatible manifest (or output)
+is an empty one, never an error, and each is written atomically. Saving keeps
+only the files looked up or recorded in this run, so deleted inputs and their
+outputs drop out.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Optional
+
+from .stat_sources import read_source, source_stat, split_source
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 2
+_HASH_BLOCK = 1 << 20
+_MISSING = object()
+
+
+def file_hash(path) -> str:
+    """blake2b hex digest of a file's content (or of a bundle member's, see stat_sources)."""
+    digest = hashlib.blake2b(digest_size=16)
+    if split_source(path)[1] is not None:
+        digest.update(read_source(path))
+        return digest.hexdigest()
+    with open(path, "rb") as f:
+        while block := f.read(_HASH_BLOCK):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _params_key(params) -> str:
+    # sets have no stable order between runs; sort them
+    def default(obj):
+        if isinstance(obj, (set, frozenset)):
+            return sorted(obj, key=repr)
+        return repr(obj)
+    return json.dumps(params, sort_keys=True, default=default)
+
+
+def _to_json(obj):
+    # NumPy values in derived outputs (e.g. float64 in validation reports)
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=repr)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _write_json(path: str, obj) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(obj, f, default=_to_json)
+    os.replace(tmp_path, path)
+
+
+class IngestManifest:
+    """Per-file fingerprints of one directory job, and a store of its outputs."""
+
+    def __init__(self, path, params: Optional[dict] = None):
+        self.path = os.fspath(path)
+        self.outputs_dir = self.path + ".d"
+        self.params = _params_key(params or {})
+        self._entries: dict[str, dict] = {}
+        self._seen: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+        try:
+            with open(self.path, "r") as f:
+                blob = json.load(f)
+        except (OSError, ValueError) as ex:
+            if os.path.exists(self.path):
+                logger.warning("Ignoring unreadable ingest manifest %s: %s", self.path, ex)
+            return
+        if not isinstance(blob, dict) or blob.get("format") != FORMAT_VERSION:
+            logger.info("Ignoring ingest manifest %s written by another version", self.path)
+            return
+        if blob.get("params") != self.params:
+            logger.info("Job options changed; every file in %s is stale", self.path)
+            return
+        self._entries = blob.get("files", {})
+
+    @staticmethod
+    def _key(file_path) -> str:
+        return os.path.abspath(os.fspath(file_path))
+
+    def _output_path(self, content_hash: str) -> str:
+        return os.path.join(self.outputs_dir, content_hash + ".json")
+
+    def _read_output(self, entry: dict) -> Any:
+        try:
+            with open(self._output_path(entry["hash"]), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as ex:
+            logger.debug("Stored output %s unusable: %s", entry["hash"], ex)
+            return _MISSING
+
+    def lookup(self, file_path, default=None) -> Any:
+        """The stored output for ``file_path``, or ``default`` if it is new or changed."""
+        key = self._key(file_path)
+        self._seen.add(key)
+        entry = self._entries.get(key)
+        if entry is not None:
+            try:
+                size, mtime_ns = source_stat(key)
+            except OSError:
+                entry = None
+            else:
+                if (size, mtime_ns) != (entry["size"], entry["mtime_ns"]):
+                    # touched, but maybe not changed: compare content
+                    if size == entry["size"] and file_hash(key) == entry["hash"]:
+                        entry["mtime_ns"] = mtime_ns
+                    else:
+                        entry = None
+        output = _MISSING if entry is None else self._read_output(entry)
+        if output is _MISSING:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return default
+        self.hits += 1
+        return output
+
+    def record(self, file_path, output: Any) -> None:
+        """Stores the output derived from ``file_path`` as it is on disk now."""
+        key = self._key(file_path)
+        size, mtime_ns = source_stat(key)
+        self._seen.add(key)
+        entry = {"size": size, "mtime_ns": mtime_ns, "hash": file_hash(key)}
+        os.makedirs(self.outputs_dir, exist_ok=True)
+        _write_json(self._output_path(entry["hash"]), output)
+        self._entries[key] = entry
+
+    def save(self) -> None:
+        """Writes the entries of the files seen in this run (atomically) and drops unused outputs."""
+        files = {key: entry for key, entry in self._entries.items() if key in self._seen}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        _write_json(self.path, {"format": FORMAT_VERSION, "params": self.params, "files": files})
+        self._remove_unused_outputs({entry["hash"] + ".json" for entry in files.values()})
+        logger.info("Ingest manifest %s: %d reused, %d processed", self.path, self.hits, self.misses)
+
+    def _remove_unused_outputs(self, used: set[str]) -> None:
+        try:
+            names = os.listdir(self.outputs_dir)
+        except OSError:
+            return
+        for name in names:
+            if name not in used:
+                try:
+                    os.remove(os.path.join(self.outputs_dir, name))
+                except OSError:
+                    pass
+
+    def __enter__(self) -> IngestManifest:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        # saved even when the job fails part way, so finished files are kept
+        self.save()
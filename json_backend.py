@@ -0,0 +1,151 @@
+"""Pluggable JSON decoding for stat files.
+
+Parsing JSON is the largest single cost of loading a corpus of decoded stat
+files. This module routes every stat-file load through one ``loads`` that uses
+the fastest decoder installed, falling back to the standard library:
+
+    msgspec  ->  orjson  ->  json
+
+    from pyrio import json_backend
+    json_backend.get_backend()           # 'msgspec' if installed
+    json_backend.set_backend('json')     # force one; None re-detects
+    stat = StatObj.from_path(path)       # loads through the active backend
+
+The default can also be chosen with the ``PYRIO_JSON_BACKEND`` environment
+variable. All backends return plain dicts and lists, and all of them raise
+``json.JSONDecodeError`` on malformed input.
+
+``decode_stat_file_typed`` is the opt-in typed path: with msgspec installed
+it decodes straight into the slotted structs of ``stat_structs`` (for
+analysis code that wants attributes rather than dicts; StatObj itself still
+works on dicts).
+
+Run ``python -m pyrio.json_backend <decoded.json | directory>`` to time each
+available backend on your own files.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Any, Optional, Union
+
+BACKENDS = ("msgspec", "orjson", "json")
+
+_backend: Optional[str] = None
+_loads = None
+
+
+def _make_loads(name: str):
+    if name == "orjson":
+        import orjson
+        return orjson.loads      # orjson.JSONDecodeError subclasses json's
+
+    if name == "msgspec":
+        import msgspec
+        decoder = msgspec.json.Decoder()
+
+        def loads(data):
+            try:
+                return decoder.decode(data)
+            except msgspec.DecodeError as ex:
+                raise json.JSONDecodeError(str(ex), "", 0) from None
+        return loads
+
+    if name == "json":
+        return json.loads
+
+    raise ValueError(f"Unknown JSON backend {name!r}. Choose from {BACKENDS}.")
+
+
+def available_backends() -> list[str]:
+    """The installed backends, fastest first."""
+    available = []
+    for name in BACKENDS:
+        try:
+            _make_loads(name)
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+
+def set_backend(name: Optional[str] = None) -> None:
+    """Selects a backend by name; None picks the fastest installed one."""
+    global _backend, _loads
+    if name is None:
+        name = os.environ.get("PYRIO_JSON_BACKEND") or available_backends()[0]
+    _loads = _make_loads(name)
+    _backend = name
+
+
+def get_backend() -> str:
+    if _backend is None:
+        set_backend()
+    return _backend
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decodes JSON text with the active backend."""
+    if _loads is None:
+        set_backend()
+    return _loads(data)
+
+
+def load_path(path) -> Any:
+    """Reads and decodes a JSON file with the active backend."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def decode_stat_file_typed(data: Union[str, bytes]):
+    """Decodes a stat file into ``stat_structs.StatFile`` (requires msgspec)."""
+    from .stat_structs import decode_stat_file
+    return decode_stat_file(data)
+
+
+# ---------------------------------------------------------------- benchmark
+
+def benchmark(paths: list, repeat: int = 3) -> dict[str, float]:
+    """Best-of-``repeat`` seconds to decode ``paths`` with each backend."""
+    blobs = []
+    for path in paths:
+        with open(path, "rb") as f:
+            blobs.append(f.read())
+
+    timings = {}
+    for name in available_backends():
+        decode = _make_loads(name)
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for blob in blobs:
+                decode(blob)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+    return timings
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Time the available JSON backends on decoded stat files")
+    parser.add_argument("path", help="decoded stat file or directory of them")
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.path):
+        paths = [os.path.join(args.path, name) for name in sorted(os.listdir(args.path))
+                 if "decoded" in name and name.endswith(".json")]
+    else:
+        paths = [args.path]
+
+    timings = benchmark(paths, repeat=args.repeat)
+    baseline = timings["json"]
+    print(f"{len(paths)} file(s), best of {args.repeat}")
+    for name, seconds in sorted(timings.items(), key=lambda item: item[1]):
+        print(f"  {name:8s} {seconds * 1000:9.1f} ms   {baseline / seconds:5.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,147 @@
+"""Parallel loading of stat-file directories.
+
+Parsing is the bottleneck when working through a large directory of decoded
+stat files, and it parallelizes perfectly: every file is independent. This
+module spreads loading, and an optional per-game function, across a process
+pool:
+
+    from pyrio.parallel_loader import decoded_paths, map_stat_files
+    for path, result in map_stat_files(decoded_paths("stat_files"), summarize, workers=16):
+        ...
+
+``fn`` runs in the worker next to the parse, so only its result travels back
+to the parent. Return something small (a row, a dict of counts, a report)
+rather than the StatObj itself where possible; with ``fn=None`` the StatObjs
+are pickled back whole. ``fn`` must be picklable: a module-level function, a
+``functools.partial`` of one, or an ``operator.methodcaller``, not a lambda.
+
+Paths are dispatched in chunks of ``chunksize`` and at most ``max_in_flight``
+chunks are pending or buffered at once, so memory stays bounded however many
+files there are. Results come back as chunks finish; ``ordered=True`` yields
+them in input order instead (completed chunks wait in the buffer, which counts
+towards ``max_in_flight``). ``workers=0`` or ``1`` runs everything in-process.
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from .game_dedup import unique_paths
+from .stat_sources import list_sources
+from .stat_file_parser import StatObj
+
+logger = logging.getLogger(__name__)
+
+# errors that mean "this file can't be loaded", as opposed to a bug in fn
+LOAD_ERRORS = (json.JSONDecodeError, OSError, UnicodeDecodeError)
+
+
+def decoded_paths(directory, dedup=None) -> list[str]:
+    """Sorted paths of the decoded stat files in a directory.
+
+    Compressed files and the members of zip/tar bundles are included (see
+    stat_sources.list_sources). ``dedup`` drops copies of the same game (see
+    game_dedup.unique_paths).
+    """
+    return unique_paths(list_sources(directory), dedup)
+
+
+def _process_chunk(paths: list, fn: Optional[Callable], lazy_events: bool) -> list[tuple]:
+    # runs in the worker: (path, loaded?, result or load error) per path
+    results = []
+    for path in paths:
+        try:
+            stat = StatObj.from_path(path, lazy_events=lazy_events)
+        except LOAD_ERRORS as ex:
+            results.append((path, False, ex))
+            continue
+        results.append((path, True, stat if fn is None else fn(stat)))
+    return results
+
+
+def _chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def map_stat_files(paths: Iterable, fn: Optional[Callable[[StatObj], Any]] = None, *,
+                   workers: Optional[int] = None, chunksize: int = 8,
+                   max_in_flight: Optional[int] = None, ordered: bool = False,
+                   lazy_events: bool = False,
+                   on_error: Optional[Callable[[str, Exception], None]] = None) -> Iterator[tuple[str, Any]]:
+    """Loads stat files in a process pool and yields ``(path, fn(stat))``.
+
+    ``workers`` defaults to the CPU count and ``max_in_flight`` to twice the
+    worker count. A file that fails to load (bad JSON, unreadable) raises
+    unless ``on_error`` is given, in which case ``on_error(path, exception)``
+    is called in this process and the file is skipped. Exceptions raised by
+    ``fn`` always propagate.
+    """
+    if chunksize < 1:
+        raise ValueError(f'Invalid chunksize {chunksize}. Must be at least 1.')
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    def emit(results):
+        for path, loaded, value in results:
+            if loaded:
+                yield path, value
+            elif on_error is None:
+                raise value
+            else:
+                logger.debug("Skipping %s: %s", path, value)
+                on_error(path, value)
+
+    if workers <= 1:
+        for chunk in _chunked(paths, chunksize):
+            yield from emit(_process_chunk(chunk, fn, lazy_events))
+        return
+
+    max_in_flight = max(1, max_in_flight or 2 * workers)
+    chunks = enumerate(_chunked(paths, chunksize))
+    pending = {}        # future -> chunk number
+    ready = {}          # chunk number -> results, waiting for their turn (ordered)
+    next_chunk = 0
+    exhausted = False
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        while True:
+            while not exhausted and len(pending) + len(ready) < max_in_flight:
+                try:
+                    number, chunk = next(chunks)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[pool.submit(_process_chunk, chunk, fn, lazy_events)] = number
+
+            # in ordered mode a buffered chunk always has an earlier chunk
+            # still pending, so nothing is left behind when pending empties
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                number = pending.pop(future)
+                if ordered:
+                    ready[number] = future.result()
+                else:
+                    yield from emit(future.result())
+
+            while next_chunk in ready:
+                yield from emit(ready.pop(next_chunk))
+                next_chunk += 1
+    finally:
+        # also reached when the caller stops iterating early
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def load_directory(directory, fn: Optional[Callable[[StatObj], Any]] = None,
+                   dedup=None, **kwargs) -> Iterator[tuple[str, Any]]:
+    """``map_stat_files`` over every decoded stat file in ``directory``."""
+    return map_stat_files(decoded_paths(directory, dedup), fn, **kwargs)
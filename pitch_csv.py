@@ -1,173 +1,149 @@
 # Nuche17 Feb 2026
 # From a directory of stat files, creates a pitch-level data set and exports to CSV.
 
-from . import stat_file_parser
+from . import parallel_loader, stat_file_parser
 from .constants import CHARACTER_ATTRIBUTES_CSV
+from .ingest_manifest import IngestManifest
 from .constants import game_constants as G
-import json
+from concurrent.futures import ProcessPoolExecutor
 import csv
+import functools
 import os
+import shutil
+import tempfile
 
 dataRows = []
 prevEv = {}
 
 #  Helper generator to load StatObjs from a directory.
-def load_statobjs_from_directory(directory):
-    for filename in os.listdir(directory):
-        if "decoded" not in filename:
-            continue
+#  lazy_events defers decoding each file's Events until they are used
+#  (see StatObj.from_path); useful for header-only work like box scores.
+#  workers parses the files in a process pool (see parallel_loader), in
+#  directory order; prefer parallel_loader.load_directory with a per-game
+#  function when only a summary of each game is needed.
+def load_statobjs_from_directory(directory, lazy_events=False, workers=None, dedup=None):
+    # compressed files and zip/tar bundles are read in place, see stat_sources.py
+    # dedup skips copies of the same game before they are parsed, see game_dedup.py
+    if workers is not None:
+        for _, stat in parallel_loader.load_directory(directory, workers=workers, ordered=True,
+                                                      lazy_events=lazy_events, dedup=dedup):
+            yield stat
+        return
 
-        path = os.path.join(directory, filename)
-        if not os.path.isfile(path):
-            continue
+    for path in parallel_loader.decoded_paths(directory, dedup):
+        yield stat_file_parser.StatObj.from_path(path, lazy_events=lazy_events)
 
-        with open(path, "r") as f:
-            jsonObj = json.load(f)
-            yield stat_file_parser.StatObj(jsonObj)
+def _strip_variant(name):
+    # Strip variants (e.g. "Mario (Fireball)" -> "Mario")
+    idx = name.find("(")
+    return name if idx == -1 else name[:idx]
+
+def _game_context(sf, include_character_attributes):
+    """
+    Per-game values of the pitch rows, resolved once per StatObj:
+    per team, a tuple of 9 per-slot tuples
+    (player, character, characterNoVariant, starred, battingHand, attrs).
+    attrs is the slot's character-attribute values (star-ON when starred),
+    blanks when the character has no row, or () without attributes.
+    """
+    teams = []
+    for teamNum in (0, 1):
+        player = sf.player(teamNum)
+        names = sf.characterName(teamNum)
+        slots = []
+        for rosterNum in range(9):
+            name = names[rosterNum]
+            starred = sf.isStarred(teamNum, rosterNum)
+            attrs = ()
+            if include_character_attributes:
+                row = _CHAR_ATTRS.get(name)
+                if row and starred != 0:
+                    row = G.apply_superstar_row(row)
+                attrs = (tuple(row[col] for col in _CHAR_ATTR_COLUMNS) if row
+                         else ("",) * len(_CHAR_ATTR_COLUMNS))
+            slots.append((player, name, _strip_variant(name), starred,
+                          sf.battingHand(teamNum, rosterNum), attrs))
+        teams.append(tuple(slots))
+    return teams, [sf.gameID(), sf.gameMode(), sf.stadium()]
 
 def pitch_rows_from_statobj(sf, include_character_attributes=False):
     """
     Yield pitch-level rows for a StatObj.
     Optionally appends pitcher and batter character attributes.
+
+    Everything that depends only on the game or the roster slot (players,
+    characters, stars, hands, attributes, GameID, stadium) is resolved once
+    per game by _game_context; the loop only reads the event's own fields.
     """
     if include_character_attributes:
         _load_character_attributes()
 
-    prevEv = {}
+    teams, gameColumns = _game_context(sf, include_character_attributes)
 
     for ev in sf.events():
-        if "Pitch" not in ev:
+        pitch = ev.get("Pitch")
+        if pitch is None:
             continue
 
-        batterIndex = ev["Half Inning"]
-        pitcherIndex = 1 - batterIndex
-
-        eventNumber = ev["Event Num"]
-
-        pitchingPlayer = sf.player(pitcherIndex)
-        battingPlayer = sf.player(batterIndex)
-
-        pitchingCharacter = sf.characterName(
-            pitcherIndex, ev["Pitcher Roster Loc"]
-        )
-        battingCharacter = sf.characterName(
-            batterIndex, ev["Batter Roster Loc"]
-        )
-
-        # Strip variants (e.g. "Mario (Fireball)" -> "Mario")
-        def strip_variant(name):
-            idx = name.find("(")
-            return name if idx == -1 else name[:idx]
-
-        pitchingCharacterNoVariant = strip_variant(pitchingCharacter)
-        battingCharacterNoVariant = strip_variant(battingCharacter)
-
-        pitcherStarred = sf.isStarred(pitcherIndex, ev["Pitcher Roster Loc"])
-        batterStarred = sf.isStarred(batterIndex, ev["Batter Roster Loc"])
-
-        inning = ev["Inning"]
         halfInning = ev["Half Inning"]
+        batterIndex = halfInning
+        pitcherIndex = 1 - batterIndex
+        pitcherLoc = ev["Pitcher Roster Loc"]
+        batterLoc = ev["Batter Roster Loc"]
+        pitcher = teams[pitcherIndex][pitcherLoc]
+        batter = teams[batterIndex][batterLoc]
 
         if halfInning == 0:
-            pitchingScore = ev["Home Score"]
-            battingScore = ev["Away Score"]
-            pitchingStars = ev["Home Stars"]
-            battingStars = ev["Away Stars"]
+            pitchingScore, battingScore = ev["Home Score"], ev["Away Score"]
+            pitchingStars, battingStars = ev["Home Stars"], ev["Away Stars"]
         else:
-            pitchingScore = ev["Away Score"]
-            battingScore = ev["Home Score"]
-            pitchingStars = ev["Away Stars"]
-            battingStars = ev["Home Stars"]
-
-        balls = ev["Balls"]
-        strikes = ev["Strikes"]
-        outs = ev["Outs"]
-
-        starChance = ev["Star Chance"]
-        stamina = ev["Pitcher Stamina"]
-        chemistry = ev["Chemistry Links on Base"]
-
-        battingOrder = ev["Batter Roster Loc"]
-        batterHand = sf.battingHand(batterIndex, ev["Batter Roster Loc"])
-
-        # Count runners on base
-        runners = sum(
-            base in ev for base in ("Runner 1B", "Runner 2B", "Runner 3B")
-        )
-
-
-        pitchType = ev["Pitch"]["Pitch Type"]
-        pitchXPos = ev["Pitch"]["Ball Position - Strikezone"]
-        pitchInZone = ev["Pitch"]["In Strikezone"]
-        swingType = ev["Pitch"]["Type of Swing"]
-        batterPosX = ev["Pitch"]["Bat Contact Pos - X"]
-        batterPosZ = ev["Pitch"]["Bat Contact Pos - Z"]
-        rBIs = ev["RBI"]
-        result = ev["Result of AB"]
-
-        gameID = sf.gameID()
-        gameMode = sf.gameMode()
-        stadium = sf.stadium()
+            pitchingScore, battingScore = ev["Away Score"], ev["Home Score"]
+            pitchingStars, battingStars = ev["Away Stars"], ev["Home Stars"]
 
         # Base pitch row (unchanged schema)
         row = [
-            eventNumber,
-            pitchingPlayer,
-            battingPlayer,
-            pitchingCharacter,
-            battingCharacter,
-            pitchingCharacterNoVariant,
-            battingCharacterNoVariant,
-            pitcherStarred,
-            batterStarred,
-            inning,
+            ev["Event Num"],
+            pitcher[0], batter[0],          # players
+            pitcher[1], batter[1],          # characters
+            pitcher[2], batter[2],          # characters, no variant
+            pitcher[3], batter[3],          # starred
+            ev["Inning"],
             halfInning,
             pitchingScore,
             battingScore,
             pitchingStars,
             battingStars,
-            balls,
-            strikes,
-            outs,
-            starChance,
-            stamina,
-            chemistry,
-            battingOrder,
-            batterHand,
-            runners,
-            pitchType,
-            pitchXPos,
-            pitchInZone,
-            swingType,
-            batterPosX,
-            batterPosZ,
-            rBIs,
-            result,
-            gameID,
-            gameMode,
-            stadium
+            ev["Balls"],
+            ev["Strikes"],
+            ev["Outs"],
+            ev["Star Chance"],
+            ev["Pitcher Stamina"],
+            ev["Chemistry Links on Base"],
+            batterLoc,
+            batter[4],                      # batter hand
+            ("Runner 1B" in ev) + ("Runner 2B" in ev) + ("Runner 3B" in ev),
+            pitch["Pitch Type"],
+            pitch["Ball Position - Strikezone"],
+            pitch["In Strikezone"],
+            pitch["Type of Swing"],
+            pitch["Bat Contact Pos - X"],
+            pitch["Bat Contact Pos - Z"],
+            ev["RBI"],
+            ev["Result of AB"],
         ]
+        row += gameColumns
 
         # Optional: append character attributes
         if include_character_attributes:
-            pitcher_attrs = _CHAR_ATTRS.get(pitchingCharacter)
-            if pitcher_attrs and pitcherStarred != 0:
-                pitcher_attrs = G.apply_superstar_row(pitcher_attrs)
-
-            batter_attrs = _CHAR_ATTRS.get(battingCharacter)
-            if batter_attrs and batterStarred != 0:
-                batter_attrs = G.apply_superstar_row(batter_attrs)
-
-            for attrs in (pitcher_attrs, batter_attrs):
-                if attrs:
-                    row.extend(attrs[col] for col in _CHAR_ATTR_COLUMNS)
-                else:
-                    row.extend([""] * len(_CHAR_ATTR_COLUMNS))
+            row += pitcher[5]
+            row += batter[5]
 
         yield row
-        prevEv = ev
 
 
+# CSV output is written through a large buffer rather than line by line.
+_WRITE_BUFFER = 1 << 20
+
 BASE_HEADER = [
     'eventNumber',
     'pitchingPlayer',
@@ -240,17 +216,196 @@ def make_header(include_char_attrs=False):
 
     return header
 
-def write_pitch_csv(statobjs, output_path, include_character_attributes=False,):
+#  statobjs is an iterable of StatObjs, or a directory of decoded stat files.
+#  With a directory, manifest names an ingest manifest file (see
+#  ingest_manifest) that keeps each file's rows, so a rerun only parses the
+#  files that are new or changed since the last run.
+#  workers (directory only) exports in a process pool: each worker writes the
+#  rows of a chunk of files to its own shard, and the shards are merged, in
+#  file order, into output_path. partitioned=True instead keeps the shards
+#  as output_path/part-NNNNN.csv, each with its own header. As in
+#  parallel_loader, workers=0 or 1 writes the shards in-process and
+#  workers=None (with partitioned) uses the CPU count.
+def write_pitch_csv(statobjs, output_path, include_character_attributes=False, manifest=None,
+                    workers=None, partitioned=False, files_per_shard=64, dedup=None):
     if include_character_attributes:
         _load_character_attributes()
 
     header = make_header(include_character_attributes)
+    is_directory = isinstance(statobjs, (str, os.PathLike))
+    if dedup is not None and not is_directory:
+        raise ValueError("write_pitch_csv: dedup needs a directory of stat files, not StatObjs")
+
+    if manifest is not None:
+        if not is_directory:
+            raise ValueError("write_pitch_csv: a manifest needs a directory of stat files, not StatObjs")
+        if partitioned:
+            raise ValueError("write_pitch_csv: a manifest writes one file; it can't be combined with partitioned")
+        rows = _pitch_rows_from_directory(statobjs, manifest, include_character_attributes, workers, dedup)
+    elif workers is not None or partitioned:
+        if not is_directory:
+            raise ValueError("write_pitch_csv: parallel export needs a directory of stat files, not StatObjs")
+        _write_pitch_csv_sharded(parallel_loader.decoded_paths(statobjs, dedup), output_path,
+                                 include_character_attributes, workers, partitioned, files_per_shard)
+        return
+    else:
+        if is_directory:
+            statobjs = load_statobjs_from_directory(statobjs, dedup=dedup)
+        rows = (row for sf in statobjs
+                for row in pitch_rows_from_statobj(sf, include_character_attributes=include_character_attributes))
 
-    with open(output_path, "w", newline="") as f:
+    with open(output_path, "w", newline="", buffering=_WRITE_BUFFER) as f:
         writer = csv.writer(f)
         writer.writerow(header)
+        writer.writerows(rows)
+
+def _pitch_row_list(sf, include_character_attributes):
+    return list(pitch_rows_from_statobj(sf, include_character_attributes=include_character_attributes))
+
+def _pitch_rows_from_directory(directory, manifest_path, include_character_attributes, workers=None,
+                               dedup=None):
+    params = {"job": "pitch_csv", "header": make_header(include_character_attributes)}
+    with IngestManifest(manifest_path, params=params) as manifest:
+        paths = parallel_loader.decoded_paths(directory, dedup)
+        stored = {path: manifest.lookup(path) for path in paths}
+        changed = [path for path in paths if stored[path] is None]
+        # only the new and changed files are parsed, in the pool if asked
+        results = parallel_loader.map_stat_files(
+            changed, functools.partial(_pitch_row_list, include_character_attributes=include_character_attributes),
+            workers=0 if workers is None else workers, ordered=True)
+        for path, rows in results:
+            manifest.record(path, rows)
+            stored[path] = rows
+        for path in paths:
+            yield from stored[path]
+
+def _write_shard(paths, shard_path, include_character_attributes, header):
+    # runs in a worker: the rows of paths, to shard_path
+    with open(shard_path, "w", newline="", buffering=_WRITE_BUFFER) as f:
+        writer = csv.writer(f)
+        if header is not None:
+            writer.writerow(header)
+        for path in paths:
+            sf = stat_file_parser.StatObj.from_path(path)
+            writer.writerows(pitch_rows_from_statobj(sf, include_character_attributes=include_character_attributes))
+    return shard_path
+
+def _write_pitch_csv_sharded(paths, output_path, include_character_attributes, workers,
+                             partitioned, files_per_shard):
+    header = make_header(include_character_attributes)
+    if partitioned:
+        os.makedirs(output_path, exist_ok=True)
+        shard_dir = output_path
+    else:
+        shard_dir = tempfile.mkdtemp(prefix=".pitch-shards-", dir=os.path.dirname(os.path.abspath(output_path)))
+
+    chunks = [paths[i:i + files_per_shard] for i in range(0, len(paths), files_per_shard)]
+    shard_paths = [os.path.join(shard_dir, f"part-{n:05d}.csv") for n in range(len(chunks))]
+    shard_args = (chunks, shard_paths, [include_character_attributes] * len(chunks),
+                  [header if partitioned else None] * len(chunks))
+    if workers is None:
+        workers = os.cpu_count() or 1
+    try:
+        if workers <= 1:
+            for args in zip(*shard_args):
+                _write_shard(*args)
+        else:
+            # character attributes are read once per worker, not once per shard
+            initializer = _load_character_attributes if include_character_attributes else None
+            with ProcessPoolExecutor(max_workers=workers, initializer=initializer) as pool:
+                list(pool.map(_write_shard, *shard_args))
+        if partitioned:
+            return
+
+        # merge: header, then every shard in file order
+        with open(output_path, "w", newline="", buffering=_WRITE_BUFFER) as out:
+            csv.writer(out).writerow(header)
+            for shard_path in shard_paths:
+                with open(shard_path, "r", newline="") as shard:
+                    shutil.copyfileobj(shard, out, _WRITE_BUFFER)
+    finally:
+        if not partitioned:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+
+# Parquet types of the BASE_HEADER columns; the rest (players, characters,
+# stadium and the categorical fields, which are labels or codes depending on
+# the stat file) are stored as text.
+_PARQUET_INT_COLUMNS = {
+    'eventNumber', 'inning', 'halfInning', 'pitchingScore', 'battingScore', 'pitchingStars',
+    'battingStars', 'balls', 'strikes', 'outs', 'starChance', 'stamina', 'chemistry',
+    'battingOrder', 'batterHand', 'runners', 'pitchInZone', 'rBIs', 'gameID', 'gameMode',
+}
+_PARQUET_FLOAT_COLUMNS = {'pitchXPos', 'batterPosX', 'batterPosZ'}
+_PARQUET_BOOL_COLUMNS = {'pitcherStarred', 'batterStarred'}
+
+
+def _char_attr_kind(col):
+    # "int" or "float" when every character's value parses as one, else "str"
+    for kind, parse in (("int", int), ("float", float)):
+        try:
+            for row in _CHAR_ATTRS.values():
+                parse(row[col])
+        except ValueError:
+            continue
+        return kind
+    return "str"
+
+
+def _parquet_schema(include_char_attrs=False):
+    # one schema for every row group: starred characters' attribute values
+    # (ints from apply_superstar_row) and blanks are cast to it
+    import pyarrow as pa
+
+    types = {"int": pa.int64(), "float": pa.float64(), "bool": pa.bool_(), "str": pa.string()}
+    kinds = []
+    for col in BASE_HEADER:
+        kinds.append("int" if col in _PARQUET_INT_COLUMNS else "float" if col in _PARQUET_FLOAT_COLUMNS
+                     else "bool" if col in _PARQUET_BOOL_COLUMNS else "str")
+    if include_char_attrs:
+        attr_kinds = [_char_attr_kind(col) for col in _CHAR_ATTR_COLUMNS]
+        kinds += attr_kinds + attr_kinds
+    header = make_header(include_char_attrs)
+    return pa.schema([(name, types[kind]) for name, kind in zip(header, kinds)]), kinds
+
+
+_PARQUET_CASTS = {"int": int, "float": float, "bool": bool, "str": str}
+
+
+def _parquet_column(values, kind):
+    cast = _PARQUET_CASTS[kind]
+    return [None if value is None or (value == "" and kind != "str") else cast(value) for value in values]
+
+
+#  Same rows as write_pitch_csv, written to a Parquet file (requires pyarrow).
+#  Rows are written in row groups of rows_per_group, so memory stays bounded.
+#  Every row group has the same explicit schema (see _parquet_schema).
+def write_pitch_parquet(statobjs, output_path, include_character_attributes=False,
+                        rows_per_group=100_000):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if include_character_attributes:
+        _load_character_attributes()
+    schema, kinds = _parquet_schema(include_character_attributes)
+    if isinstance(statobjs, (str, os.PathLike)):
+        statobjs = load_statobjs_from_directory(statobjs)
+
+    writer = pq.ParquetWriter(output_path, schema)
+    batch = []
+
+    def flush():
+        arrays = [pa.array(_parquet_column(values, kind), type=field.type)
+                  for values, kind, field in zip(zip(*batch), kinds, schema)]
+        writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+        batch.clear()
 
+    try:
         for sf in statobjs:
-            for row in pitch_rows_from_statobj(sf, include_character_attributes=include_character_attributes):
-                writer.writerow(row)
+            batch.extend(pitch_rows_from_statobj(sf, include_character_attributes=include_character_attributes))
+            if len(batch) >= rows_per_group:
+                flush()
+        if batch:
+            flush()
+    finally:
+        writer.close()
 
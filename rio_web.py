@@ -129,16 +129,29 @@ class RioWeb:
             return response
         return self._process_stats(response, serialized)
 
-    def get_events(self, params: Union[EventsParameterList, dict] = None, raw: bool = False, **kwargs) -> Union[pd.DataFrame, dict]:
-        """Fetch event-level data."""
+    def get_events(self, params: Union[EventsParameterList, dict] = None, raw: bool = False,
+                   split: str = None, chunk_size: int = None, target_seconds: float = 10.0,
+                   **kwargs) -> Union[pd.DataFrame, dict]:
+        """Fetch event-level data.
+
+        split="games" or split="time" fetches a large pull in concurrent pieces,
+        by the games list or by the start_time/end_time window, sized to take
+        about target_seconds each (see async_rio_web.py; requires aiohttp).
+        """
+        if split is not None:
+            return self._get_split("get_events", params, raw, split, chunk_size, target_seconds, kwargs)
         serialized = self._serialize_params(params, kwargs)
         response = self._get(Endpoint.EVENTS, serialized)
         if raw:
             return response
         return pd.DataFrame(response.get("Events", response.get("events", [])))
 
-    def get_landing_data(self, params: Union[LandingDataParameterList, dict] = None, raw: bool = False, **kwargs) -> Union[pd.DataFrame, dict]:
-        """Fetch landing data (ball contact/landing positions)."""
+    def get_landing_data(self, params: Union[LandingDataParameterList, dict] = None, raw: bool = False,
+                         split: str = None, chunk_size: int = None, target_seconds: float = 10.0,
+                         **kwargs) -> Union[pd.DataFrame, dict]:
+        """Fetch landing data (ball contact/landing positions). split as in get_events."""
+        if split is not None:
+            return self._get_split("get_landing_data", params, raw, split, chunk_size, target_seconds, kwargs)
         serialized = self._serialize_params(params, kwargs)
         response = self._get(Endpoint.LANDING_DATA, serialized)
         if raw:
@@ -153,6 +166,28 @@ class RioWeb:
             return response
         return pd.DataFrame(response.get("Star Chances", response.get("star_chances", [])))
 
+    def _get_split(self, method: str, params, raw: bool, split: str, chunk_size, target_seconds,
+                   kwargs: dict):
+        """Runs a split pull on an AsyncRioWeb; from async code, await AsyncRioWeb directly.
+
+        Under a running event loop (Jupyter) the pull runs on a worker thread
+        with its own loop, and this call blocks until it is done.
+        """
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        from .async_rio_web import AsyncRioWeb
+
+        async def fetch():
+            async with AsyncRioWeb(rio_key=self.rio_key, base_url=self.base_url) as client:
+                return await getattr(client, method)(params, raw=raw, split=split, chunk_size=chunk_size,
+                                                     target_seconds=target_seconds, **kwargs)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(fetch())
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(lambda: asyncio.run(fetch())).result()
+
     def get_live_games(self) -> dict:
         """Fetch currently ongoing games."""
         return self._get("/populate_db/ongoing_game/")
@@ -14,6 +14,15 @@ setup(
         # The draw module is plotting-only and not imported by pyrio's
         # public API. Install with `pip install pyrio[draw]` to use it.
         "draw": ["matplotlib>=3.10.3"],
+        # Faster stat-file decoding (see json_backend.py); either one works,
+        # msgspec also enables the typed structs in stat_structs.py.
+        "fast-json": ["msgspec>=0.18.0", "orjson>=3.9.0"],
+        # Parquet corpus store (see corpus_store.py).
+        "parquet": ["pyarrow>=14.0.0"],
+        # .zst stat files and .tar.zst bundles (see stat_sources.py).
+        "zstd": ["zstandard>=0.22.0"],
+        # AsyncRioWeb (see async_rio_web.py).
+        "async": ["aiohttp>=3.9.0"],
     },
     description="Library for interacting with Mario Superstar Baseball and Project Rio",
     author="MattGree",
@@ -1,7 +1,14 @@
 from __future__ import annotations
+from . import json_backend, stat_sources
+from .compiled_game import CompiledGame, MISSING_INT
 from .lookup import LookupDicts
 from datetime import datetime
-from typing import Optional, Union
+import functools
+import json
+import re
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
 
 '''
 Intended to parse "decoded" files which would be present on a user's computer
@@ -76,6 +83,7 @@ class RosterObj:
 
     def __init__(self, slots: dict[int, dict]):
         self._slots = slots
+        self._totals: dict[str, dict] = {}
 
     def char_id(self, rosterNum: int) -> str:
         ErrorChecker.check_roster_num_no_neg(rosterNum)
@@ -95,6 +103,25 @@ class RosterObj:
         ErrorChecker.check_roster_num_no_neg(rosterNum)
         return self._slots[rosterNum]['Defensive Stats']
 
+    def offensive_totals(self) -> dict:
+        """Team totals of every numeric offensive stat (summed once, then cached)."""
+        return self._section_totals('Offensive Stats')
+
+    def defensive_totals(self) -> dict:
+        """Team totals of every numeric defensive stat (summed once, then cached)."""
+        return self._section_totals('Defensive Stats')
+
+    def _section_totals(self, section: str) -> dict:
+        totals = self._totals.get(section)
+        if totals is None:
+            totals = {}
+            for i in range(9):
+                for key, value in self._slots[i][section].items():
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        totals[key] = totals.get(key, 0) + value
+            self._totals[section] = totals
+        return totals
+
     def is_starred(self, rosterNum: int) -> bool:
         ErrorChecker.check_roster_num_no_neg(rosterNum)
         return self._slots[rosterNum].get('Superstar', 0) == 1
@@ -117,39 +144,171 @@ class RosterObj:
         return self._slots[rosterNum].get('Fielding Position')
 
 
+# For Project Rio versions pre 1.9.2 team 0 is the home team (see teamNumVersionCorrection)
+VERSION_LIST_HOME_AWAY_FLIPPED = frozenset(["Pre 0.1.7", "0.1.7a", "0.1.8", "0.1.9", "1.9.1"])
+# Versions whose Character Game Stats keys are "Team N Roster M" rather than "Away/Home Roster M"
+VERSION_LIST_OLD_TEAM_STRUCTURE = frozenset(["Pre 0.1.7", "0.1.7a", "0.1.8", "0.1.9", "1.9.1", "1.9.2", "1.9.3", "1.9.4"])
+# Stadium names written by older versions -> current names
+OLD_STADIUM_NAMES = {
+    "Bowser's Castle": "Bowser Castle",
+    "Wario's Palace": "Wario Palace",
+    "Yoshi's Island": "Yoshi Park",
+    "Peach's Garden": "Peach Garden",
+    "DK's Jungle":  "DK Jungle"
+}
+STAT_FILE_DATE_FORMAT = "%a %b %d %H:%M:%S %Y"
+
+
+# box_score() column -> Character Game Stats key, per stat section.
+# Column names follow stat_formatters' keyword vocabulary.
+BOX_SCORE_BATTING = {
+    'at_bats': 'At Bats',
+    'hits': 'Hits',
+    'singles': 'Singles',
+    'doubles': 'Doubles',
+    'triples': 'Triples',
+    'homeruns': 'Homeruns',
+    'walks_bb': 'Walks (4 Balls)',
+    'walks_hbp': 'Walks (Hit)',
+    'strikeouts': 'Strikeouts',
+    'rbi': 'RBI',
+    'stolen_bases': 'Bases Stolen',
+    'bunts': 'Successful Bunts',
+    'sac_flys': 'Sac Flys',
+    'star_hits': 'Star Hits',
+}
+BOX_SCORE_PITCHING = {
+    'was_pitcher': 'Was Pitcher',
+    'batters_faced': 'Batters Faced',
+    'outs_pitched': 'Outs Pitched',
+    'runs_allowed': 'Runs Allowed',
+    'hits_allowed': 'Hits Allowed',
+    'hrs_allowed': 'HRs Allowed',
+    'batters_walked': 'Batters Walked',
+    'batters_hit': 'Batters Hit',
+    'strikeouts_pitched': 'Strikeouts',
+    'total_pitches': 'Pitches Thrown',
+    'star_pitches': 'Star Pitches Thrown',
+    'stamina': 'Stamina',
+    'big_plays': 'Big Plays',
+}
+
+def _parse_game_id(gameID) -> Optional[int]:
+    # "1A,2B3C" -> int; None when missing or malformed
+    try:
+        return int(gameID.replace(',', ''), 16)
+    except (AttributeError, ValueError):
+        return None
+
+
+def _parse_date(date) -> Optional[datetime]:
+    try:
+        return datetime.strptime(date, STAT_FILE_DATE_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+_EVENTS_KEY = re.compile(r'"Events"\s*:\s*(?=\[)')
+_EVENTS_LAST = re.compile(r'\]\s*\}\s*$')
+_NOT_QUOTE_OR_BRACKET = bytes(b for b in range(256) if b not in b'"[]')
+
+
+def _is_one_array(span: str) -> bool:
+    # True when span, from a "[" to the last "]" of the file, is a single
+    # array: outside strings the bracket depth stays above zero until its
+    # final "]". Only quotes and brackets are kept, so this costs a fraction
+    # of parsing the span; escaped quotes are left to the full parse.
+    if '\\"' in span:
+        return False
+    tokens = np.frombuffer(span.encode('utf-8').translate(None, _NOT_QUOTE_OR_BRACKET), dtype=np.uint8)
+    outside = (np.cumsum(tokens == ord('"')) & 1) == 0
+    steps = (tokens == ord('[')).astype(np.int64) - (tokens == ord(']'))
+    depth = np.cumsum(steps * outside)
+    return len(depth) > 0 and depth[-1] == 0 and bool((depth[:-1] > 0).all())
+
+
+def _split_events(text: str) -> tuple[dict, Optional[tuple[int, int]]]:
+    # Splits a decoded stat file into its parsed header and the span of the
+    # still-encoded Events array. Rio writes Events as the last key, which is
+    # the only layout that is split; anything else is parsed in full.
+    match = _EVENTS_KEY.search(text)
+    if match is not None:
+        last = _EVENTS_LAST.search(text, match.end())
+        if last is not None and _is_one_array(text[match.end():last.start() + 1]):
+            head = text[:match.start()].rstrip()
+            if head.endswith(','):
+                head = head[:-1]
+            try:
+                return json_backend.loads(head + '}'), (match.end(), last.start() + 1)
+            except json.JSONDecodeError:
+                pass
+    return json_backend.loads(text), None
+
+
 # create stat obj
 class StatObj:
     def __init__(self, statJson: dict):
         self.statJson = statJson
+        self._compiled: Optional[CompiledGame] = None
+        # (file text, span of the Events array) until events are decoded
+        self._events_source: Optional[tuple[str, tuple[int, int]]] = None
+
+        # Rosters are keyed by the version-corrected team number.
+        self._rosters: dict[int, RosterObj] = {}
+        self._normalize()
+
+    def _normalize(self) -> None:
+        # Resolves every version quirk once, into a canonical away/home layout,
+        # so the accessors below are plain field reads. Header fields that are
+        # missing or malformed are left as None and the accessor raises the
+        # same error it always has when asked for them.
+        statJson = self.statJson
+        self._version = statJson.get('Version', 'Pre 0.1.7')
+        self._home_away_flipped = self._version in VERSION_LIST_HOME_AWAY_FLIPPED
+        self._old_team_structure = self._version in VERSION_LIST_OLD_TEAM_STRUCTURE
+
+        # teamNum -> 0 (away) / 1 (home)
+        self._team_order = (1, 0) if self._home_away_flipped else (0, 1)
+        # [teamNum][rosterNum] -> Character Game Stats key
+        if self._old_team_structure:
+            self._team_strings = tuple(tuple(f"Team {t} Roster {r}" for r in range(9)) for t in (0, 1))
+        else:
+            self._team_strings = tuple(tuple(f"{side} Roster {r}" for r in range(9)) for side in ("Away", "Home"))
+
+        stadium = statJson.get("StadiumID")
+        self._stadium = OLD_STADIUM_NAMES.get(stadium, stadium)
+        self._game_id = _parse_game_id(statJson.get("GameID"))
+        self._start_date = _parse_date(statJson.get("Date - Start"))
+        self._end_date = _parse_date(statJson.get("Date - End"))
 
     def gameID(self) -> int:
         # returns it in int form
-        return int(self.statJson["GameID"].replace(',', ''), 16)
+        if self._game_id is None:
+            return int(self.statJson["GameID"].replace(',', ''), 16)
+        return self._game_id
     
     def gameMode(self):
         return self.statJson["TagSetID"]
 
     # should look to convert to unix or some other standard date fmt
     def startDate(self) -> datetime:
-        return datetime.strptime(self.statJson["Date - Start"], "%a %b %d %H:%M:%S %Y")
+        if self._start_date is None:
+            return datetime.strptime(self.statJson["Date - Start"], STAT_FILE_DATE_FORMAT)
+        return self._start_date
 
     def endDate(self) -> datetime:
-        return datetime.strptime(self.statJson["Date - End"], "%a %b %d %H:%M:%S %Y")
+        if self._end_date is None:
+            return datetime.strptime(self.statJson["Date - End"], STAT_FILE_DATE_FORMAT)
+        return self._end_date
 
     def version(self) -> str:
-        return self.statJson.get('Version', 'Pre 0.1.7')
+        return self._version
 
     def stadium(self) -> str:
-        # returns the stadium that was played on
-        old_stadium_names = {
-            "Bowser's Castle": "Bowser Castle",
-            "Wario's Palace": "Wario Palace",
-            "Yoshi's Island": "Yoshi Park",
-            "Peach's Garden": "Peach Garden",
-            "DK's Jungle":  "DK Jungle"
-        }
-        
-        return old_stadium_names.get(self.statJson["StadiumID"], self.statJson["StadiumID"])
+        # returns the stadium that was played on, old names mapped to current ones
+        if self._stadium is None:
+            return self.statJson["StadiumID"]
+        return self._stadium
     
     def teamNumVersionCorrection(self, teamNum: int) -> int:
         # For Project Rio versions pre 1.9.2
@@ -158,31 +317,17 @@ class StatObj:
         # teamNum: 0 == away team, 1 == home team
 
         ErrorChecker.check_team_num(teamNum)
-
-
-        VERSION_LIST_HOME_AWAY_FLIPPED = ["Pre 0.1.7", "0.1.7a", "0.1.8", "0.1.9", "1.9.1"]
-
-        if self.version() in VERSION_LIST_HOME_AWAY_FLIPPED:
-            return abs(teamNum-1)
-        
-        return teamNum
+        return self._team_order[teamNum]
 
 
     def player(self, teamNum: int) -> str:
         teamNum = self.teamNumVersionCorrection(teamNum)
-        if teamNum == 0:
-            return self.statJson["Away Player"]
-        else:
-            return self.statJson["Home Player"]
+        return self.statJson[("Away Player", "Home Player")[teamNum]]
 
 
     def score(self, teamNum: int) -> int:
         teamNum = self.teamNumVersionCorrection(teamNum)
-
-        if teamNum == 0:
-            return self.statJson["Away Score"]
-        else:
-            return self.statJson["Home Score"]
+        return self.statJson[("Away Score", "Home Score")[teamNum]]
         
     def winning_team(self) -> int:
         # returns the team number of the winning team
@@ -237,19 +382,17 @@ class StatObj:
     def getTeamString(self, teamNum: int, rosterNum: int) -> str:
         ErrorChecker.check_team_num(teamNum)
         ErrorChecker.check_roster_num(rosterNum)
-
-        VERSION_LIST_OLD_TEAM_STRUCTURE = ["Pre 0.1.7", "0.1.7a", "0.1.8", "0.1.9", "1.9.1", "1.9.2", "1.9.3", "1.9.4"]
-        if self.version() in VERSION_LIST_OLD_TEAM_STRUCTURE:
-            return f"Team {teamNum} Roster {rosterNum}"
-
-        # Newer Version Format
-        teamStr = "Away" if teamNum == 0 else "Home"
-        return f"{teamStr} Roster {rosterNum}"
+        return self._team_strings[teamNum][rosterNum]
     
     def roster_obj(self, teamNum: int) -> RosterObj:
+        # built once per team and cached; team totals are cached on the RosterObj
         teamNum = self.teamNumVersionCorrection(teamNum)
-        slots = {i: self.statJson["Character Game Stats"][self.getTeamString(teamNum, i)] for i in range(9)}
-        return RosterObj(slots)
+        ro = self._rosters.get(teamNum)
+        if ro is None:
+            charStats = self.statJson["Character Game Stats"]
+            ro = RosterObj({i: charStats[key] for i, key in enumerate(self._team_strings[teamNum])})
+            self._rosters[teamNum] = ro
+        return ro
 
     def getRosterDict(self, teamNum: int) -> dict[int, str]:
         # returns a dict of rosterNum: characterName for the given team
@@ -320,124 +463,81 @@ class StatObj:
         # tells the era of a character
         # if no character given, returns era of that team
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         return 9 * float(self.runsAllowed(teamNum, rosterNum)) / self.inningsPitched(teamNum, rosterNum)
 
     def battersFaced(self, teamNum: int, rosterNum: int = -1) -> int:
         # tells how many batters were faced by character
         # if no character given, returns batters faced by that team
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.defensiveStats(teamNum, x)["Batters Faced"]
-            return total
-        else:
-            return self.defensiveStats(teamNum, rosterNum)["Batters Faced"]
+            return self.roster_obj(teamNum).defensive_totals()["Batters Faced"]
+        return self.defensiveStats(teamNum, rosterNum)["Batters Faced"]
 
     def runsAllowed(self, teamNum: int, rosterNum: int = -1) -> int:
         # tells how many runs a character allowed when pitching
         # if no character given, returns runs allowed by that team
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.defensiveStats(teamNum, x)["Runs Allowed"]
-            return total
-        else:
-            return self.defensiveStats(teamNum, rosterNum)["Runs Allowed"]
+            return self.roster_obj(teamNum).defensive_totals()["Runs Allowed"]
+        return self.defensiveStats(teamNum, rosterNum)["Runs Allowed"]
 
     def battersWalked(self, teamNum: int, rosterNum: int = -1) -> int:
         # tells how many walks a character allowed when pitching
         # if no character given, returns walks by that team
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         return self.battersWalkedBallFour(teamNum, rosterNum) + self.battersHitByPitch(teamNum, rosterNum)
 
     def battersWalkedBallFour(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many times a character has walked a batter via 4 balls
         # if no character given, returns how many times the team walked via 4 balls
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.defensiveStats(teamNum, x)["Batters Walked"]
-            return total
-        else:
-            return self.defensiveStats(teamNum, rosterNum)["Batters Walked"]
+            return self.roster_obj(teamNum).defensive_totals()["Batters Walked"]
+        return self.defensiveStats(teamNum, rosterNum)["Batters Walked"]
 
     def battersHitByPitch(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many times a character walked a batter by hitting them by a pitch
         # if no character given, returns walked via HBP for the team
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.defensiveStats(teamNum, x)["Batters Hit"]
-            return total
-        else:
-            return self.defensiveStats(teamNum, rosterNum)["Batters Hit"]
+            return self.roster_obj(teamNum).defensive_totals()["Batters Hit"]
+        return self.defensiveStats(teamNum, rosterNum)["Batters Hit"]
 
     def hitsAllowed(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many hits a character allowed as pitcher
         # if no character given, returns how many hits a team allowed
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.defensiveStats(teamNum, x)["Hits Allowed"]
-            return total
-        else:
-            return self.defensiveStats(teamNum, rosterNum)["Hits Allowed"]
+            return self.roster_obj(teamNum).defensive_totals()["Hits Allowed"]
+        return self.defensiveStats(teamNum, rosterNum)["Hits Allowed"]
 
     def homerunsAllowed(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many homeruns a character allowed as pitcher
         # if no character given, returns how many homeruns a team allowed
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.defensiveStats(teamNum, x)["HRs Allowed"]
-            return total
-        else:
-            return self.defensiveStats(teamNum, rosterNum)["HRs Allowed"]
+            return self.roster_obj(teamNum).defensive_totals()["HRs Allowed"]
+        return self.defensiveStats(teamNum, rosterNum)["HRs Allowed"]
 
     def pitchesThrown(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many pitches a character threw
         # if no character given, returns how many pitches a team threw
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.defensiveStats(teamNum, x)["Pitches Thrown"]
-            return total
-        else:
-            return self.defensiveStats(teamNum, rosterNum)["Pitches Thrown"]
+            return self.roster_obj(teamNum).defensive_totals()["Pitches Thrown"]
+        return self.defensiveStats(teamNum, rosterNum)["Pitches Thrown"]
 
     def stamina(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns final pitching stamina of a pitcher
         # if no character given, returns total stamina of a team
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.defensiveStats(teamNum, x)["Stamina"]
-            return total
-        else:
-            return self.defensiveStats(teamNum, rosterNum)["Stamina"]
+            return self.roster_obj(teamNum).defensive_totals()["Stamina"]
+        return self.defensiveStats(teamNum, rosterNum)["Stamina"]
         
     def wasPitcher(self, teamNum: int, rosterNum: int) -> bool:
         # returns if a character was a pitcher
         # rosterNum: 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         ErrorChecker.check_roster_num_no_neg(rosterNum)
         return self.defensiveStats(teamNum, rosterNum)["Was Pitcher"] == 1
 
@@ -445,72 +545,49 @@ class StatObj:
         # returns how many strikeouts a character pitched
         # if no character given, returns how mnany strikeouts a team pitched
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.defensiveStats(teamNum, x)["Strikeouts"]
-            return total
-        else:
-            return self.defensiveStats(teamNum, rosterNum)["Strikeouts"]
+            return self.roster_obj(teamNum).defensive_totals()["Strikeouts"]
+        return self.defensiveStats(teamNum, rosterNum)["Strikeouts"]
 
     def starPitchesThrown(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many star pitches a character threw
         # if no character given, returns how many star pitches a team threw
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.defensiveStats(teamNum, x)["Star Pitches Thrown"]
-            return total
-        else:
-            return self.defensiveStats(teamNum, rosterNum)["Star Pitches Thrown"]
+            return self.roster_obj(teamNum).defensive_totals()["Star Pitches Thrown"]
+        return self.defensiveStats(teamNum, rosterNum)["Star Pitches Thrown"]
 
     def bigPlays(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many big plays a character had
         # if no character given, returns how many big plays a team had
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.defensiveStats(teamNum, x)["Big Plays"]
-            return total
-        else:
-            return self.defensiveStats(teamNum, rosterNum)["Big Plays"]
+            return self.roster_obj(teamNum).defensive_totals()["Big Plays"]
+        return self.defensiveStats(teamNum, rosterNum)["Big Plays"]
 
     def outsPitched(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many outs a character was pitching for
         # if no character given, returns how many outs a team pitched for
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.defensiveStats(teamNum, x)["Outs Pitched"]
-            return total
-        else:
-            return self.defensiveStats(teamNum, rosterNum)["Outs Pitched"]
+            return self.roster_obj(teamNum).defensive_totals()["Outs Pitched"]
+        return self.defensiveStats(teamNum, rosterNum)["Outs Pitched"]
 
     def inningsPitched(self, teamNum: int, rosterNum: int = -1) -> float:
         # returns how many innings a character was pitching for
         # if no character given, returns how many innings a team pitched for
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         return float(self.outsPitched(teamNum, rosterNum)) / 3
 
     def pitchesPerPosition(self, teamNum: int, rosterNum: int) -> dict:
         # returns a dict which tracks how many pitches a character was at a position for
         # rosterNum: 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         ErrorChecker.check_roster_num_no_neg(rosterNum)
         return self.defensiveStats(teamNum, rosterNum)["Pitches Per Position"][0]
 
     def outsPerPosition(self, teamNum: int, rosterNum: int) -> dict:
         # returns a dict which tracks how many outs a character was at a position for
         # rosterNum: 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         ErrorChecker.check_roster_num_no_neg(rosterNum)
         return self.defensiveStats(teamNum, rosterNum)["Outs Per Position"][0]
 
@@ -520,190 +597,119 @@ class StatObj:
         # returns how many at bats a character had
         # if no character given, returns how many at bats a team had
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.offensiveStats(teamNum, x)["At Bats"]
-            return total
-        else:
-            return self.offensiveStats(teamNum, rosterNum)["At Bats"]
+            return self.roster_obj(teamNum).offensive_totals()["At Bats"]
+        return self.offensiveStats(teamNum, rosterNum)["At Bats"]
 
     def hits(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many hits a character had
         # if no character given, returns how many hits a team had
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.offensiveStats(teamNum, x)["Hits"]
-            return total
-        else:
-            return self.offensiveStats(teamNum, rosterNum)["Hits"]
+            return self.roster_obj(teamNum).offensive_totals()["Hits"]
+        return self.offensiveStats(teamNum, rosterNum)["Hits"]
 
     def singles(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many singles a character had
         # if no character given, returns how many singles a team had
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.offensiveStats(teamNum, x)["Singles"]
-            return total
-        else:
-            return self.offensiveStats(teamNum, rosterNum)["Singles"]
+            return self.roster_obj(teamNum).offensive_totals()["Singles"]
+        return self.offensiveStats(teamNum, rosterNum)["Singles"]
 
     def doubles(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many doubles a character had
         # if no character given, returns how many doubles a team had
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.offensiveStats(teamNum, x)["Doubles"]
-            return total
-        else:
-            return self.offensiveStats(teamNum, rosterNum)["Doubles"]
+            return self.roster_obj(teamNum).offensive_totals()["Doubles"]
+        return self.offensiveStats(teamNum, rosterNum)["Doubles"]
 
     def triples(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many triples a character had
         # if no character given, returns how many triples a teams had
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.offensiveStats(teamNum, x)["Triples"]
-            return total
-        else:
-            return self.offensiveStats(teamNum, rosterNum)["Triples"]
+            return self.roster_obj(teamNum).offensive_totals()["Triples"]
+        return self.offensiveStats(teamNum, rosterNum)["Triples"]
 
     def homeruns(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many homeruns a character had
         # if no character given, returns how many homeruns a team had
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.offensiveStats(teamNum, x)["Homeruns"]
-            return total
-        else:
-            return self.offensiveStats(teamNum, rosterNum)["Homeruns"]
+            return self.roster_obj(teamNum).offensive_totals()["Homeruns"]
+        return self.offensiveStats(teamNum, rosterNum)["Homeruns"]
 
     def buntsLanded(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many successful bunts a character had
         # if no character given, returns how many successful bunts a team had
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.offensiveStats(teamNum, x)["Successful Bunts"]
-            return total
-        else:
-            return self.offensiveStats(teamNum, rosterNum)["Successful Bunts"]
+            return self.roster_obj(teamNum).offensive_totals()["Successful Bunts"]
+        return self.offensiveStats(teamNum, rosterNum)["Successful Bunts"]
 
     def sacFlys(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many sac flys a character had
         # if no character given, returns how many sac flys a team had
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.offensiveStats(teamNum, x)["Sac Flys"]
-            return total
-        else:
-            return self.offensiveStats(teamNum, rosterNum)["Sac Flys"]
+            return self.roster_obj(teamNum).offensive_totals()["Sac Flys"]
+        return self.offensiveStats(teamNum, rosterNum)["Sac Flys"]
 
     def strikeouts(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many times a character struck out when batting
         # if no character given, returns how many times a team struck out when batting
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.offensiveStats(teamNum, x)["Strikeouts"]
-            return total
-        else:
-            return self.offensiveStats(teamNum, rosterNum)["Strikeouts"]
+            return self.roster_obj(teamNum).offensive_totals()["Strikeouts"]
+        return self.offensiveStats(teamNum, rosterNum)["Strikeouts"]
 
     def walks(self, teamNum: int, rosterNum: int) -> int:
         # returns how many times a character was walked when batting
         # if no character given, returns how many times a team was walked when batting
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         return self.walksBallFour(teamNum, rosterNum) + self.walksHitByPitch(teamNum, rosterNum)
 
     def walksBallFour(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many times a character was walked via 4 balls when batting
         # if no character given, returns how many times a team was walked via 4 balls when batting
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.offensiveStats(teamNum, x)["Walks (4 Balls)"]
-            return total
-        else:
-            return self.offensiveStats(teamNum, rosterNum)["Walks (4 Balls)"]
+            return self.roster_obj(teamNum).offensive_totals()["Walks (4 Balls)"]
+        return self.offensiveStats(teamNum, rosterNum)["Walks (4 Balls)"]
 
     def walksHitByPitch(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many times a character was walked via hit by pitch when batting
         # if no character given, returns how many times a team was walked via hit by pitch when batting
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.offensiveStats(teamNum, x)["Walks (Hit)"]
-            return total
-        else:
-            return self.offensiveStats(teamNum, rosterNum)["Walks (Hit)"]
+            return self.roster_obj(teamNum).offensive_totals()["Walks (Hit)"]
+        return self.offensiveStats(teamNum, rosterNum)["Walks (Hit)"]
 
     def rbi(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many RBI's a character had
         # if no character given, returns how many RBI's a team had
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.offensiveStats(teamNum, x)["RBI"]
-            return total
-        else:
-            return self.offensiveStats(teamNum, rosterNum)["RBI"]
+            return self.roster_obj(teamNum).offensive_totals()["RBI"]
+        return self.offensiveStats(teamNum, rosterNum)["RBI"]
 
     def basesStolen(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many times a character successfully stole a base
         # if no character given, returns how many times a team successfully stole a base
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.offensiveStats(teamNum, x)["Bases Stolen"]
-            return total
-        else:
-            return self.offensiveStats(teamNum, rosterNum)["Bases Stolen"]
+            return self.roster_obj(teamNum).offensive_totals()["Bases Stolen"]
+        return self.offensiveStats(teamNum, rosterNum)["Bases Stolen"]
 
     def starHitsUsed(self, teamNum: int, rosterNum: int = -1) -> int:
         # returns how many star hits a character used
         # if no character given, returns how many star hits a team used
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         if rosterNum == -1:
-            total = 0
-            for x in range(0, 9):
-                total += self.offensiveStats(teamNum, x)["Star Hits"]
-            return total
-        else:
-            return self.offensiveStats(teamNum, rosterNum)["Star Hits"]
+            return self.roster_obj(teamNum).offensive_totals()["Star Hits"]
+        return self.offensiveStats(teamNum, rosterNum)["Star Hits"]
 
     # complicated stats
 
@@ -711,7 +717,6 @@ class StatObj:
         # returns the batting average of a character
         # if no character given, returns the batting average of a team
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         nAtBats = self.atBats(teamNum, rosterNum)
         nHits = self.hits(teamNum, rosterNum)
         return float(nHits) / float(nAtBats)
@@ -720,7 +725,6 @@ class StatObj:
         # returns the on base percentage of a character
         # if no character given, returns the on base percentage of a team
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         nAtBats = self.atBats(teamNum, rosterNum)
         nHits = self.hits(teamNum, rosterNum)
         nWalks = self.walks(teamNum, rosterNum)
@@ -730,7 +734,6 @@ class StatObj:
         # returns the SLG of a character
         # if no character given, returns the SLG of a team
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         nAtBats = self.atBats(teamNum, rosterNum)
         nSingles = self.singles(teamNum, rosterNum)
         nDoubles = self.doubles(teamNum, rosterNum)
@@ -743,200 +746,410 @@ class StatObj:
         # returns the OPS of a character
         # if no character given, returns the OPS of a team
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
-        teamNum = self.teamNumVersionCorrection(teamNum)
         return self.obp(teamNum, rosterNum) + self.slg(teamNum, rosterNum)
-    
+
+    def box_score(self):
+        """Every batting and pitching stat for all 18 roster slots as one DataFrame.
+
+        Built in a single pass over Character Game Stats. One row per
+        (team, roster) with team 0 == away and 1 == home; counting stats use
+        the BOX_SCORE_BATTING / BOX_SCORE_PITCHING column names, and the rate
+        stats (avg, obp, slg, ops, innings_pitched, era) use the same formulas
+        as the per-character methods, with NaN where the denominator is zero.
+        """
+        import pandas as pd
+
+        columns = {name: [] for name in ('team', 'roster', 'player', 'char_id', 'captain',
+                                         'superstar', 'batting_hand', 'fielding_hand')}
+        columns.update({name: [] for name in BOX_SCORE_BATTING})
+        columns.update({name: [] for name in BOX_SCORE_PITCHING})
+
+        for teamNum in (0, 1):
+            player = self.player(teamNum)
+            ro = self.roster_obj(teamNum)
+            captain = ro.captain_index()
+            for rosterNum in range(9):
+                offense = ro.offensive_stats(rosterNum)
+                defense = ro.defensive_stats(rosterNum)
+                columns['team'].append(teamNum)
+                columns['roster'].append(rosterNum)
+                columns['player'].append(player)
+                columns['char_id'].append(ro.char_id(rosterNum))
+                columns['captain'].append(rosterNum == captain)
+                columns['superstar'].append(ro.is_starred(rosterNum))
+                columns['batting_hand'].append(ro.batting_hand(rosterNum))
+                columns['fielding_hand'].append(ro.fielding_hand(rosterNum))
+                for name, key in BOX_SCORE_BATTING.items():
+                    columns[name].append(offense[key])
+                for name, key in BOX_SCORE_PITCHING.items():
+                    columns[name].append(defense[key])
+
+        df = pd.DataFrame(columns)
+
+        def ratio(num, den):
+            num = np.asarray(num, dtype=float)
+            den = np.asarray(den, dtype=float)
+            return np.divide(num, den, out=np.full_like(num, np.nan), where=den != 0)
+
+        walks = df['walks_bb'] + df['walks_hbp']
+        total_bases = df['singles'] + 2 * df['doubles'] + 3 * df['triples'] + 4 * df['homeruns']
+        df['avg'] = ratio(df['hits'], df['at_bats'])
+        df['obp'] = ratio(df['hits'] + walks, df['at_bats'])
+        df['slg'] = ratio(total_bases, df['at_bats'] - walks)
+        df['ops'] = df['obp'] + df['slg']
+        df['innings_pitched'] = df['outs_pitched'] / 3
+        df['era'] = 9 * ratio(df['runs_allowed'], df['innings_pitched'])
+        return df
+    
+    @classmethod
+    def from_path(cls, path: str, lazy_events: bool = False) -> StatObj:
+        # creates a StatObj from a decoded stat file on disk
+        # with lazy_events the header (players, scores, stadium, version,
+        # Character Game Stats, ...) is parsed now and the Events array is
+        # decoded the first time events() is called, so header-only work
+        # never pays for the events
+        # files are decoded with the fastest installed JSON backend, see
+        # json_backend.py
+        # path may also be a .json.gz/.json.zst file or a bundle member
+        # ("2023.zip::game.decoded.json"), read in place, see stat_sources.py
+        if not stat_sources.is_plain(path):
+            return cls.from_bytes(stat_sources.read_source(path), lazy_events)
+        if not lazy_events:
+            return cls(json_backend.load_path(path))
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        return cls._from_text(text)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, lazy_events: bool = False) -> StatObj:
+        # creates a StatObj from the content of a decoded stat file
+        if not lazy_events:
+            return cls(json_backend.loads(data))
+        return cls._from_text(data.decode('utf-8'))
+
+    @classmethod
+    def _from_text(cls, text: str) -> StatObj:
+        header, events_span = _split_events(text)
+        stat = cls(header)
+        if events_span is not None:
+            stat._events_source = (text, events_span)
+        return stat
+
+    def _load_events(self) -> None:
+        text, (start, end) = self._events_source
+        self._events_source = None
+        try:
+            self.statJson['Events'] = json_backend.loads(text[start:end])
+        except json.JSONDecodeError:
+            # Events wasn't the last key after all; take the whole file
+            self.statJson.update(json_backend.loads(text))
+
     def events(self) -> list[dict]:
+        if self._events_source is not None:
+            self._load_events()
         return self.statJson['Events']
 
+    def iter_events(self, eventNums: Optional[Iterable[int]] = None) -> Iterator[EventObj]:
+        # iterates over the events (or just eventNums) with ONE EventObj that
+        # is moved from event to event, so a loop over a game allocates nothing
+        # per event. The cursor is only valid until the next step; keep
+        # EventObj(stat, cursor.eventIndex) if an event is needed afterwards.
+        events = self.events()
+        if not events:
+            return
+        cursor = EventObj(self, 0)
+        for eventNum in range(len(events)) if eventNums is None else eventNums:
+            yield cursor.move_to(eventNum)
+
     def final_event(self) -> int:
         return len(self.events())-1
-    
-
-class EventSearch():
-    def __init__(self, rioStat: StatObj):
-        self.debug_mode = False
-
-        self.rioStat: StatObj = rioStat
-
-        self._result_of_AB_dict: dict[str, set[int]] = {value: set() for value in LookupDicts.FINAL_RESULT.values()}
-        self._first_fielder_position_dict: dict[str, set[int]] = {value: set() for value in LookupDicts.POSITION.values()}
-        self._pitch_type_dict: dict[str, set[int]] = {value: set() for value in LookupDicts.PITCH_TYPE.values()}
-        self._charge_type_dict: dict[str, set[int]] = {value: set() for value in LookupDicts.CHARGE_TYPE.values()}
-        self._swing_type_dict: dict[str, set[int]] = {value: set() for value in LookupDicts.TYPE_OF_SWING.values()}
-        self._contact_type_dict: dict[str, set[int]] = {value: set() for value in LookupDicts.CONTACT_TYPE.values()}
-        self._input_direction_dict: dict[str, set[int]] = {value: set() for value in LookupDicts.STICK_DIRECTION.values()}
-
-        self._rbi_dict: dict[int, set[int]] = {i: set() for i in range(5)}
-        self._inning_dict: dict[int, set[int]] = {i: set() for i in range(1, self.rioStat.inningsPlayed()+1)}
-        self._away_score_dict: dict[int, set[int]] = {i: set() for i in range(0, self.rioStat.score(0)+1)}
-        self._home_score_dict: dict[int, set[int]] = {i: set() for i in range(0, self.rioStat.score(1)+1)}
-        self._balls_dict: dict[int, set[int]] = {i: set() for i in range(4)}
-        self._strikes_dict: dict[int, set[int]] = {i: set() for i in range(5)}
-        self._outs_in_inning_dict: dict[int, set[int]] = {i: set() for i in range(3)}
-        self._half_inning_dict: dict[int, set[int]] = {i: set() for i in range(2)}
-        self._chem_on_base_dict: dict[int, set[int]] = {i: set() for i in range(4)}
-        self._runners_on_base_dict: dict[int, set[int]] = {i: set() for i in range(4)}
-        self._pitcher_stamina_dict: dict[int, set[int]] = {i: set() for i in range(11)}
-        self._star_chance_dict: dict[int, set[int]] = {i: set() for i in range(2)}
-        self._outs_during_event_dict: dict[int, set[int]] = {i: set() for i in range(4)}
-        self._pitch_in_strikezone_dict: dict[int, set[int]] = {i: set() for i in range(2)}
-        self._contact_frame_dict: dict[int, set[int]] = {i: set() for i in range(11)}
-        self._ball_position_strikezone: dict[int, set[int]] = {}
-        self._x_ball_contact_pos: dict[int, set[int]] = {}
-
-        self._steal: set[int] = set()
-        self._star_pitch: set[int] = set()
-        self._bobble: set[int] = set()
-        self._fireball_burn: set[int] = set()
-        self._five_star_dinger: set[int] = set()
-        self._sliding_catch: set[int] = set()
-        self._wall_jump: set[int] = set()
-        self._manual_character_selection: set[int] = set()
-        self._first_pitch_of_AB: set[int] = set()
-        self._last_pitch_of_AB: set[int] = set()
-        self._home_team_winning: set[int] = set()
-        self._away_team_winning: set[int] = set()
-        self._game_tied: set[int] = set()
-        self._lead_changed: set[int] = set()
-
-        self.character_action_dict: dict[str, dict[str, set[int]]] = {}
-        for characterDict in self.rioStat.characterGameStats().values():
-            self.character_action_dict[characterDict['CharID']] = {
-                'AtBat': set(),
-                'Pitching': set(),
-                'Fielding': set()
-            }
-
-        for eventNum, event in enumerate(self.rioStat.events()):
-            # Older versions of rio overflowed past event 255, this is fixed in a later version
-            # When using the search function, it is ideal for events to be singly identified.
-            rioEventNum = eventNum % 256
-            currentEvent = EventObj(rioStat, eventNum)
-
-            batting_team = currentEvent.half_inning()
-            fielding_team = abs(batting_team-1)
-
-            batter = currentEvent.batter()
-            pitcher = currentEvent.pitcher()
-
-            self.character_action_dict[batter]['AtBat'].add(eventNum)
-            self.character_action_dict[pitcher]['Pitching'].add(eventNum)
-            
-            self._away_score_dict[currentEvent.score(0)].add(eventNum)
-            self._home_score_dict[currentEvent.score(1)].add(eventNum)
-
-            if currentEvent.score(0) > currentEvent.score(1):
-                self._away_team_winning.add(eventNum)
-            elif currentEvent.score(0) < currentEvent.score(1):
-                self._home_team_winning.add(eventNum)
-            else:
-                self._game_tied.add(eventNum)
-
-            if (currentEvent.score(batting_team) + currentEvent.rbi() > currentEvent.score(fielding_team)) and (currentEvent.score(batting_team) <= currentEvent.score(fielding_team)):
-                self._lead_changed.add(eventNum)
-
-            self._outs_in_inning_dict[currentEvent.outs()].add(eventNum)
-            self._chem_on_base_dict[currentEvent.chem_links_on_base()].add(eventNum)
-            self._strikes_dict[currentEvent.strikes()].add(eventNum)
-            self._balls_dict[currentEvent.balls()].add(eventNum)
-            self._inning_dict[currentEvent.inning()].add(eventNum)
-            self._rbi_dict[currentEvent.rbi()].add(eventNum)
-            self._pitcher_stamina_dict[currentEvent.pitcher_stamina()].add(eventNum)
-            self._star_chance_dict[currentEvent.star_chance()].add(eventNum)
-            self._outs_during_event_dict[currentEvent.num_outs_during_play()].add(eventNum)
-
-            self._half_inning_dict[currentEvent.half_inning()].add(eventNum)
-            self._result_of_AB_dict[currentEvent.result_of_AB()].add(eventNum)
-            
-            if currentEvent.bool_runner_on_base(-1) == 0:
-                self._runners_on_base_dict[0].add(eventNum)
-            else:
-                for i in range(1,4):
-                    if currentEvent.bool_runner_on_base(i):
-                        self._runners_on_base_dict[i].add(eventNum)
-
-            if currentEvent.bool_steal(-1):
-                self._steal.add(eventNum)
 
+    def compiled(self) -> CompiledGame:
+        # returns the columnar (struct-of-arrays) view of the events
+        # built on first use and cached; see compiled_game.py
+        if self._compiled is None:
+            self._compiled = CompiledGame.from_statobj(self)
+        return self._compiled
 
-            if not currentEvent.pitch_dict():
-                continue
-
-            if currentEvent.balls() == 0 and currentEvent.strikes() == 0:
-                self._first_pitch_of_AB.add(eventNum)
-
-            if currentEvent.result_of_AB() != 'None':
-                self._last_pitch_of_AB.add(eventNum)
-           
-            try:
-                self._pitch_type_dict[currentEvent.pitch_type()].add(eventNum)
-            except KeyError:
-                if self.debug_mode:
-                    print(f'{self.rioStat.gameID()}, {eventNum}: Pitch Type: {currentEvent.pitch_type()}')
-
-            try:
-                self._charge_type_dict[currentEvent.charge_type()].add(eventNum)
-            except KeyError:
-                if self.debug_mode:
-                    print(f'{self.rioStat.gameID()}, {eventNum}: Charge Type: {currentEvent.charge_type()}')
-
-            self._pitch_in_strikezone_dict[currentEvent.in_strikezone()].add(eventNum)
-            self._swing_type_dict[currentEvent.type_of_swing()].add(eventNum)
-
-            if currentEvent.star_pitch() == 1:
-                self._star_pitch.add(eventNum)
-
-            # Banded at two decimal places
-            rounded_strikezone_x_pos = round(currentEvent.ball_position_strikezone(), 2)
-
-            if rounded_strikezone_x_pos not in self._ball_position_strikezone:
-                self._ball_position_strikezone[rounded_strikezone_x_pos] = set()
+    def contact_events(self) -> list[int]:
+        # returns the indexes of the events with batted-ball contact
+        # read from the compiled view when it is already built; otherwise a
+        # plain scan, which is far cheaper than compiling the game for it
+        if self._compiled is not None:
+            return np.flatnonzero(self._compiled.has_contact).tolist()
+        return [i for i, ev in enumerate(self.events()) if (ev.get('Pitch') or {}).get('Contact')]
+    
 
-            self._ball_position_strikezone[rounded_strikezone_x_pos].add(eventNum)
+EventResult = Union[set[int], np.ndarray]
 
-            if not currentEvent.contact_dict():
-                continue
 
-            self._contact_type_dict[currentEvent.type_of_contact()].add(eventNum)
-            self._input_direction_dict[currentEvent.stick_input_direction()].add(eventNum)
-            self._contact_frame_dict[currentEvent.contact_frame()].add(eventNum)
-    
+def _facet(method):
+    # EventSearch facets compute a boolean mask over the game's events. The
+    # wrapper hands back the historical set of event indices unless a mask is
+    # asked for, either per call (as_mask=True) or for the whole instance.
+    @functools.wraps(method)
+    def wrapper(self, *args, as_mask: Optional[bool] = None, **kwargs) -> EventResult:
+        mask = method(self, *args, **kwargs)
+        if self.as_mask if as_mask is None else as_mask:
+            return mask
+        return self.events_from_mask(mask)
+    return wrapper
 
-            if currentEvent.five_star_swing() == 1:
-                self._five_star_dinger.add(eventNum)
 
-            # Banded at two decimal places
-            
-            x_ball_contact_postion = round(currentEvent.ball_contact_position()[0], 2)
+def _frozen(mask: np.ndarray) -> np.ndarray:
+    # index masks are handed out as-is, so make sure callers can't edit them
+    mask.flags.writeable = False
+    return mask
 
-            if x_ball_contact_postion not in self._x_ball_contact_pos:
-                self._x_ball_contact_pos[x_ball_contact_postion] = set()
 
-            self._x_ball_contact_pos[x_ball_contact_postion].add(eventNum)
+def _label_masks(column: np.ndarray, table: dict) -> dict[str, np.ndarray]:
+    # label -> mask; labels listed under several codes match any of them
+    masks = {}
+    for code, label in table.items():
+        if code is None:
+            continue
+        masks[label] = masks[label] | (column == code) if label in masks else column == code
+    return {label: _frozen(mask) for label, mask in masks.items()}
 
-            if not currentEvent.first_fielder_dict():
-                continue
 
-            self.character_action_dict[currentEvent.first_fielder_character()]['Fielding'].add(eventNum)
+def _value_masks(column: np.ndarray, domain) -> dict[int, np.ndarray]:
+    return {i: _frozen(column == i) for i in domain}
 
-            if currentEvent.first_fielder_bobble() != 'None':
-                self._bobble.add(eventNum)
 
-            if currentEvent.first_fielder_bobble() == 'Fireball':
-                self._fireball_burn.add(eventNum)
+class EventSearch():
+    # Every facet is a numpy bool array with one entry per event, built with
+    # vectorized comparisons over rioStat.compiled() rather than by walking the
+    # event dicts. Facet methods return sets of event indices by default; pass
+    # as_mask=True (per call or to the constructor) to get the masks back, which
+    # combine with & | ~ without allocating Python sets.
+    #
+    # Indexes are cached properties: each one is built the first time a facet
+    # needs it, so a search only pays for the facets it actually queries.
+    def __init__(self, rioStat: StatObj, as_mask: bool = False):
+        self.rioStat: StatObj = rioStat
+        self.as_mask: bool = as_mask
 
-            if currentEvent.first_fielder_action() == 'Sliding':
-                self._sliding_catch.add(eventNum)
+    @functools.cached_property
+    def _compiled(self) -> CompiledGame:
+        return self.rioStat.compiled()
+
+    @functools.cached_property
+    def _num_events(self) -> int:
+        return len(self._compiled)
+
+    @functools.cached_property
+    def _empty(self) -> np.ndarray:
+        return _frozen(np.zeros(self._num_events, dtype=bool))
+
+    @functools.cached_property
+    def _result_of_AB_dict(self) -> dict[str, np.ndarray]:
+        return _label_masks(self._compiled.result_of_ab, LookupDicts.FINAL_RESULT)
+
+    @functools.cached_property
+    def _first_fielder_position_dict(self) -> dict[str, np.ndarray]:
+        cg = self._compiled
+        positions = _label_masks(cg.fielder_position, LookupDicts.POSITION)
+        # fielders whose position isn't a known code
+        positions['None'] = _frozen(cg.has_fielder & (cg.fielder_position == MISSING_INT))
+        return positions
+
+    @functools.cached_property
+    def _pitch_type_dict(self) -> dict[str, np.ndarray]:
+        return _label_masks(self._compiled.pitch_type, LookupDicts.PITCH_TYPE)
+
+    @functools.cached_property
+    def _charge_type_dict(self) -> dict[str, np.ndarray]:
+        return _label_masks(self._compiled.charge_type, LookupDicts.CHARGE_TYPE)
+
+    @functools.cached_property
+    def _swing_type_dict(self) -> dict[str, np.ndarray]:
+        return _label_masks(self._compiled.swing_type, LookupDicts.TYPE_OF_SWING)
+
+    @functools.cached_property
+    def _contact_type_dict(self) -> dict[str, np.ndarray]:
+        return _label_masks(self._compiled.contact_type, LookupDicts.CONTACT_TYPE)
+
+    @functools.cached_property
+    def _input_direction_dict(self) -> dict[str, np.ndarray]:
+        return _label_masks(self._compiled.stick_direction, LookupDicts.STICK_DIRECTION)
+
+    @functools.cached_property
+    def _rbi_dict(self) -> dict[int, np.ndarray]:
+        return _value_masks(self._compiled.rbi, range(5))
+
+    @functools.cached_property
+    def _inning_dict(self) -> dict[int, np.ndarray]:
+        return _value_masks(self._compiled.inning, range(1, self.rioStat.inningsPlayed()+1))
+
+    @functools.cached_property
+    def _away_score_dict(self) -> dict[int, np.ndarray]:
+        return _value_masks(self._compiled.away_score, range(0, self.rioStat.score(0)+1))
+
+    @functools.cached_property
+    def _home_score_dict(self) -> dict[int, np.ndarray]:
+        return _value_masks(self._compiled.home_score, range(0, self.rioStat.score(1)+1))
+
+    @functools.cached_property
+    def _balls_dict(self) -> dict[int, np.ndarray]:
+        return _value_masks(self._compiled.balls, range(4))
+
+    @functools.cached_property
+    def _strikes_dict(self) -> dict[int, np.ndarray]:
+        return _value_masks(self._compiled.strikes, range(5))
+
+    @functools.cached_property
+    def _outs_in_inning_dict(self) -> dict[int, np.ndarray]:
+        return _value_masks(self._compiled.outs, range(3))
+
+    @functools.cached_property
+    def _half_inning_dict(self) -> dict[int, np.ndarray]:
+        return _value_masks(self._compiled.half_inning, range(2))
+
+    @functools.cached_property
+    def _chem_on_base_dict(self) -> dict[int, np.ndarray]:
+        return _value_masks(self._compiled.chem_links, range(4))
+
+    @functools.cached_property
+    def _pitcher_stamina_dict(self) -> dict[int, np.ndarray]:
+        return _value_masks(self._compiled.pitcher_stamina, range(11))
+
+    @functools.cached_property
+    def _star_chance_dict(self) -> dict[int, np.ndarray]:
+        return _value_masks(self._compiled.star_chance, range(2))
+
+    @functools.cached_property
+    def _outs_during_event_dict(self) -> dict[int, np.ndarray]:
+        return _value_masks(self._compiled.outs_during_play, range(4))
+
+    @functools.cached_property
+    def _pitch_in_strikezone_dict(self) -> dict[int, np.ndarray]:
+        return _value_masks(self._compiled.in_strikezone, range(2))
+
+    @functools.cached_property
+    def _contact_frame_dict(self) -> dict[int, np.ndarray]:
+        return _value_masks(self._compiled.contact_frame, range(11))
+
+    @functools.cached_property
+    def _runners_on_base_dict(self) -> dict[int, np.ndarray]:
+        cg = self._compiled
+        return {
+            0: _frozen(~(cg.runner_1b | cg.runner_2b | cg.runner_3b)),
+            1: _frozen(cg.runner_1b.copy()),
+            2: _frozen(cg.runner_2b.copy()),
+            3: _frozen(cg.runner_3b.copy()),
+        }
 
-            if currentEvent.first_fielder_action() == 'Walljump':
-                self._wall_jump.add(eventNum)
+    # Banded at two decimal places; NaN (no pitch / no contact) never matches
+    @functools.cached_property
+    def _ball_position_strikezone(self) -> np.ndarray:
+        return _frozen(np.round(self._compiled.ball_position_strikezone, 2))
+
+    @functools.cached_property
+    def _x_ball_contact_pos(self) -> np.ndarray:
+        return _frozen(np.round(self._compiled.contact_x, 2))
+
+    @functools.cached_property
+    def _steal(self) -> np.ndarray:
+        return _frozen(self._compiled.steal.copy())
+
+    @functools.cached_property
+    def _star_pitch(self) -> np.ndarray:
+        cg = self._compiled
+        return _frozen(cg.has_pitch & (cg.star_pitch == 1))
+
+    @functools.cached_property
+    def _bobble(self) -> np.ndarray:
+        cg = self._compiled
+        return _frozen(cg.has_fielder & ~np.isin(cg.fielder_bobble, [0, 255]))
+
+    @functools.cached_property
+    def _fireball_burn(self) -> np.ndarray:
+        return _frozen(self._compiled.fielder_bobble == 4)
+
+    @functools.cached_property
+    def _five_star_dinger(self) -> np.ndarray:
+        cg = self._compiled
+        return _frozen(cg.has_contact & (cg.five_star_swing == 1))
+
+    @functools.cached_property
+    def _sliding_catch(self) -> np.ndarray:
+        return _frozen(self._compiled.fielder_action == 2)
+
+    @functools.cached_property
+    def _wall_jump(self) -> np.ndarray:
+        return _frozen(self._compiled.fielder_action == 3)
+
+    @functools.cached_property
+    def _manual_character_selection(self) -> np.ndarray:
+        cg = self._compiled
+        return _frozen(cg.has_fielder & (cg.fielder_manual_select != 0))
+
+    @functools.cached_property
+    def _first_pitch_of_AB(self) -> np.ndarray:
+        cg = self._compiled
+        return _frozen(cg.has_pitch & (cg.balls == 0) & (cg.strikes == 0))
+
+    @functools.cached_property
+    def _last_pitch_of_AB(self) -> np.ndarray:
+        cg = self._compiled
+        return _frozen(cg.has_pitch & (cg.result_of_ab != 0))
+
+    @functools.cached_property
+    def _away_team_winning(self) -> np.ndarray:
+        cg = self._compiled
+        return _frozen(cg.away_score > cg.home_score)
+
+    @functools.cached_property
+    def _home_team_winning(self) -> np.ndarray:
+        cg = self._compiled
+        return _frozen(cg.away_score < cg.home_score)
+
+    @functools.cached_property
+    def _game_tied(self) -> np.ndarray:
+        cg = self._compiled
+        return _frozen(cg.away_score == cg.home_score)
+
+    @functools.cached_property
+    def _lead_changed(self) -> np.ndarray:
+        cg = self._compiled
+        batting = cg.half_inning == 0
+        batting_score = np.where(batting, cg.away_score, cg.home_score)
+        fielding_score = np.where(batting, cg.home_score, cg.away_score)
+        return _frozen((batting_score + cg.rbi > fielding_score) & (batting_score <= fielding_score))
+
+    @functools.cached_property
+    def character_action_dict(self) -> dict[str, dict[str, np.ndarray]]:
+        # Characters are resolved through the (version corrected) rosters, the
+        # same way EventObj.batter() and .pitcher() do it.
+        cg = self._compiled
+        character_actions = {}
+        for team in range(2):
+            team_batting = cg.half_inning == team
+            for slot, char_id in enumerate(self.rioStat.characterName(team)):
+                actions = character_actions.setdefault(
+                    char_id, {'AtBat': self._empty, 'Pitching': self._empty, 'Fielding': self._empty})
+                actions['AtBat'] = _frozen(actions['AtBat'] | (team_batting & (cg.batter_roster_loc == slot)))
+                actions['Pitching'] = _frozen(actions['Pitching'] | (~team_batting & (cg.pitcher_roster_loc == slot)))
+                actions['Fielding'] = _frozen(actions['Fielding'] | (~team_batting & cg.has_fielder & (cg.fielder_roster_loc == slot)))
+        return character_actions
 
-            self._first_fielder_position_dict[currentEvent.first_fielder_position()].add(eventNum)
+    @staticmethod
+    def events_from_mask(mask: np.ndarray) -> set[int]:
+        # converts an event mask to the set of event indices it selects
+        return set(np.flatnonzero(mask).tolist())
+
+    def mask_from_events(self, events) -> np.ndarray:
+        # converts a collection of event indices to an event mask
+        mask = np.zeros(self._num_events, dtype=bool)
+        mask[list(events)] = True
+        return mask
+
+    @_facet
+    def query(self, expr) -> EventResult:
+        # evaluates a query expression built from event_query.Q, e.g.
+        # search.query(Q.inning(7) & Q.pitch_type('Curve') & ~Q.star_chance())
+        return expr.mask(self)
 
-            if currentEvent.first_fielder_maunual_selected() != 'No Selected Char':
-                self._manual_character_selection.add(eventNum)
-    
     def __errorCheck_fielder_pos(self, fielderPos) -> None:
         # tells if fielderPos is valid
         if fielderPos.upper() not in LookupDicts.POSITION.values():
@@ -951,15 +1164,18 @@ class EventSearch():
         if halfInningNum not in [0,1]:
             raise ValueError(f'Invalid Half Inning num {halfInningNum}. Function only accepts base numbers of 0 or 1.')
 
-    def noneResultEvents(self) -> set[int]:
+    @_facet
+    def noneResultEvents(self) -> EventResult:
         # returns a set of events who's result is none
         return self._result_of_AB_dict['None']
     
-    def strikeoutResultEvents(self) -> set[int]:
+    @_facet
+    def strikeoutResultEvents(self) -> EventResult:
         # returns a set of events where the result is a strikeout
         return self._result_of_AB_dict['Strikeout']
     
-    def walkResultEvents(self, include_hbp=True, include_bb=True) -> set[int]:
+    @_facet
+    def walkResultEvents(self, include_hbp=True, include_bb=True) -> EventResult:
         # returns a set of events where the batter recorded a type of hit
         # can be used to reutrn just walks or just hbp
         # defaults to returning both
@@ -970,21 +1186,25 @@ class EventSearch():
         if include_bb:
             return self._result_of_AB_dict['Walk (BB)']
         else:
-            return set()
+            return self._empty
         
-    def outResultEvents(self) -> set[int]:
+    @_facet
+    def outResultEvents(self) -> EventResult:
         # returns a set of events where the result is out
         return self._result_of_AB_dict['Out']
 
-    def caughtResultEvents(self) -> set[int]:
+    @_facet
+    def caughtResultEvents(self) -> EventResult:
         # returns a set of events where the result is caught
         return self._result_of_AB_dict['Caught']
     
-    def caughtLineDriveResultsEvents(self) -> set[int]:
+    @_facet
+    def caughtLineDriveResultsEvents(self) -> EventResult:
         # returns a set of events where the result is caught line drive
         return self._result_of_AB_dict['Caught line-drive']
 
-    def hitResultEvents(self, numberOfBases=0) -> set[int]:
+    @_facet
+    def hitResultEvents(self, numberOfBases=0) -> EventResult:
         # returns a set of events where the batter recorded a type of hit
         # can return singles, doubles, triples, HRs or all hits
         # returns all hits if numberOfBases is not 1-4
@@ -999,86 +1219,103 @@ class EventSearch():
         else:
             return self._result_of_AB_dict['Single'] | self._result_of_AB_dict['Double'] | self._result_of_AB_dict['Triple'] | self._result_of_AB_dict['HR']
 
-    def inputErrorResultEvents(self) -> set[int]:
+    @_facet
+    def inputErrorResultEvents(self) -> EventResult:
         # returns a set of events where the result is a input error
         return self._result_of_AB_dict['Error - Input']
     
-    def chemErrorResultEvents(self) -> set[int]:
+    @_facet
+    def chemErrorResultEvents(self) -> EventResult:
         # returns a set of events where the result is a chem error
         return self._result_of_AB_dict['Error - Chem']
 
-    def buntResultEvents(self) -> set[int]:
+    @_facet
+    def buntResultEvents(self) -> EventResult:
         #returns a set of events of successful bunts
         return self._result_of_AB_dict['Bunt']
     
-    def sacFlyResultEvents(self) -> set[int]:
+    @_facet
+    def sacFlyResultEvents(self) -> EventResult:
         #returns a set of events of sac flys
         return self._result_of_AB_dict['SacFly']
     
-    def groundBallDoublePlayResultEvents(self) -> set[int]:
+    @_facet
+    def groundBallDoublePlayResultEvents(self) -> EventResult:
         # returns a set of events where the result is a ground ball double play
         return self._result_of_AB_dict['Ground ball double Play']
     
-    def foulCatchResultEvents(self) -> set[int]:
+    @_facet
+    def foulCatchResultEvents(self) -> EventResult:
         # returns a set of events where the result is a foul catch
         return self._result_of_AB_dict['Foul catch']
     
-    def allOutResultEvents(self) -> set[int]:
+    @_facet
+    def allOutResultEvents(self) -> EventResult:
         # returns a set of events where the result is any type of out
-        return set().union(
-            self.strikeoutResultEvents(),
-            self.outResultEvents(),
-            self.caughtResultEvents(),
-            self.caughtLineDriveResultsEvents(),
-            self.sacFlyResultEvents(),
-            self.groundBallDoublePlayResultEvents(),
-            self.foulCatchResultEvents()
+        return (
+            self.strikeoutResultEvents(as_mask=True)
+            | self.outResultEvents(as_mask=True)
+            | self.caughtResultEvents(as_mask=True)
+            | self.caughtLineDriveResultsEvents(as_mask=True)
+            | self.sacFlyResultEvents(as_mask=True)
+            | self.groundBallDoublePlayResultEvents(as_mask=True)
+            | self.foulCatchResultEvents(as_mask=True)
         )
 
-    def stealEvents(self) -> set[int]:
+    @_facet
+    def stealEvents(self) -> EventResult:
         # returns a set of events where an steal happened
         # types of steals: None, Ready, Normal, Perfect
         return self._steal
     
-    def starPitchEvents(self) -> set[int]:
+    @_facet
+    def starPitchEvents(self) -> EventResult:
         # returns a set of events where a star pitch is used
         return self._star_pitch
     
-    def bobbleEvents(self) -> set[int]:
+    @_facet
+    def bobbleEvents(self) -> EventResult:
         # returns a set of events where any kind of bobble occurs
         # Bobble types: "None" "Slide/stun lock" "Fumble", "Bobble", 
         # "Fireball", "Garlic knockout" "None"
         return self._bobble
     
-    def fireballBurnEvents(self) -> set[int]:
+    @_facet
+    def fireballBurnEvents(self) -> EventResult:
         # returns a set of events where a fireball burn bobble occurs
         return self._fireball_burn
     
-    def fiveStarDingerEvents(self) -> set[int]:
+    @_facet
+    def fiveStarDingerEvents(self) -> EventResult:
         # returns a set of events where a five star dinger occurs
         return self._five_star_dinger
     
-    def slidingCatchEvents(self) -> set[int]:
+    @_facet
+    def slidingCatchEvents(self) -> EventResult:
         # returns a set of events where the fielder made a sliding catch
         # not to be confused with the character ability sliding catch
         return self._sliding_catch
     
-    def wallJumpEvents(self) -> set[int]:
+    @_facet
+    def wallJumpEvents(self) -> EventResult:
         # returns a set of events where the fielder made a wall jump
         return self._wall_jump
     
-    def firstFielderPositionEvents(self, location_abbreviation) -> set[int]:
+    @_facet
+    def firstFielderPositionEvents(self, location_abbreviation) -> EventResult:
         # returns a set of events where the first fielder on the ball
         # is the one provided in the function argument
         if location_abbreviation not in self._first_fielder_position_dict:
             raise ValueError(f'Invalid roster arg {location_abbreviation}. Function only accepts location abbreviations {list(self._first_fielder_position_dict)}')
         return self._first_fielder_position_dict[location_abbreviation]
     
-    def manualCharacterSelectionEvents(self) -> set[int]:
+    @_facet
+    def manualCharacterSelectionEvents(self) -> EventResult:
         # returns a set of events where a fielder was manually selected
         return self._manual_character_selection
     
-    def runnerOnBaseEvents(self, baseNums: list) -> set[int]:
+    @_facet
+    def runnerOnBaseEvents(self, baseNums: list) -> EventResult:
         # returns a set of events where runners were on the specified bases
         # the input baseNums is a list of three numbers -3 to 3
         # the numbers indicate what base the runner is to appear on
@@ -1100,7 +1337,7 @@ class EventSearch():
             raise ValueError('Too many baseNums provided. runnerOnBaseEvents accepts at most 3 bases')
 
         if baseNums == [0]:
-            return self._runners_on_base_dict['None']
+            return self._runners_on_base_dict[0]
 
         runner_on_base = self._runners_on_base_dict
 
@@ -1119,203 +1356,231 @@ class EventSearch():
             raise ValueError(f'The argument 0 may only be provided alongside optional arguments or itself')
 
         if required_bases:
-            print('required_bases')
-            result = set(range(self.eventFinal()+1))
+            result = ~self._empty
             for base in required_bases:
-                result.intersection_update(runner_on_base[base])
+                result &= runner_on_base[base]
         else:
-            result = set()
+            result = self._empty.copy()
 
-        if not result:
+        if not result.any():
             for base in optional_bases:
-                result = result.union(runner_on_base[base])
+                result |= runner_on_base[base]
 
-        if exclude_bases:
-            for base in exclude_bases:
-                result.difference_update(runner_on_base[base])
+        for base in exclude_bases:
+            result &= ~runner_on_base[base]
 
         return result
 
-    def listInputHandling(self, inputList, class_variable, to_zero=False) -> set[int]:
+    @_facet
+    def listInputHandling(self, inputList, class_variable, to_zero=False) -> EventResult:
         # Used with class variables that have integer keys
-        result = set()
+        result = self._empty.copy()
         for i in inputList:
             if abs(i) not in class_variable:
                 continue
             if i >= 0:
-                result = result.union(class_variable[i])
+                result |= class_variable[i]
             else:
                 if to_zero:
                     for j in range(0, abs(i)):
-                        result = result.union(class_variable[j])
+                        result |= class_variable[j]
                 else:
                     for j in range(abs(i), max(class_variable)+1):
-                        result = result.union(class_variable[j])
+                        result |= class_variable[j]
                      
         return result
 
-    def inningEvents(self, inningNum) -> set[int]:
+    @_facet
+    def inningEvents(self, inningNum) -> EventResult:
         inningNumList = inningNum if isinstance(inningNum, (list, set)) else [inningNum]
         # returns a set of events that occurered in the inning input
         # negative inputs return all events after the specified inning
-        return self.listInputHandling(inningNumList, self._inning_dict)
+        return self.listInputHandling(inningNumList, self._inning_dict, as_mask=True)
     
-    def awayTeamWinningEvents(self) -> set[int]:
+    @_facet
+    def awayTeamWinningEvents(self) -> EventResult:
         return self._away_team_winning
     
-    def homeTeamWinningEvents(self) -> set[int]:
+    @_facet
+    def homeTeamWinningEvents(self) -> EventResult:
         return self._home_team_winning
     
-    def gameTiedEvents(self) -> set[int]:
+    @_facet
+    def gameTiedEvents(self) -> EventResult:
         return self._game_tied
     
-    def awayScoreEvents(self, awayScore) -> set[int]:
+    @_facet
+    def awayScoreEvents(self, awayScore) -> EventResult:
         # returns a set of events that occurered with the away score
         # negative inputs return all events with an away score greater than or equal to the input
         # inputting a list or set will return the all events that match the numbers in the list
         awayScoreList = awayScore if isinstance(awayScore, (list, set)) else [awayScore]
-        return self.listInputHandling(awayScoreList, self._home_score_dict)
+        return self.listInputHandling(awayScoreList, self._away_score_dict, as_mask=True)
     
-    def homeScoreEvents(self, homeScore) -> set[int]:
+    @_facet
+    def homeScoreEvents(self, homeScore) -> EventResult:
         # returns a set of events that occurered with the home score
         # negative inputs return all events with a home score greater than or equal to the input
         # inputting a list or set will return the all events that match the numbers in the list
         homeScoreList = homeScore if isinstance(homeScore, (list, set)) else [homeScore]
-        return self.listInputHandling(homeScoreList, self._home_score_dict)
+        return self.listInputHandling(homeScoreList, self._home_score_dict, as_mask=True)
     
-    def ballEvents(self, ballNum) -> set[int]:
+    @_facet
+    def ballEvents(self, ballNum) -> EventResult:
         # returns a set of events that occurered with the number of balls in the count
         # negative inputs return all events with a ball count greater than or equal to the input
         # inputting a list or set will return the all events that match the numbers in the list
         ballNumList = ballNum if isinstance(ballNum, (list, set)) else [ballNum]
-        return self.listInputHandling(ballNumList, self._balls_dict)
+        return self.listInputHandling(ballNumList, self._balls_dict, as_mask=True)
     
-    def strikeEvents(self, strikeNum) -> set[int]:
+    @_facet
+    def strikeEvents(self, strikeNum) -> EventResult:
         # returns a set of events that occurered with the number of strikes in the count
         # negative inputs return all events with a strike count greater than or equal to the input
         # inputting a list or set will return the all events that match the numbers in the list
         strikeNumList = strikeNum if isinstance(strikeNum, (list, set)) else [strikeNum]
-        return self.listInputHandling(strikeNumList, self._strikes_dict)
+        return self.listInputHandling(strikeNumList, self._strikes_dict, as_mask=True)
 
-    def chemOnBaseEvents(self, chemNum) -> set[int]:
+    @_facet
+    def chemOnBaseEvents(self, chemNum) -> EventResult:
         # returns a set of events that occurered with the number of chem on base
         # negative inputs return all events with a chem count greater than or equal to the input
         # inputting a list or set will return the all events that match the numbers in the list
         chemNumList = chemNum if isinstance(chemNum, (list, set)) else [chemNum]
-        return self.listInputHandling(chemNumList, self._chem_on_base_dict)
+        return self.listInputHandling(chemNumList, self._chem_on_base_dict, as_mask=True)
         
-    def rbiEvents(self, rbiNum) -> set[int]:
+    @_facet
+    def rbiEvents(self, rbiNum) -> EventResult:
         # returns a set of events that occurered with the number of chem on base
         # negative inputs return all events with a chem count greater than or equal to the input
         # inputting a list or set will return the all events that match the numbers in the list
         rbiNumList = rbiNum if isinstance(rbiNum, (list, set)) else [rbiNum]
-        return self.listInputHandling(rbiNumList, self._rbi_dict)
+        return self.listInputHandling(rbiNumList, self._rbi_dict, as_mask=True)
         
 
-    def halfInningEvents(self, halfInningNum: int) -> set[int]:
+    @_facet
+    def halfInningEvents(self, halfInningNum: int) -> EventResult:
           self.__errorCheck_halfInningNum(halfInningNum)
           return self._half_inning_dict[halfInningNum]
     
-    def outsInInningEvents(self, outsNum: int) -> set[int]:
+    @_facet
+    def outsInInningEvents(self, outsNum: int) -> EventResult:
         self.__errorCheck_halfInningNum(outsNum)
         if outsNum >= 0:
             return self._outs_in_inning_dict[outsNum]
         else:
-            result = set()
+            result = self._empty.copy()
             for i in range(abs(outsNum), 3):
-                result = result.union(self._outs_in_inning_dict[i])
+                result |= self._outs_in_inning_dict[i]
             return result
         
-    def pitcherStaminaEvents(self, stamina) -> set[int]:
+    @_facet
+    def pitcherStaminaEvents(self, stamina) -> EventResult:
         # returns a set of events that occurered with the number of pitcher stamina
         # negative inputs return all events with a stamina LESS THAN or equal to the input
         # inputting a list or set will return the all events that match the numbers in the list
         staminaList = stamina if isinstance(stamina, (list, set)) else [stamina]
-        return self.listInputHandling(staminaList, 'Pitcher Stamina', to_zero=True)
+        return self.listInputHandling(staminaList, self._pitcher_stamina_dict, to_zero=True, as_mask=True)
 
-    def starChanceEvents(self, isStarChance=True) -> set[int]:
+    @_facet
+    def starChanceEvents(self, isStarChance=True) -> EventResult:
         if isStarChance:
             return self._star_chance_dict[1]
         return self._star_chance_dict[0]
 
-    def numOutsDuringPlayEvents(self, numOuts) -> set[int]:
+    @_facet
+    def numOutsDuringPlayEvents(self, numOuts) -> EventResult:
          numOutsList = numOuts if isinstance(numOuts, (list, set)) else [numOuts]
-         return self.listInputHandling(numOutsList, self._outs_during_event_dict)
+         return self.listInputHandling(numOutsList, self._outs_during_event_dict, as_mask=True)
 
-    def curvePitchTypeEvents(self) -> set[int]:
+    @_facet
+    def curvePitchTypeEvents(self) -> EventResult:
         return self._pitch_type_dict['Curve']
     
-    def chargePitchTypeEvents(self) -> set[int]:
+    @_facet
+    def chargePitchTypeEvents(self) -> EventResult:
         return self._pitch_type_dict['Charge']
 
-    def sliderPitchTypeEvents(self) -> set[int]:
+    @_facet
+    def sliderPitchTypeEvents(self) -> EventResult:
         return self._charge_type_dict['Slider']
 
-    def perfectChargePitchTypeEvents(self) -> set[int]:
+    @_facet
+    def perfectChargePitchTypeEvents(self) -> EventResult:
         return self._charge_type_dict['Perfect']
 
-    def changeUpPitchTypeEvents(self) -> set[int]:
+    @_facet
+    def changeUpPitchTypeEvents(self) -> EventResult:
         return self._pitch_type_dict['ChangeUp']
     
-    def pitchTypeEvents(self, pitchType) -> set[int]:
+    @_facet
+    def pitchTypeEvents(self, pitchType) -> EventResult:
         pitchTypeList = pitchType if isinstance(pitchType, (list, set)) else [pitchType]
         
-        result = set()
+        result = self._empty.copy()
         for pitch in pitchTypeList:
             if pitch.lower() == 'curve':
-                result = result.union(self.curvePitchTypeEvents())
+                result |= self.curvePitchTypeEvents(as_mask=True)
             elif pitch.lower() == 'charge':
-                result = result.union(self.chargePitchTypeEvents())
+                result |= self.chargePitchTypeEvents(as_mask=True)
             elif pitch.lower() == 'slider':
-                result = result.union(self.sliderPitchTypeEvents())
+                result |= self.sliderPitchTypeEvents(as_mask=True)
             elif pitch.lower() == 'perfect':
-                result = result.union(self.perfectChargePitchTypeEvents())
+                result |= self.perfectChargePitchTypeEvents(as_mask=True)
             elif pitch.lower() == 'changeup':
-                result = result.union(self.changeUpPitchTypeEvents())
+                result |= self.changeUpPitchTypeEvents(as_mask=True)
             else:
                 raise ValueError(f'{pitch} is not a valid pitch type. Curve, Charge, Slider, Perfect, and ChangeUp are accepted.')
         
         return result
 
-    def inStrikezoneEvents(self) -> set[int]:
+    @_facet
+    def inStrikezoneEvents(self) -> EventResult:
         return self._pitch_in_strikezone_dict[1]
 
-    def noneSwingTypeEvents(self) -> set[int]:
+    @_facet
+    def noneSwingTypeEvents(self) -> EventResult:
         return self._swing_type_dict['None']
 
-    def slapSwingTypeEvents(self) -> set[int]:
+    @_facet
+    def slapSwingTypeEvents(self) -> EventResult:
         return self._swing_type_dict['Slap']
 
-    def chargeSwingTypeEvents(self) -> set[int]:
+    @_facet
+    def chargeSwingTypeEvents(self) -> EventResult:
         return self._swing_type_dict['Charge']
 
-    def starSwingTypeEvents(self) -> set[int]:
+    @_facet
+    def starSwingTypeEvents(self) -> EventResult:
         return self._swing_type_dict['Star']
 
-    def buntSwingTypeEvents(self) -> set[int]:
+    @_facet
+    def buntSwingTypeEvents(self) -> EventResult:
         return self._swing_type_dict['Bunt']
     
-    def swingTypeEvents(self, swingType) -> set[int]:
+    @_facet
+    def swingTypeEvents(self, swingType) -> EventResult:
         swingTypeList = swingType if isinstance(swingType, (list, set)) else [swingType]
         
-        result = set()
+        result = self._empty.copy()
         for swing in swingTypeList:
             if swing.lower() == 'none':
-                result = result.union(self.noneSwingTypeEvents())
+                result |= self.noneSwingTypeEvents(as_mask=True)
             elif swing.lower() == 'slap':
-                result = result.union(self.slapSwingTypeEvents())
+                result |= self.slapSwingTypeEvents(as_mask=True)
             elif swing.lower() == 'charge':
-                result = result.union(self.chargeSwingTypeEvents())
+                result |= self.chargeSwingTypeEvents(as_mask=True)
             elif swing.lower() == 'star':
-                result = result.union(self.starSwingTypeEvents())
+                result |= self.starSwingTypeEvents(as_mask=True)
             elif swing.lower() == 'bunt':
-                result = result.union(self.buntSwingTypeEvents())
+                result |= self.buntSwingTypeEvents(as_mask=True)
             else:
                 raise ValueError(f'{swing} is not a valid swing type. None, Slap, Charge, Star, and Bunt are accepted.')
         
         return result
     
-    def niceContactTypeEvents(self, side='b') -> set[int]:
+    @_facet
+    def niceContactTypeEvents(self, side='b') -> EventResult:
         if side == 'b':
             return self._contact_type_dict['Nice - Left'] | self._contact_type_dict['Nice - Right']
         if side == 'l':
@@ -1324,10 +1589,12 @@ class EventSearch():
             return self._contact_type_dict['Nice - Right']
         raise ValueError(f"Invalid side '{side}'. Must be 'b', 'l', or 'r'.")
         
-    def perfectContactTypeEvents(self) -> set[int]:
+    @_facet
+    def perfectContactTypeEvents(self) -> EventResult:
          return self._contact_type_dict['Perfect']
 
-    def sourContactTypeEvents(self, side='b') -> set[int]:
+    @_facet
+    def sourContactTypeEvents(self, side='b') -> EventResult:
         if side == 'b':
             return self._contact_type_dict['Sour - Left'] | self._contact_type_dict['Sour - Right']
         if side == 'l':
@@ -1336,118 +1603,140 @@ class EventSearch():
             return self._contact_type_dict['Sour - Right']
         raise ValueError(f"Invalid side '{side}'. Must be 'b', 'l', or 'r'.")
 
-    def contactTypeEvents(self, contactType) -> set[int]:
+    @_facet
+    def contactTypeEvents(self, contactType) -> EventResult:
         contactTypeList = contactType if isinstance(contactType, (list, set)) else [contactType]
         
-        result = set()
+        result = self._empty.copy()
         for contact in contactTypeList:
             if contact.lower() == 'sour':
-                result = result.union(self.sourContactTypeEvents())
+                result |= self.sourContactTypeEvents(as_mask=True)
             elif contact.lower() == 'nice':
-                result = result.union(self.niceContactTypeEvents())
+                result |= self.niceContactTypeEvents(as_mask=True)
             elif contact.lower() == 'perfect':
-                result = result.union(self.perfectContactTypeEvents())
+                result |= self.perfectContactTypeEvents(as_mask=True)
             else:
                 raise ValueError(f'{contact} is not a valid contact type. Sour, Nice, and Perfect are accepted.')
         
         return result
 
-    def inputDirectionEvents(self, input_directions) -> set[int]:
+    @_facet
+    def inputDirectionEvents(self, input_directions) -> EventResult:
         return self._input_direction_dict[input_directions]
 
-    def contactFrameEvents(self, contactFrame) -> set[int]:
+    @_facet
+    def contactFrameEvents(self, contactFrame) -> EventResult:
         # returns a set of contacts that occurered on the specified frame
         # negative inputs return all events with a strike count greater than or equal to the input
         # inputting a list or set will return the all events that match the numbers in the list
         contactFrameList = contactFrame if isinstance(contactFrame, (list, set)) else [contactFrame]
-        return self.listInputHandling(contactFrameList, self._contact_frame_dict)
+        return self.listInputHandling(contactFrameList, self._contact_frame_dict, as_mask=True)
 
-    def characterAtBatEvents(self, char_id) -> set[int]:
+    @_facet
+    def characterAtBatEvents(self, char_id) -> EventResult:
         # returns a set of events where the input character was at bat
         # returns an empty set if the character was not in the game
         # rather than raising an error
         if char_id not in self.character_action_dict:
-            return set()
+            return self._empty
         return self.character_action_dict[char_id]['AtBat']
 
-    def characterPitchingEvents(self, char_id) -> set[int]:
+    @_facet
+    def characterPitchingEvents(self, char_id) -> EventResult:
         # returns a set of events where the input character was pitching
         # returns an empty set if the character was not in the game
         # rather than raising an error
         if char_id not in self.character_action_dict:
-            return set()
+            return self._empty
         return self.character_action_dict[char_id]['Pitching']
 
-    def characterFieldingEvents(self, char_id) -> set[int]:
+    @_facet
+    def characterFieldingEvents(self, char_id) -> EventResult:
         # returns a set of events where the input character is the first fielder
         # returns an empty set if the character was not in the game
         # rather than raising an error
         if char_id not in self.character_action_dict:
-            return set()
+            return self._empty
         return self.character_action_dict[char_id]['Fielding']
     
-    def positionFieldingEvents(self, fielderPos) -> set[int]:
+    @_facet
+    def positionFieldingEvents(self, fielderPos) -> EventResult:
         # returns a set of events where the input fielding pos is the first fielder
         # raises an error when the imput fielding pos is not valid
         self.__errorCheck_fielder_pos(fielderPos)
         return self._first_fielder_position_dict[fielderPos.upper()]
     
-    def walkoffEvents(self) -> set[int]:
-        final_event = EventObj(self.rioStat, self.rioStat.final_event())
+    @_facet
+    def walkoffEvents(self) -> EventResult:
         # returns a set of events of game walkoffs
-        if final_event.rbi() != 0:
-            return set([self.rioStat.final_event()])
-        return set()
+        final_event = self.rioStat.final_event()
+        result = self._empty.copy()
+        if self._compiled.rbi[final_event] != 0:
+            result[final_event] = True
+        return result
     
-    def playerBattingEvents(self, playerBatting) -> set[int]:
+    @_facet
+    def playerBattingEvents(self, playerBatting) -> EventResult:
         if playerBatting.lower() == self.rioStat.player(0).lower():
-            return self.halfInningEvents(0)
+            return self.halfInningEvents(0, as_mask=True)
         elif playerBatting.lower() == self.rioStat.player(1).lower():
-            return self.halfInningEvents(1)
+            return self.halfInningEvents(1, as_mask=True)
         else:
-            return set()
+            return self._empty
         
-    def playerPitchingEvents(self, playerPitching) -> set[int]:
+    @_facet
+    def playerPitchingEvents(self, playerPitching) -> EventResult:
         if playerPitching.lower() == self.rioStat.player(0).lower():
-            return self.halfInningEvents(1)
+            return self.halfInningEvents(1, as_mask=True)
         elif playerPitching.lower() == self.rioStat.player(1).lower():
-            return self.halfInningEvents(0)
+            return self.halfInningEvents(0, as_mask=True)
         else:
-            return set()
+            return self._empty
         
-    def ballPositionStrikezoneEvents(self, minimimum_ball_pos) -> set[int]:
-        result = set()
-        for key in self._ball_position_strikezone:
-            if abs(key) >= abs(minimimum_ball_pos):
-                result = result.union(set(self._ball_position_strikezone[key]))
-        return result
+    @_facet
+    def ballPositionStrikezoneEvents(self, minimimum_ball_pos) -> EventResult:
+        return np.abs(self._ball_position_strikezone) >= abs(minimimum_ball_pos)
     
-    def ballContactPositionEvents(self, minimimum_ball_pos) -> set[int]:
-        result = set()
-        for key in self._x_ball_contact_pos:
-            if abs(key) >= abs(minimimum_ball_pos):
-                result = result.union(set(self._x_ball_contact_pos[key]))
-        return result
+    @_facet
+    def ballContactPositionEvents(self, minimimum_ball_pos) -> EventResult:
+        return np.abs(self._x_ball_contact_pos) >= abs(minimimum_ball_pos)
     
-    def firstPitchOfABEvents(self) -> set[int]:
+    @_facet
+    def firstPitchOfABEvents(self) -> EventResult:
         return self._first_pitch_of_AB
     
-    def lastPitchOfABEvents(self) -> set[int]:
+    @_facet
+    def lastPitchOfABEvents(self) -> EventResult:
         return self._last_pitch_of_AB
     
-    def leadChangedEvents(self) -> set[int]:
+    @_facet
+    def leadChangedEvents(self) -> EventResult:
         return self._lead_changed
     
 
         
 
 class EventObj():
+    # Slotted, and the Pitch / Contact / First Fielder dicts are looked up once
+    # per event, so one instance can serve as a cursor: StatObj.iter_events()
+    # moves a single EventObj across the game instead of building one per event.
+    __slots__ = ('rioStat', 'all_events', 'eventIndex', 'eventDict', '_pitch', '_contact', '_fielder')
+
     def __init__(self, rioStat: StatObj, eventNum: int):
         self.rioStat = rioStat
         self.all_events = rioStat.events()
         if abs(eventNum) > len(self.all_events):
             raise IndexError(f'Invalid event num: Event {eventNum} does not exist in game')
+        self.move_to(eventNum)
+
+    def move_to(self, eventNum: int) -> EventObj:
+        # points this EventObj at another event of the same game
+        self.eventIndex = eventNum
         self.eventDict = self.all_events[eventNum]
+        self._pitch = self.eventDict.get('Pitch', {})
+        self._contact = self._pitch.get('Contact', {})
+        self._fielder = self._contact.get('First Fielder', {})
+        return self
 
     def safe_int(self, value) -> Optional[int]:
         """
@@ -1599,278 +1888,283 @@ class EventObj():
         """
         Returns an empty dict if no pitch in event
         """
-        return self.eventDict.get('Pitch', {})
+        return self._pitch
     
     def pitch_type(self) -> Optional[str]:
         """
         Returns None if no pitch in event
         """
-        return self.pitch_dict().get('Pitch Type')
+        return self._pitch.get('Pitch Type')
     
     def charge_type(self) -> Optional[str]:
         """
         Returns None if no pitch in event
         """
-        return self.pitch_dict().get('Charge Type')
+        return self._pitch.get('Charge Type')
     
     def star_pitch(self) -> Optional[int]:
         """
         Returns None if no pitch in event
         """
-        return self.pitch_dict().get('Star Pitch')
+        return self._pitch.get('Star Pitch')
     
     def pitch_speed(self) -> Optional[int]:
         """
         Returns None if no pitch in event
         """
-        return self.pitch_dict().get('Pitch Speed')
+        return self._pitch.get('Pitch Speed')
     
     def ball_position_strikezone(self) -> Optional[float]:
         """
         Returns None if no pitch in event
         """
-        return self.pitch_dict().get('Ball Position - Strikezone')
+        return self._pitch.get('Ball Position - Strikezone')
     
     def in_strikezone(self) -> Optional[int]:
         """
         Returns None if no pitch in event
         """
-        return self.pitch_dict().get('In Strikezone')
+        return self._pitch.get('In Strikezone')
     
     def bat_contact_position_x(self) -> Optional[float]:
         """
         Returns None if no pitch in event
         """
-        return self.pitch_dict().get('Bat Contact Pos - X')
+        return self._pitch.get('Bat Contact Pos - X')
     
     def bat_contact_position_z(self) -> Optional[float]:
         """
         Returns None if no pitch in event
         """
-        return self.pitch_dict().get('Bat Contact Pos - Z')
+        return self._pitch.get('Bat Contact Pos - Z')
     
     def dickball(self) -> Optional[int]:
         """
         Returns None if no pitch in event
         """
-        return self.pitch_dict().get('DB')
+        return self._pitch.get('DB')
     
     def type_of_swing(self) -> Optional[str]:
         """
         Returns None if no pitch in event
         """
-        return self.pitch_dict().get('Type of Swing')
+        return self._pitch.get('Type of Swing')
 
     def contact_dict(self) -> dict:
         """
         Returns an empty dict if no contact in event
         """
-        return self.pitch_dict().get('Contact', {})
+        return self._contact
 
     def type_of_contact(self) -> Optional[str]:
         """
         Returns None if no contact in event
         """
-        return self.contact_dict().get('Type of Contact')
+        return self._contact.get('Type of Contact')
 
     def charge_power_up(self) -> Optional[int]:
         """
         Returns None if no contact in event
         """
-        return self.contact_dict().get('Charge Power Up')
+        return self._contact.get('Charge Power Up')
 
     def charge_power_down(self) -> Optional[int]:
         """
         Returns None if no contact in event
         """
-        return self.contact_dict().get('Charge Power Down')
+        return self._contact.get('Charge Power Down')
 
     def five_star_swing(self) -> Optional[int]:
         """
         Returns None if no contact in event
         """
-        return self.contact_dict().get('Star Swing Five-Star')
+        return self._contact.get('Star Swing Five-Star')
 
     def input_direction_push_or_pull(self) -> Optional[str]:
         """
         Returns None if no contact in event
         """
-        return self.contact_dict().get('Input Direction - Push/Pull')
+        return self._contact.get('Input Direction - Push/Pull')
 
     def stick_input_direction(self) -> Optional[str]:
         """
         Returns None if no contact in event
         """
-        return self.contact_dict().get('Input Direction - Stick')
+        return self._contact.get('Input Direction - Stick')
 
     def contact_frame(self) -> Optional[int]:
         """
         Returns None if no contact in event
         """
-        return self.safe_int(self.contact_dict().get('Frame of Swing Upon Contact'))
+        return self.safe_int(self._contact.get('Frame of Swing Upon Contact'))
 
     def ball_power(self) -> Optional[int]:
         """
         Returns None if no contact in event
         """
-        return self.safe_int(self.contact_dict().get('Ball Power'))
+        return self.safe_int(self._contact.get('Ball Power'))
 
     def vert_angle(self) -> Optional[int]:
         """
         Returns None if no contact in event.
         """
-        return self.safe_int(self.contact_dict().get('Vert Angle'))
+        return self.safe_int(self._contact.get('Vert Angle'))
 
     def horiz_angle(self) -> Optional[int]:
         """
         Returns None if no contact in event.
         """
-        return self.safe_int(self.contact_dict().get('Horiz Angle'))
+        return self.safe_int(self._contact.get('Horiz Angle'))
 
     def contact_absolute(self) -> Optional[float]:
         """
         Returns None if no contact in event.
         """
-        return self.contact_dict().get('Contact Absolute')
+        return self._contact.get('Contact Absolute')
 
     def contact_quality(self) -> Optional[float]:
         """
         Returns None if no contact in event.
         """
-        return self.contact_dict().get('Contact Quality')
+        return self._contact.get('Contact Quality')
 
     def rng(self) -> tuple[Optional[int], Optional[int], Optional[int]]:
         """
         Returns None if no contact in event.
         Returns a vector (rng1, rng2, rng3) of RNG components.
         """
-        rng1 = self.safe_int(self.contact_dict().get('RNG1'))
-        rng2 = self.safe_int(self.contact_dict().get('RNG2'))
-        rng3 = self.safe_int(self.contact_dict().get('RNG3'))
-        return (rng1, rng2, rng3)
+        contact, safe_int = self._contact, self.safe_int
+        return (safe_int(contact.get('RNG1')), safe_int(contact.get('RNG2')), safe_int(contact.get('RNG3')))
 
     def ball_velocity(self) -> tuple:
         """
         Returns None if no contact in event.
         Returns a vector (x, y, z) of ball velocity components.
         """
-        x = self.contact_dict().get('Ball Velocity - X')
-        y = self.contact_dict().get('Ball Velocity - Y')
-        z = self.contact_dict().get('Ball Velocity - Z')
-        return (x, y, z)
+        contact = self._contact
+        return (contact.get('Ball Velocity - X'), contact.get('Ball Velocity - Y'), contact.get('Ball Velocity - Z'))
 
     def ball_contact_position(self) -> tuple:
         """
         Returns None if no contact in event.
         Returns a vector (x, z) of ball contact position components.
         """
-        x = self.contact_dict().get('Ball Contact Pos - X')
-        z = self.contact_dict().get('Ball Contact Pos - Z')
-        return (x, z)
+        contact = self._contact
+        return (contact.get('Ball Contact Pos - X'), contact.get('Ball Contact Pos - Z'))
 
     def ball_landing_position(self) -> tuple:
         """
         Returns None if no contact in event.
         Returns a vector (x, y, z) of ball landing position components.
         """
-        x = self.contact_dict().get('Ball Landing Position - X')
-        y = self.contact_dict().get('Ball Landing Position - Y')
-        z = self.contact_dict().get('Ball Landing Position - Z')
-        return (x, y, z)
+        contact = self._contact
+        return (contact.get('Ball Landing Position - X'), contact.get('Ball Landing Position - Y'),
+                contact.get('Ball Landing Position - Z'))
 
     def ball_max_height(self) -> Optional[float]:
         """
         Returns None if no contact in event.
         """
-        return self.contact_dict().get('Ball Max Height')
+        return self._contact.get('Ball Max Height')
 
     def ball_hang_time(self) -> Optional[int]:
         """
         Returns None if no contact in event.
         """
-        return self.safe_int(self.contact_dict().get('Ball Hang Time'))
+        return self.safe_int(self._contact.get('Ball Hang Time'))
 
     def contact_result_primary(self) -> Optional[str]:
         """
         Returns None if no contact in event.
         """
-        return self.contact_dict().get('Contact Result - Primary')
+        return self._contact.get('Contact Result - Primary')
 
     def contact_result_secondary(self) -> Optional[str]:
         """
         Returns None if no contact in event.
         """
-        return self.contact_dict().get('Contact Result - Secondary')
+        return self._contact.get('Contact Result - Secondary')
 
     def first_fielder_dict(self) -> dict:
         """
         Returns an empty dict if no first fielder in event
         """
-        return self.contact_dict().get('First Fielder', {})
+        return self._fielder
     
     def first_fielder_roster_loc(self) -> Optional[int]:
         """
         Returns None if no first fielder in event.
         """
-        return self.first_fielder_dict().get('Fielder Roster Location')
+        return self._fielder.get('Fielder Roster Location')
 
     def first_fielder_position(self) -> Optional[str]:
         """
         Returns None if no first fielder in event.
         """
-        return self.first_fielder_dict().get('Fielder Position')
+        return self._fielder.get('Fielder Position')
 
     def first_fielder_character(self) -> Optional[str]:
         """
         Returns None if no first fielder in event.
         """
-        return self.first_fielder_dict().get('Fielder Character')
+        return self._fielder.get('Fielder Character')
 
     def first_fielder_action(self) -> Optional[str]:
         """
         Returns None if no first fielder in event.
         """
-        return self.first_fielder_dict().get('Fielder Action')
+        return self._fielder.get('Fielder Action')
 
     def first_fielder_jump(self) -> Optional[str]:
         """
         Returns None if no first fielder in event.
         """
-        return self.first_fielder_dict().get('Fielder Jump')
+        return self._fielder.get('Fielder Jump')
 
     def fielder_swap(self) -> Optional[str]:
         """
         Returns None if no first fielder in event.
         """
-        return self.first_fielder_dict().get('Fielder Swap')
+        return self._fielder.get('Fielder Swap')
 
     def first_fielder_maunual_selected(self) -> Optional[str]:
         """
         Returns None if no first fielder in event.
         """
-        return self.first_fielder_dict().get('Fielder Manual Selected')
+        return self._fielder.get('Fielder Manual Selected')
 
     def first_fielder_location(self) -> tuple:
         """
         Returns None if no first fielder in event.
         Returns a vector (x, y, z) of fielder position components.
         """
-        x = self.first_fielder_dict().get('Fielder Position - X')
-        y = self.first_fielder_dict().get('Fielder Position - Y')
-        z = self.first_fielder_dict().get('Fielder Position - Z')
-        return (x, y, z)
+        fielder = self._fielder
+        return (fielder.get('Fielder Position - X'), fielder.get('Fielder Position - Y'),
+                fielder.get('Fielder Position - Z'))
 
     def first_fielder_bobble(self) -> Optional[str]:
         """
         Returns None if no first fielder in event.
         """
-        return self.first_fielder_dict().get('Fielder Bobble')
+        return self._fielder.get('Fielder Bobble')
     
 
+def _diamond(positions) -> list:
+    # position-indexed roster slots, see HudObj.defensive_diamond
+    diamond = [None] * 9
+    for slot, position in enumerate(positions):
+        idx = LookupDicts.POSITION_INDEX.get(position)
+        if idx is not None:
+            diamond[idx] = slot
+    return diamond
+
+
 class HudObj:
     def __init__(self, hud_json: dict):
         self.hud_json = hud_json
         self.event_number = self.hud_json['Event Num']
+        # the raw values diff() compares, read once per snapshot
+        self._diff_state: Optional[dict] = None
 
     def event_integer(self) -> int:
         return int(str(self.event_number)[:-1])
@@ -1998,13 +2292,7 @@ class HudObj:
         the roster slot occupying it, or None if unfilled. Slots whose position
         is missing/"Inv"/"None" (e.g. a designated extra) are dropped.
         """
-        ro = self.roster_obj(teamNum)
-        diamond = [None] * 9
-        for slot in range(9):
-            idx = LookupDicts.POSITION_INDEX.get(ro.fielding_position(slot))
-            if idx is not None:
-                diamond[idx] = slot
-        return diamond
+        return _diamond(self.fielding_positions(teamNum))
 
     def logo(self, teamNum: int):
         """In-game team-banner name for the side (independent of roster)."""
@@ -2059,6 +2347,67 @@ class HudObj:
     def fielding_team(self):
         return abs(self.half_inning()-1)
 
+    def _slot_char(self, teamNum: int, rosterNum) -> Optional[str]:
+        if not isinstance(rosterNum, int) or not 0 <= rosterNum <= 8:
+            return None
+        slot = self.hud_json.get(self.team_roster_str(teamNum, rosterNum))
+        return slot.get('CharID') if slot else None
+
+    def _state(self) -> dict:
+        if self._diff_state is None:
+            hud = self.hud_json
+            batting, fielding = self.batting_team(), self.fielding_team()
+            runners = []
+            for base in (1, 2, 3):
+                runner = hud.get(f'Runner {base}B')
+                runners.append((runner.get('Runner Roster Loc'), runner.get('Runner Char Id'))
+                               if runner and isinstance(runner, dict) else None)
+            self._diff_state = {
+                'inning': (hud['Inning'], hud['Half Inning']),
+                'score': (hud['Away Score'], hud['Home Score']),
+                'count': (hud['Balls'], hud['Strikes'], hud['Outs']),
+                'runners': tuple(runners),
+                'batter': (batting, hud['Batter Roster Loc'],
+                           self._slot_char(batting, hud['Batter Roster Loc'])),
+                'pitcher': (fielding, hud['Pitcher Roster Loc'],
+                            self._slot_char(fielding, hud['Pitcher Roster Loc'])),
+                'inning_scores': (tuple(self.inning_scores(0)), tuple(self.inning_scores(1))),
+                # positions straight from the roster entries, no RosterObj
+                'positions': tuple(
+                    tuple((hud.get(self.team_roster_str(team, i)) or {}).get('Fielding Position')
+                          for i in range(9))
+                    for team in (0, 1)),
+            }
+        return self._diff_state
+
+    def diff(self, previous: Optional[HudObj]) -> dict:
+        """The fields that changed since the previous snapshot.
+
+        Keys are only present when their value changed (all of them when
+        previous is None):
+          'inning'            (inning, half inning)
+          'score'             (away, home)
+          'count'             (balls, strikes, outs)
+          'runners'           per base 1-3, (roster slot, char) or None
+          'batter'/'pitcher'  (team, roster slot, char)
+          'inning_scores'     (away, home) tuples of per-inning runs
+          'defensive_diamond' {team: diamond} for the teams whose fielding
+                              positions moved, see defensive_diamond()
+
+        Both snapshots' values are read once and kept, so diffing a stream of
+        snapshots reads each one once; no RosterObj is built.
+        """
+        state = self._state()
+        before = previous._state() if previous is not None else {}
+        changes = {key: value for key, value in state.items()
+                   if key != 'positions' and before.get(key) != value}
+        old_positions = before.get('positions', (None, None))
+        diamonds = {team: _diamond(positions) for team, positions in enumerate(state['positions'])
+                    if positions != old_positions[team]}
+        if diamonds:
+            changes['defensive_diamond'] = diamonds
+        return changes
+
     
 '''
     "Event Num": 50,
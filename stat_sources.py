@@ -0,0 +1,272 @@
+"""Stat files read straight from compressed files and archive bundles.
+
+Older seasons are archived compressed, and extracting them to disk before a
+directory job costs more I/O than the job itself. The directory loaders read
+them in place instead. A *source* is a string naming one stat file:
+
+    "stats/game.decoded.json"                      plain file
+    "stats/game.decoded.json.gz"                   gzip (also .json.zst)
+    "stats/2023.zip::2023/game.decoded.json"       member of a bundle
+
+Bundles are ``.zip``, ``.tar``, ``.tar.gz``/``.tgz`` and ``.tar.zst``; their
+members may themselves be ``.gz``/``.zst``. ``list_sources(directory)`` lists
+the decoded stat files of a directory with bundles expanded, and
+``StatObj.from_path`` reads any source, so everything built on
+parallel_loader works on archives unchanged.
+
+Zip files and plain tars allow random access: every worker process opens the
+bundle once and reads just its members, so loading parallelizes as it does
+for plain files. Compressed tars can only be read front to back; each process
+keeps one forward stream per bundle and members are listed in archive order,
+so a worker handed consecutive chunks decompresses the bundle about once.
+Handles are cached per process (never shared across a fork) and reopened when
+the bundle changes.
+
+``.zst`` needs the optional zstandard package (``pip install pyrio[zstd]``).
+Damaged archives and compressed data raise OSError, like an unreadable file.
+"""
+from __future__ import annotations
+
+import gzip
+import os
+import tarfile
+import zipfile
+import zlib
+from collections import OrderedDict
+from typing import Optional
+
+SEP = "::"
+
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.zst")
+_STREAM_SUFFIXES = (".tar.gz", ".tgz", ".tar.zst")
+_MAX_OPEN = 8
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("Reading .zst stat files requires the zstandard package. "
+                          "Install it with `pip install pyrio[zstd]`.") from None
+    return zstandard
+
+
+def split_source(source) -> tuple[str, Optional[str]]:
+    """``(file path, archive member or None)`` of a source."""
+    source = os.fspath(source)
+    if SEP in source:
+        archive, member = source.split(SEP, 1)
+        return archive, member
+    return source, None
+
+
+def is_plain(source) -> bool:
+    """True for an uncompressed file outside any bundle."""
+    path, member = split_source(source)
+    return member is None and not path.endswith(COMPRESSED_SUFFIXES)
+
+
+def is_archive(path) -> bool:
+    return os.fspath(path).lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def stat_name(source) -> str:
+    """The stat file's own name, without bundle or compression suffix."""
+    path, member = split_source(source)
+    name = os.path.basename(member if member is not None else path)
+    for suffix in COMPRESSED_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def _read_errors() -> tuple:
+    # what damaged archives or compressed data raise, surfaced as OSError
+    errors = (zipfile.BadZipFile, tarfile.TarError, EOFError, zlib.error)
+    try:
+        import zstandard
+    except ImportError:
+        return errors
+    return errors + (zstandard.ZstdError,)
+
+
+def _decompress(name: str, data: bytes) -> bytes:
+    if name.endswith(".gz"):
+        return gzip.decompress(data)
+    if name.endswith(".zst"):
+        return _zstd().ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+
+# ---------------------------------------------------------------- bundles
+
+class _Zip:
+    def __init__(self, path):
+        self._zip = zipfile.ZipFile(path)
+        self.members = {info.filename: info.file_size for info in self._zip.infolist() if not info.is_dir()}
+
+    def read(self, member: str) -> bytes:
+        return self._zip.read(member)
+
+    def close(self) -> None:
+        self._zip.close()
+
+
+class _Tar:
+    # uncompressed: the headers are indexed once, members are read in place
+    def __init__(self, path):
+        self._tar = tarfile.open(path, "r:")
+        self._infos = {info.name: info for info in self._tar.getmembers() if info.isfile()}
+        self.members = {name: info.size for name, info in self._infos.items()}
+
+    def read(self, member: str) -> bytes:
+        return self._tar.extractfile(self._infos[member]).read()
+
+    def close(self) -> None:
+        self._tar.close()
+
+
+class _TarStream:
+    # compressed: read front to back, reopened only to go backwards
+    def __init__(self, path):
+        self.path = path
+        self._fileobj = None
+        self._tar = None
+        self._position = -1
+        self.members = {}
+        self._order = {}
+        for info in self._stream():
+            if info.isfile():
+                self._order[info.name] = len(self.members)
+                self.members[info.name] = info.size
+        self._close_stream()
+
+    def _stream(self):
+        self._close_stream()
+        if self.path.lower().endswith(".zst"):
+            self._fileobj = _zstd().ZstdDecompressor().stream_reader(open(self.path, "rb"), closefd=True)
+            self._tar = tarfile.open(fileobj=self._fileobj, mode="r|")
+        else:
+            self._tar = tarfile.open(self.path, "r|*")
+        self._position = -1
+        return self._tar
+
+    def read(self, member: str) -> bytes:
+        target = self._order[member]
+        if self._tar is None or target <= self._position:
+            self._stream()
+        for info in self._tar:
+            if not info.isfile():
+                continue
+            self._position = self._order[info.name]
+            if info.name == member:
+                return self._tar.extractfile(info).read()
+        raise KeyError(member)
+
+    def _close_stream(self) -> None:
+        if self._tar is not None:
+            self._tar.close()
+        if self._fileobj is not None:
+            self._fileobj.close()
+        self._tar = self._fileobj = None
+
+    def close(self) -> None:
+        self._close_stream()
+
+
+_open_bundles: OrderedDict = OrderedDict()
+
+
+def _bundle(path: str):
+    st = os.stat(path)
+    key = (os.getpid(), os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    bundle = _open_bundles.get(key)
+    if bundle is not None:
+        _open_bundles.move_to_end(key)
+        return bundle
+
+    lower = path.lower()
+    try:
+        if lower.endswith(".zip"):
+            bundle = _Zip(path)
+        elif lower.endswith(_STREAM_SUFFIXES):
+            bundle = _TarStream(path)
+        else:
+            bundle = _Tar(path)
+    except _read_errors() as ex:
+        raise OSError(f"Can't read bundle {path}: {ex}") from ex
+
+    # drop handles inherited from a parent process (their file offsets are
+    # shared with it) and handles on an older version of this bundle
+    for stale in [k for k in _open_bundles if k[0] != key[0] or k[1] == key[1]]:
+        del _open_bundles[stale]
+    _open_bundles[key] = bundle
+    while len(_open_bundles) > _MAX_OPEN:
+        _open_bundles.popitem(last=False)[1].close()
+    return bundle
+
+
+# ---------------------------------------------------------------- sources
+
+def read_source(source) -> bytes:
+    """The decompressed bytes of a stat file source."""
+    path, member = split_source(source)
+    try:
+        if member is None:
+            with open(path, "rb") as f:
+                return _decompress(path, f.read())
+        try:
+            data = _bundle(path).read(member)
+        except KeyError:
+            raise FileNotFoundError(f"No member {member!r} in {path}") from None
+        return _decompress(member, data)
+    except _read_errors() as ex:
+        raise OSError(f"Can't read {source}: {ex}") from ex
+
+
+def source_stat(source) -> tuple[int, int]:
+    """``(size, mtime_ns)``; an archive member has its own size and the bundle's mtime."""
+    path, member = split_source(source)
+    st = os.stat(path)
+    if member is None:
+        return st.st_size, st.st_mtime_ns
+    try:
+        return _bundle(path).members[member], st.st_mtime_ns
+    except KeyError:
+        raise FileNotFoundError(f"No member {member!r} in {path}") from None
+
+
+def source_exists(source) -> bool:
+    try:
+        source_stat(source)
+    except OSError:
+        return False
+    return True
+
+
+def list_sources(directory) -> list[str]:
+    """The decoded stat files of a directory, with bundles expanded.
+
+    Plain and compressed files are taken when their name contains "decoded",
+    in sorted order; a bundle (whatever its name) contributes its members
+    whose file name contains "decoded", in archive order.
+    """
+    sources = []
+    for filename in sorted(os.listdir(directory)):
+        path = os.path.join(directory, filename)
+        if not os.path.isfile(path):
+            continue
+        if is_archive(filename):
+            try:
+                members = _bundle(path).members
+            except OSError:
+                # not a bundle after all; a decoded file is left to the loader to report
+                if "decoded" in filename:
+                    sources.append(path)
+                continue
+            sources.extend(f"{path}{SEP}{member}" for member in members
+                           if "decoded" in os.path.basename(member))
+        elif "decoded" in filename:
+            sources.append(path)
+    return sources
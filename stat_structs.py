@@ -0,0 +1,214 @@
+"""Typed, slotted structs for decoded stat files (requires msgspec).
+
+``decode_stat_file`` decodes a stat file's JSON straight into these structs,
+validating field types as it goes and skipping the intermediate dicts:
+
+    from pyrio.stat_structs import decode_stat_file
+    game = decode_stat_file(open("decoded.json", "rb").read())
+    game.events[3].pitch.contact.first_fielder.fielder_character
+
+Attribute names are the snake_case form of the stat-file keys. Categorical
+fields are ``int | str`` because encoded files store the LookupDicts code and
+decoded files store the label; numbers that Rio writes comma-grouped
+("1,722") are ``int | str`` for the same reason. Unknown keys are ignored, and
+sections missing from an event (no pitch, no contact, ...) are None.
+
+StatObj and EventSearch work on the plain dicts; these structs are for
+analysis code that wants attribute access and a smaller memory footprint.
+"""
+from __future__ import annotations
+
+from typing import Any, Optional, Union
+
+import msgspec
+
+Code = Union[int, str]
+
+
+class Runner(msgspec.Struct, rename={
+    "roster_loc": "Runner Roster Loc", "char_id": "Runner Char Id",
+    "initial_base": "Runner Initial Base", "out_type": "Out Type",
+    "out_location": "Out Location", "steal": "Steal", "result_base": "Runner Result Base",
+}):
+    roster_loc: Optional[int] = None
+    char_id: Optional[Code] = None
+    initial_base: Optional[int] = None
+    out_type: Optional[Code] = None
+    out_location: Optional[int] = None
+    steal: Optional[Code] = None
+    result_base: Optional[int] = None
+
+
+class FirstFielder(msgspec.Struct, rename={
+    "fielder_roster_location": "Fielder Roster Location", "fielder_position": "Fielder Position",
+    "fielder_character": "Fielder Character", "fielder_action": "Fielder Action",
+    "fielder_jump": "Fielder Jump", "fielder_swap": "Fielder Swap",
+    "fielder_manual_selected": "Fielder Manual Selected",
+    "fielder_position_x": "Fielder Position - X", "fielder_position_y": "Fielder Position - Y",
+    "fielder_position_z": "Fielder Position - Z", "fielder_bobble": "Fielder Bobble",
+}):
+    fielder_roster_location: Optional[int] = None
+    fielder_position: Optional[Code] = None
+    fielder_character: Optional[Code] = None
+    fielder_action: Optional[Code] = None
+    fielder_jump: Optional[Code] = None
+    fielder_swap: Optional[int] = None
+    fielder_manual_selected: Optional[Code] = None
+    fielder_position_x: Optional[float] = None
+    fielder_position_y: Optional[float] = None
+    fielder_position_z: Optional[float] = None
+    fielder_bobble: Optional[Code] = None
+
+
+class Contact(msgspec.Struct, rename={
+    "type_of_contact": "Type of Contact", "charge_power_up": "Charge Power Up",
+    "charge_power_down": "Charge Power Down", "star_swing_five_star": "Star Swing Five-Star",
+    "input_direction_push_pull": "Input Direction - Push/Pull",
+    "input_direction_stick": "Input Direction - Stick",
+    "frame_of_swing_upon_contact": "Frame of Swing Upon Contact",
+    "ball_power": "Ball Power", "vert_angle": "Vert Angle", "horiz_angle": "Horiz Angle",
+    "contact_absolute": "Contact Absolute", "contact_quality": "Contact Quality",
+    "rng1": "RNG1", "rng2": "RNG2", "rng3": "RNG3",
+    "ball_velocity_x": "Ball Velocity - X", "ball_velocity_y": "Ball Velocity - Y",
+    "ball_velocity_z": "Ball Velocity - Z",
+    "ball_contact_pos_x": "Ball Contact Pos - X", "ball_contact_pos_z": "Ball Contact Pos - Z",
+    "ball_landing_position_x": "Ball Landing Position - X",
+    "ball_landing_position_y": "Ball Landing Position - Y",
+    "ball_landing_position_z": "Ball Landing Position - Z",
+    "ball_max_height": "Ball Max Height", "ball_hang_time": "Ball Hang Time",
+    "contact_result_primary": "Contact Result - Primary",
+    "contact_result_secondary": "Contact Result - Secondary",
+    "first_fielder": "First Fielder",
+}):
+    type_of_contact: Optional[Code] = None
+    charge_power_up: Optional[float] = None
+    charge_power_down: Optional[float] = None
+    star_swing_five_star: Optional[int] = None
+    input_direction_push_pull: Optional[Code] = None
+    input_direction_stick: Optional[Code] = None
+    frame_of_swing_upon_contact: Optional[Code] = None
+    ball_power: Optional[Code] = None
+    vert_angle: Optional[Code] = None
+    horiz_angle: Optional[Code] = None
+    contact_absolute: Optional[float] = None
+    contact_quality: Optional[float] = None
+    rng1: Optional[Code] = None
+    rng2: Optional[Code] = None
+    rng3: Optional[Code] = None
+    ball_velocity_x: Optional[float] = None
+    ball_velocity_y: Optional[float] = None
+    ball_velocity_z: Optional[float] = None
+    ball_contact_pos_x: Optional[float] = None
+    ball_contact_pos_z: Optional[float] = None
+    ball_landing_position_x: Optional[float] = None
+    ball_landing_position_y: Optional[float] = None
+    ball_landing_position_z: Optional[float] = None
+    ball_max_height: Optional[float] = None
+    ball_hang_time: Optional[Code] = None
+    contact_result_primary: Optional[Code] = None
+    contact_result_secondary: Optional[Code] = None
+    first_fielder: Optional[FirstFielder] = None
+
+
+class Pitch(msgspec.Struct, rename={
+    "pitcher_team_id": "Pitcher Team Id", "pitcher_char_id": "Pitcher Char Id",
+    "pitch_type": "Pitch Type", "charge_type": "Charge Type", "star_pitch": "Star Pitch",
+    "pitch_speed": "Pitch Speed", "ball_position_strikezone": "Ball Position - Strikezone",
+    "in_strikezone": "In Strikezone", "bat_contact_pos_x": "Bat Contact Pos - X",
+    "bat_contact_pos_z": "Bat Contact Pos - Z", "db": "DB", "type_of_swing": "Type of Swing",
+    "contact": "Contact",
+}):
+    pitcher_team_id: Optional[int] = None
+    pitcher_char_id: Optional[Code] = None
+    pitch_type: Optional[Code] = None
+    charge_type: Optional[Code] = None
+    star_pitch: Optional[int] = None
+    pitch_speed: Optional[float] = None
+    ball_position_strikezone: Optional[float] = None
+    in_strikezone: Optional[int] = None
+    bat_contact_pos_x: Optional[float] = None
+    bat_contact_pos_z: Optional[float] = None
+    db: Optional[int] = None
+    type_of_swing: Optional[Code] = None
+    contact: Optional[Contact] = None
+
+
+class Event(msgspec.Struct, rename={
+    "event_num": "Event Num", "inning": "Inning", "half_inning": "Half Inning",
+    "away_score": "Away Score", "home_score": "Home Score", "balls": "Balls",
+    "strikes": "Strikes", "outs": "Outs", "star_chance": "Star Chance",
+    "away_stars": "Away Stars", "home_stars": "Home Stars",
+    "pitcher_stamina": "Pitcher Stamina", "chemistry_links_on_base": "Chemistry Links on Base",
+    "pitcher_roster_loc": "Pitcher Roster Loc", "batter_roster_loc": "Batter Roster Loc",
+    "catcher_roster_loc": "Catcher Roster Loc", "rbi": "RBI",
+    "num_outs_during_play": "Num Outs During Play", "result_of_ab": "Result of AB",
+    "runner_batter": "Runner Batter", "runner_1b": "Runner 1B", "runner_2b": "Runner 2B",
+    "runner_3b": "Runner 3B", "pitch": "Pitch",
+}):
+    event_num: int
+    inning: int
+    half_inning: int
+    away_score: int
+    home_score: int
+    balls: int
+    strikes: int
+    outs: int
+    star_chance: int = 0
+    away_stars: int = 0
+    home_stars: int = 0
+    pitcher_stamina: int = 0
+    chemistry_links_on_base: int = 0
+    pitcher_roster_loc: int = 0
+    batter_roster_loc: int = 0
+    catcher_roster_loc: int = 0
+    rbi: int = 0
+    num_outs_during_play: int = 0
+    result_of_ab: Code = "None"
+    runner_batter: Optional[Runner] = None
+    runner_1b: Optional[Runner] = None
+    runner_2b: Optional[Runner] = None
+    runner_3b: Optional[Runner] = None
+    pitch: Optional[Pitch] = None
+
+
+class StatFile(msgspec.Struct, rename={
+    "game_id": "GameID", "date_start": "Date - Start", "date_end": "Date - End",
+    "version": "Version", "tag_set_id": "TagSetID", "stadium_id": "StadiumID",
+    "away_player": "Away Player", "home_player": "Home Player",
+    "away_score": "Away Score", "home_score": "Home Score",
+    "innings_selected": "Innings Selected", "innings_played": "Innings Played",
+    "quitter_team": "Quitter Team", "average_ping": "Average Ping",
+    "lag_spikes": "Lag Spikes", "character_game_stats": "Character Game Stats",
+    "events": "Events",
+}):
+    game_id: str
+    away_player: str
+    home_player: str
+    away_score: int
+    home_score: int
+    date_start: Optional[str] = None
+    date_end: Optional[str] = None
+    version: str = "Pre 0.1.7"
+    tag_set_id: Optional[int] = None
+    stadium_id: Optional[Code] = None
+    innings_selected: Optional[int] = None
+    innings_played: Optional[int] = None
+    quitter_team: Optional[Code] = None
+    average_ping: Optional[int] = None
+    lag_spikes: Optional[int] = None
+    character_game_stats: dict[str, Any] = {}
+    events: list[Event] = []
+
+
+_decoder = msgspec.json.Decoder(StatFile)
+_events_decoder = msgspec.json.Decoder(list[Event])
+
+
+def decode_stat_file(data) -> StatFile:
+    """Decodes stat-file JSON (str or bytes) into a StatFile."""
+    return _decoder.decode(data)
+
+
+def decode_events(data) -> list[Event]:
+    """Decodes a JSON Events array (str or bytes) into a list of Events."""
+    return _events_decoder.decode(data)
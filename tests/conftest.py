@@ -1,5 +1,264 @@
-"""pyrio's package_dir is the repo root, so put it on sys.path for tests."""
+"""pyrio's package_dir is the repo root, so put it on sys.path for tests.
+
+Modules that use package-relative imports (stat_file_parser, pitch_csv, ...)
+are imported as ``pyrio.<module>``; the repo root is registered under that
+name here so the tests don't need an installed copy.
+"""
+import copy
+import importlib.util
 import os
 import sys
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _ROOT)
+
+if "pyrio" not in sys.modules:
+    _spec = importlib.util.spec_from_file_location(
+        "pyrio", os.path.join(_ROOT, "__init__.py"), submodule_search_locations=[_ROOT])
+    _pyrio = importlib.util.module_from_spec(_spec)
+    sys.modules["pyrio"] = _pyrio
+    _spec.loader.exec_module(_pyrio)
+
+
+# --- synthetic stat file ------------------------------------------------
+#
+# A small but structurally complete decoded stat file: 18 roster slots and a
+# handful of events covering no-pitch, pitch-only, contact and fielded plays.
+
+AWAY_CHARS = ["Mario", "Luigi", "Peach", "Daisy", "Yoshi", "Wario", "Boo", "Birdo", "Toad(R)"]
+HOME_CHARS = ["Bowser", "Bowser Jr", "DK", "Diddy", "Waluigi", "Dixie", "Petey", "King Boo", "Monty"]
+
+_OFFENSIVE_KEYS = ["At Bats", "Hits", "Singles", "Doubles", "Triples", "Homeruns",
+                   "Successful Bunts", "Sac Flys", "Strikeouts", "Walks (4 Balls)",
+                   "Walks (Hit)", "RBI", "Bases Stolen", "Star Hits"]
+_DEFENSIVE_KEYS = ["Batters Faced", "Runs Allowed", "Batters Walked", "Batters Hit",
+                   "Hits Allowed", "HRs Allowed", "Pitches Thrown", "Stamina",
+                   "Was Pitcher", "Strikeouts", "Star Pitches Thrown", "Big Plays",
+                   "Outs Pitched"]
+
+
+def _character(char_id, team, slot):
+    # Deterministic, slot-dependent numbers so totals are easy to check.
+    offense = {k: (slot + i + team) % 4 for i, k in enumerate(_OFFENSIVE_KEYS)}
+    offense["At Bats"] = 3 + slot % 2
+    offense["Hits"] = offense["Singles"] + offense["Doubles"] + offense["Triples"] + offense["Homeruns"]
+    defense = {k: 0 for k in _DEFENSIVE_KEYS}
+    if slot == 0:
+        defense.update({"Batters Faced": 20 + team, "Runs Allowed": 3 + team, "Batters Walked": 2,
+                        "Batters Hit": 1, "Hits Allowed": 6, "HRs Allowed": 1,
+                        "Pitches Thrown": 80 + team, "Stamina": 4, "Was Pitcher": 1,
+                        "Strikeouts": 5, "Star Pitches Thrown": 2, "Outs Pitched": 15})
+    elif slot == 1:
+        defense.update({"Batters Faced": 4, "Runs Allowed": 1, "Pitches Thrown": 12,
+                        "Stamina": 9, "Was Pitcher": 1, "Outs Pitched": 3, "Big Plays": 1})
+    defense["Pitches Per Position"] = [{"P": defense["Pitches Thrown"]}]
+    defense["Outs Per Position"] = [{"P": defense["Outs Pitched"]}]
+    return {
+        "CharID": char_id,
+        "Superstar": 1 if slot == 2 else 0,
+        "Captain": 1 if slot == 0 else 0,
+        "Fielding Hand": slot % 2,
+        "Batting Hand": (slot + 1) % 2,
+        "Fielding Position": ["P", "C", "1B", "2B", "3B", "SS", "LF", "CF", "RF"][slot],
+        "Offensive Stats": offense,
+        "Defensive Stats": defense,
+    }
+
+
+def _runner(loc, char, base, steal="None"):
+    return {"Runner Roster Loc": loc, "Runner Char Id": char, "Runner Initial Base": base,
+            "Out Type": "None", "Out Location": 0, "Steal": steal, "Runner Result Base": base}
+
+
+def _event(num, inning, half, away, home, balls, strikes, outs, batter, pitcher,
+           result="None", rbi=0, pitch=None, **extra):
+    ev = {
+        "Event Num": num, "Inning": inning, "Half Inning": half,
+        "Away Score": away, "Home Score": home, "Balls": balls, "Strikes": strikes,
+        "Outs": outs, "Star Chance": extra.pop("star_chance", 0),
+        "Away Stars": 1, "Home Stars": 2, "Pitcher Stamina": extra.pop("stamina", 10),
+        "Chemistry Links on Base": extra.pop("chem", 0),
+        "Pitcher Roster Loc": pitcher, "Batter Roster Loc": batter, "Catcher Roster Loc": 1,
+        "RBI": rbi, "Num Outs During Play": extra.pop("outs_during", 0), "Result of AB": result,
+        "Runner Batter": _runner(batter, "?", 0),
+    }
+    ev.update(extra)
+    if pitch is not None:
+        ev["Pitch"] = pitch
+    return ev
+
+
+def _pitch(pitch_type="Curve", charge="N/A", swing="None", zone=1, x=0.25, contact=None, star=0):
+    p = {"Pitcher Team Id": 0, "Pitcher Char Id": "?", "Pitch Type": pitch_type,
+         "Charge Type": charge, "Star Pitch": star, "Pitch Speed": 150,
+         "Ball Position - Strikezone": x, "In Strikezone": zone,
+         "Bat Contact Pos - X": -0.1, "Bat Contact Pos - Z": 1.5, "DB": 0,
+         "Type of Swing": swing}
+    if contact is not None:
+        p["Contact"] = contact
+    return p
+
+
+def _contact(kind="Nice - Right", frame="2", primary="Fair", secondary="Single",
+             fielder=None, five_star=0):
+    c = {"Type of Contact": kind, "Charge Power Up": 0, "Charge Power Down": 0,
+         "Star Swing Five-Star": five_star, "Input Direction - Push/Pull": "Towards Batter",
+         "Input Direction - Stick": "Right", "Frame of Swing Upon Contact": frame,
+         "Ball Power": "139", "Vert Angle": "158", "Horiz Angle": "1,722",
+         "Contact Absolute": 109.703, "Contact Quality": 0.988479,
+         "RNG1": "4,552", "RNG2": "5,350", "RNG3": "183",
+         "Ball Velocity - X": -0.592068, "Ball Velocity - Y": 0.166802,
+         "Ball Velocity - Z": 0.323508, "Ball Contact Pos - X": -0.216502,
+         "Ball Contact Pos - Z": 1.5, "Ball Landing Position - X": -45.4675,
+         "Ball Landing Position - Y": 0.176705, "Ball Landing Position - Z": 17.4371,
+         "Ball Max Height": 4.23982, "Ball Hang Time": "89",
+         "Contact Result - Primary": primary, "Contact Result - Secondary": secondary}
+    if fielder is not None:
+        c["First Fielder"] = fielder
+    return c
+
+
+def _fielder(loc=6, pos="LF", char="Petey", action="None", bobble="None", manual="No Selected Char"):
+    return {"Fielder Roster Location": loc, "Fielder Position": pos, "Fielder Character": char,
+            "Fielder Action": action, "Fielder Jump": "None", "Fielder Swap": 0,
+            "Fielder Manual Selected": manual, "Fielder Position - X": -40.0,
+            "Fielder Position - Y": 0.0, "Fielder Position - Z": 20.0, "Fielder Bobble": bobble}
+
+
+def build_stat_json(version="1.9.5"):
+    old_structure = version in ("Pre 0.1.7", "0.1.7a", "0.1.8", "0.1.9", "1.9.1",
+                                "1.9.2", "1.9.3", "1.9.4")
+    flipped = version in ("Pre 0.1.7", "0.1.7a", "0.1.8", "0.1.9", "1.9.1")
+    chars = {}
+    for team, names in ((0, AWAY_CHARS), (1, HOME_CHARS)):
+        # On flipped versions team 0 in the file is the home side.
+        file_team = 1 - team if flipped else team
+        for slot, name in enumerate(names):
+            key = (f"Team {file_team} Roster {slot}" if old_structure
+                   else f"{'Away' if file_team == 0 else 'Home'} Roster {slot}")
+            chars[key] = _character(name, team, slot)
+
+    events = [
+        # 0: first pitch of the game, ball outside
+        _event(0, 1, 0, 0, 0, 0, 0, 0, batter=0, pitcher=0,
+               pitch=_pitch("Curve", zone=0, x=0.61)),
+        # 1: charge slider, swing and miss... recorded as a strike (no contact dict)
+        _event(1, 1, 0, 0, 0, 1, 0, 0, batter=0, pitcher=0,
+               pitch=_pitch("Charge", charge="Slider", swing="Slap", x=-0.12)),
+        # 2: single to left, fielded by the LF
+        _event(2, 1, 0, 0, 0, 1, 1, 0, batter=0, pitcher=0, result="Single",
+               pitch=_pitch("ChangeUp", swing="Charge", x=0.05,
+                            contact=_contact(fielder=_fielder()))),
+        # 3: runner on 1st stealing, perfect contact double, RBI
+        _event(3, 1, 0, 0, 0, 0, 0, 0, batter=1, pitcher=0, result="Double", rbi=1,
+               chem=1, **{"Runner 1B": _runner(0, "Mario", 1, steal="Normal")},
+               pitch=_pitch("Charge", charge="Perfect", swing="Star", x=-0.33,
+                            contact=_contact("Perfect", frame="3", secondary="Double",
+                                             fielder=_fielder(7, "CF", "King Boo",
+                                                              action="Sliding",
+                                                              bobble="Bobble")))),
+        # 4: no pitch recorded (e.g. pickoff / pause)
+        _event(4, 1, 0, 1, 0, 0, 0, 0, batter=2, pitcher=0,
+               **{"Runner 2B": _runner(1, "Luigi", 2)}),
+        # 5: bottom 1st, star chance, sour contact caught for an out
+        _event(5, 1, 1, 1, 0, 2, 2, 0, batter=0, pitcher=0, result="Caught", star_chance=1,
+               outs_during=1, stamina=9,
+               pitch=_pitch("Curve", swing="Slap", x=0.48, star=1,
+                            contact=_contact("Sour - Left", frame="1", primary="Out",
+                                             secondary="Out-caught",
+                                             fielder=_fielder(4, "3B", "Yoshi",
+                                                              manual="Pitcher")))),
+        # 6: 2nd inning, home batter homers (lead change), foul-less walk-off
+        _event(6, 2, 1, 1, 0, 3, 2, 1, batter=1, pitcher=1, result="HR", rbi=2, stamina=7,
+               **{"Runner 3B": _runner(0, "Bowser", 3)},
+               pitch=_pitch("Charge", charge="Slider", swing="Charge", x=0.0,
+                            contact=_contact("Nice - Left", frame="2", secondary="HR",
+                                             five_star=1))),
+    ]
+
+    return {
+        "GameID": "1A,2B3C",
+        "Date - Start": "Sat Mar 01 20:00:00 2025",
+        "Date - End": "Sat Mar 01 20:30:00 2025",
+        "Version": version,
+        "TagSetID": 7,
+        "StadiumID": "Peach's Garden",
+        "Away Player": "AwayUser",
+        "Home Player": "HomeUser",
+        "Away Score": 1,
+        "Home Score": 2,
+        "Innings Selected": 3,
+        "Innings Played": 2,
+        "Quitter Team": "",
+        "Average Ping": 12,
+        "Lag Spikes": 0,
+        "Character Game Stats": chars,
+        "Events": events,
+    }
+
+
+def build_game(game_id, version="1.9.5", **header):
+    """StatObj of the synthetic game under another GameID (and header fields).
+
+    Header keys with spaces go through a dict: ``build_game("B2", **{"Away Player": "x"})``.
+    """
+    from pyrio.stat_file_parser import StatObj
+    stat_json = build_stat_json(version)
+    stat_json.update({"GameID": game_id, **header})
+    return StatObj(stat_json)
+
+
+@pytest.fixture
+def stat_json():
+    return build_stat_json()
+
+
+@pytest.fixture
+def stat(stat_json):
+    from pyrio.stat_file_parser import StatObj
+    return StatObj(copy.deepcopy(stat_json))
+
+
+# --- synthetic HUD file -------------------------------------------------
+#
+# The live HUD JSON Rio rewrites after every pitch: the game state plus both
+# rosters (with fielding positions) and the current runners.
+
+def build_hud_json(event_num="50a"):
+    hud = {
+        "GameID": "1A,2B3C",
+        "StadiumID": "Peach's Garden",
+        "Away Player": "AwayUser",
+        "Home Player": "HomeUser",
+        "Event Num": event_num,
+        "Inning": 3,
+        "Half Inning": 1,
+        "Away Score": 0,
+        "Home Score": 1,
+        "Away Inning Scores": [0, 0, 0],
+        "Home Inning Scores": [1, 0],
+        "Balls": 0,
+        "Strikes": 1,
+        "Outs": 1,
+        "Star Chance": 0,
+        "Away Stars": 0,
+        "Home Stars": 0,
+        "Pitcher Stamina": 9,
+        "Chemistry Links on Base": 0,
+        "Pitcher Roster Loc": 0,
+        "Batter Roster Loc": 2,
+        "Num Outs During Play": 0,
+        "Result of AB": "None",
+        "Runner 1B": _runner(1, "Bowser Jr", 1),
+    }
+    for team, (side, chars) in enumerate((("Away", AWAY_CHARS), ("Home", HOME_CHARS))):
+        for slot, char in enumerate(chars):
+            hud[f"{side} Roster {slot}"] = _character(char, team, slot)
+    return hud
+
+
+@pytest.fixture
+def hud_json():
+    return build_hud_json()
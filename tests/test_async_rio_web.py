@@ -0,0 +1,252 @@
+"""AsyncRioWeb: RioWeb's answers, fetched concurrently.
+
+Against a local stand-in for the API, every coroutine must send the query
+RioWeb sends and return the same frame, no more than max_concurrency
+requests may be in flight at once, and HTTP errors must raise the same
+exceptions. A split pull must return exactly the rows of the unsplit one.
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from pyrio.async_rio_web import AsyncRioWeb, _Chunker  # noqa: E402
+from pyrio.exceptions import RioAPIError, RioAuthError, RioNotFoundError  # noqa: E402
+from pyrio.rio_web import RioWeb  # noqa: E402
+
+
+def _events(query):
+    # game g starts at 1000 * g; a time window selects from games 1-20
+    games = [int(g) for g in query.get("games", [])] or [1, 2]
+    if "end_time" in query:
+        start, end = int(query["start_time"][0]), int(query["end_time"][0])
+        games = [g for g in range(1, 21) if start <= 1000 * g <= end]
+    return [{"game_id": g, "event_num": n, "strikes": n % 3} for g in games for n in range(3)]
+
+
+ROUTES = {
+    "/events/": lambda q: {"Events": _events(q)},
+    "/landing_data/": lambda q: {"Data": _events(q)},
+    "/star_chances/": lambda q: {"Star Chances": _events(q)},
+    "/stats/": lambda q: {"Stats": {"Mario": {"Batting": {"hits": 3}}, "Luigi": {"Batting": {"hits": 1}}}},
+    "/games/": lambda q: {"games": [{"game_id": 1, "home_score": 3, "away_score": 1, "home_user": "a",
+                                     "away_user": "b", "date_time_start": 1700000000,
+                                     "date_time_end": 1700001000, "game_mode": 5, "stadium": 0}]},
+}
+
+
+class StandIn:
+    """Threaded stand-in API server that records queries and in-flight requests."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.max_games = None
+        self.queries = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def handle(self, handler, method):
+        url = urlsplit(handler.path)
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.queries.append((url.path, sorted(parse_qsl(url.query))))
+        try:
+            time.sleep(self.delay)
+            query = {}
+            for key, value in parse_qsl(url.query):
+                query.setdefault(key, []).append(value)
+            if method == "POST":
+                status, body = 200, {"Tag Sets": [{"name": "Ranked", "id": 5}]}
+            elif url.path == "/private/":
+                status, body = 401, {"description": "bad key"}
+            elif self.max_games is not None and len(query.get("games", [])) > self.max_games:
+                status, body = 504, {"description": "gateway timeout"}
+            elif url.path in ROUTES:
+                status, body = 200, ROUTES[url.path](query)
+            else:
+                status, body = 404, {"description": "no such endpoint"}
+            data = json.dumps(body).encode()
+            handler.send_response(status)
+            handler.send_header("Content-Type", "application/json")
+            handler.send_header("Content-Length", str(len(data)))
+            handler.end_headers()
+            handler.wfile.write(data)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def api(tmp_path):
+    stand_in = StandIn()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            stand_in.handle(self, "GET")
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            stand_in.handle(self, "POST")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.02}, daemon=True)
+    thread.start()
+    stand_in.url = f"http://127.0.0.1:{server.server_port}"
+    stand_in.cache_dir = str(tmp_path / "cache")
+    yield stand_in
+    server.shutdown()
+    server.server_close()
+
+
+def _clients(api, **kw):
+    return (RioWeb(rio_key="k", base_url=api.url, cache_dir=api.cache_dir),
+            AsyncRioWeb(rio_key="k", base_url=api.url, cache_dir=api.cache_dir, **kw))
+
+
+@pytest.mark.parametrize("method, kwargs", [
+    ("get_events", {"games": [3, 4], "strikes": [2], "limit_events": True}),
+    ("get_landing_data", {"tag": ["Ranked", "Netplay"], "start_time": 10}),
+    ("get_star_chances", {"games": [7]}),
+    ("get_stats", {"by_char": True}),
+    ("get_games", {"tag": ["Ranked"], "limit_games": 5}),
+])
+def test_same_query_and_frame_as_rio_web(api, method, kwargs):
+    sync, client = _clients(api)
+    expected = getattr(sync, method)(**kwargs)
+    sync_queries = list(api.queries)
+    api.queries.clear()
+
+    async def main():
+        async with client:
+            return await getattr(client, method)(**kwargs), await getattr(client, method)(raw=True, **kwargs)
+    frame, raw = asyncio.run(main())
+    pd.testing.assert_frame_equal(frame, expected)
+    assert isinstance(raw, dict)
+    # the async client reuses the game-mode cache file the sync one filled
+    assert [q for q in api.queries if q[0] != "/tag_set/list"][0] == \
+        [q for q in sync_queries if q[0] != "/tag_set/list"][0]
+
+
+def test_concurrency_is_capped(api):
+    api.delay = 0.05
+    _, client = _clients(api, max_concurrency=3)
+
+    async def main():
+        async with client:
+            return await asyncio.gather(*(client.get_events(games=[g]) for g in range(12)))
+    frames = asyncio.run(main())
+    assert [frame["game_id"].iloc[0] for frame in frames] == list(range(12))
+    assert api.max_in_flight == 3
+
+
+def test_http_errors_raise_rio_exceptions(api):
+    _, client = _clients(api)
+
+    async def main(endpoint):
+        async with client:
+            await client._get(endpoint)
+    with pytest.raises(RioNotFoundError, match="no such endpoint"):
+        asyncio.run(main("/nowhere/"))
+    with pytest.raises(RioAuthError):
+        asyncio.run(main("/private/"))
+
+
+# --- split pulls ---
+
+def _split(client, method, **kwargs):
+    async def main():
+        async with client:
+            return await getattr(client, method)(**kwargs)
+    return asyncio.run(main())
+
+
+def _pieces(api, path="/events/"):
+    return [[int(v) for k, v in query if k == "games"] for p, query in api.queries if p == path]
+
+
+@pytest.mark.parametrize("method", ["get_events", "get_landing_data"])
+def test_split_by_games_matches_one_request(api, method):
+    sync, client = _clients(api, max_concurrency=2)
+    games = list(range(1, 21))
+    expected = getattr(sync, method)(games=games)
+    api.queries.clear()
+
+    frame = _split(client, method, games=games, split="games", chunk_size=3)
+    pd.testing.assert_frame_equal(frame, expected)
+    # pieces run concurrently, so they may reach the server in any order
+    pieces = _pieces(api, "/events/" if method == "get_events" else "/landing_data/")
+    assert len(pieces) > 1 and [1, 2, 3] in pieces
+    assert sorted(g for piece in pieces for g in piece) == games
+
+
+def test_split_by_time_uses_inclusive_windows_that_dont_overlap(api):
+    sync, client = _clients(api)
+    expected = sync.get_landing_data(start_time=0, end_time=20000)
+    api.queries.clear()
+    frame = _split(client, "get_landing_data", start_time=0, end_time=20000, split="time", chunk_size=1000)
+    pd.testing.assert_frame_equal(frame, expected)
+    assert frame["game_id"].nunique() == 20 == len(frame) // 3
+
+    windows = sorted((int(query["start_time"]), int(query["end_time"]))
+                     for query in (dict(q) for _, q in api.queries))
+    assert windows[0][0] == 0 and windows[-1][1] == 20000
+    assert all(prev_end + 1 == start for (_, prev_end), (start, _) in zip(windows, windows[1:]))
+
+    raw = _split(AsyncRioWeb(rio_key="k", base_url=api.url), "get_landing_data",
+                 start_time=0, end_time=20000, raw=True, split="time", chunk_size=1000)
+    assert raw["Data"] == expected.to_dict("records")
+
+
+def test_split_halves_pieces_the_server_times_out(api):
+    api.max_games = 2
+    _, client = _clients(api)
+    frame = _split(client, "get_events", games=list(range(1, 11)), split="games", chunk_size=8)
+    assert frame["game_id"].unique().tolist() == list(range(1, 11))
+    assert max(len(piece) for piece in _pieces(api)) == 8
+
+    api.max_games = 0
+    with pytest.raises(RioAPIError, match="504"):
+        _split(AsyncRioWeb(rio_key="k", base_url=api.url), "get_events", games=[1, 2], split="games")
+
+
+def test_split_through_rio_web(api):
+    sync, _ = _clients(api)
+    games = list(range(1, 8))
+    expected = sync.get_events(games=games)
+    pd.testing.assert_frame_equal(sync.get_events(games=games, split="games", chunk_size=2), expected)
+
+    async def in_a_notebook():
+        # a running loop, as in Jupyter: the pull moves to a worker thread
+        return sync.get_events(games=games, split="games", chunk_size=2)
+    pd.testing.assert_frame_equal(asyncio.run(in_a_notebook()), expected)
+
+
+def test_piece_size_follows_response_time():
+    chunker = _Chunker("games", {"games": list(range(1000))}, 10, target_seconds=1.0)
+    assert chunker.next_piece() == (0, 10)
+    chunker.finished(0.01)          # fast: grows, by at most 2x
+    assert chunker.next_piece() == (10, 30)
+    chunker.finished(1.6)           # slow: shrinks in proportion
+    assert chunker.next_piece() == (30, 42)
+    assert chunker.failed((30, 42))
+    assert [chunker.next_piece(), chunker.next_piece()] == [(30, 36), (36, 42)]
+    assert not chunker.failed((5, 6))
+
+    with pytest.raises(ValueError, match="games"):
+        _Chunker("games", {"tag": ["Ranked"]}, None, 1.0)
+    with pytest.raises(ValueError, match="start_time"):
+        _Chunker("time", {"end_time": 5}, None, 1.0)
+    with pytest.raises(ValueError, match="Invalid split"):
+        _Chunker("users", {}, None, 1.0)
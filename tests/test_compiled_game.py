@@ -0,0 +1,113 @@
+"""CompiledGame contract: the arrays say exactly what EventObj says.
+
+The compiled view is only useful if a consumer can switch to it without
+re-validating anything, so every check here is a comparison against the
+dict-walking accessors it replaces.
+"""
+import math
+
+import numpy as np
+import pytest
+
+from pyrio.compiled_game import CompiledGame, MISSING_INT, SCHEMA
+from pyrio.lookup import LookupDicts
+from pyrio.stat_file_parser import EventObj, StatObj
+
+
+def _code(table, label):
+    return next(k for k, v in table.items() if v == label)
+
+
+def test_compiled_is_built_once_per_statobj(stat):
+    assert stat.compiled() is stat.compiled()
+
+
+def test_every_column_has_one_entry_per_event_and_the_schema_dtype(stat):
+    cg = stat.compiled()
+    assert len(cg) == len(stat.events())
+    for name, dtype in SCHEMA.items():
+        assert cg[name].shape == (len(cg),), name
+        assert cg[name].dtype == dtype, name
+
+
+def test_event_fields_match_eventobj(stat):
+    cg = stat.compiled()
+    for i in range(len(cg)):
+        ev = EventObj(stat, i)
+        assert cg.inning[i] == ev.inning()
+        assert cg.half_inning[i] == ev.half_inning()
+        assert cg.score(0)[i] == ev.score(0)
+        assert cg.score(1)[i] == ev.score(1)
+        assert (cg.balls[i], cg.strikes[i], cg.outs[i]) == (ev.balls(), ev.strikes(), ev.outs())
+        assert cg.rbi[i] == ev.rbi()
+        assert cg.batter_roster_loc[i] == ev.batter_roster_loc()
+        assert cg.result_of_ab[i] == _code(LookupDicts.FINAL_RESULT, ev.result_of_AB())
+        assert cg.batter_char[i] == _code(LookupDicts.CHAR_NAME, ev.batter())
+        assert cg.pitcher_char[i] == _code(LookupDicts.CHAR_NAME, ev.pitcher())
+        for base, col in ((1, "runner_1b"), (2, "runner_2b"), (3, "runner_3b")):
+            assert cg[col][i] == bool(ev.bool_runner_on_base(base))
+        assert cg.steal[i] == bool(ev.bool_steal(-1))
+
+
+def test_masks_follow_the_nested_dicts(stat):
+    cg = stat.compiled()
+    for i in range(len(cg)):
+        ev = EventObj(stat, i)
+        assert cg.has_pitch[i] == bool(ev.pitch_dict())
+        assert cg.has_contact[i] == bool(ev.contact_dict())
+        assert cg.has_fielder[i] == bool(ev.first_fielder_dict())
+
+
+def test_contact_events_need_no_compile(stat_json):
+    stat = StatObj(stat_json)
+    scanned = stat.contact_events()
+    assert stat._compiled is None
+    assert scanned == np.flatnonzero(stat.compiled().has_contact).tolist() == stat.contact_events()
+
+
+def test_pitch_and_contact_fields_match_eventobj_where_valid(stat):
+    cg = stat.compiled()
+    for i in np.flatnonzero(cg.has_contact):
+        ev = EventObj(stat, int(i))
+        assert cg.pitch_type[i] == _code(LookupDicts.PITCH_TYPE, ev.pitch_type())
+        assert cg.ball_position_strikezone[i] == ev.ball_position_strikezone()
+        assert cg.contact_type[i] == _code(LookupDicts.CONTACT_TYPE, ev.type_of_contact())
+        assert cg.contact_frame[i] == ev.contact_frame()
+        assert (cg.rng1[i], cg.rng2[i], cg.rng3[i]) == (4552, 5350, 183)  # "4,552", ...
+        assert cg.horiz_angle[i] == 1722                                  # "1,722"
+        assert (cg.velocity_x[i], cg.velocity_y[i], cg.velocity_z[i]) == ev.ball_velocity()
+
+
+def test_missing_sections_use_sentinels(stat):
+    cg = stat.compiled()
+    no_pitch = np.flatnonzero(~cg.has_pitch)
+    assert len(no_pitch) > 0
+    for i in no_pitch:
+        assert cg.pitch_type[i] == MISSING_INT
+        assert math.isnan(cg.ball_position_strikezone[i])
+        assert cg.contact_frame[i] == MISSING_INT
+
+
+def test_encoded_and_decoded_flavors_compile_identically(stat_json):
+    decoded = CompiledGame.from_events(stat_json["Events"])
+    encoded_events = []
+    for ev in stat_json["Events"]:
+        ev = dict(ev)
+        ev["Result of AB"] = _code(LookupDicts.FINAL_RESULT, ev["Result of AB"])
+        if "Pitch" in ev:
+            ev["Pitch"] = dict(ev["Pitch"])
+            ev["Pitch"]["Pitch Type"] = _code(LookupDicts.PITCH_TYPE, ev["Pitch"]["Pitch Type"])
+            ev["Pitch"]["Type of Swing"] = _code(LookupDicts.TYPE_OF_SWING, ev["Pitch"]["Type of Swing"])
+        encoded_events.append(ev)
+    encoded = CompiledGame.from_events(encoded_events)
+    for col in ("result_of_ab", "pitch_type", "swing_type"):
+        assert np.array_equal(decoded[col], encoded[col]), col
+
+
+@pytest.mark.parametrize("version", ["1.9.1", "1.9.3"])
+def test_old_versions_resolve_the_same_characters(stat_json, version):
+    from conftest import build_stat_json
+    old = StatObj(build_stat_json(version)).compiled()
+    new = StatObj(stat_json).compiled()
+    assert np.array_equal(old.batter_char, new.batter_char)
+    assert np.array_equal(old.pitcher_char, new.pitcher_char)
@@ -0,0 +1,84 @@
+"""CorpusIndex: every EventSearch answer, for many games, from disk.
+
+A corpus answer must be exactly the union of the per-game answers, keyed by
+(game_id, event_num), no matter how the games were added or compacted.
+"""
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from conftest import build_game
+from pyrio.corpus_index import CorpusIndex
+from pyrio.event_query import Q
+from pyrio.stat_file_parser import EventSearch
+
+
+@pytest.fixture
+def games():
+    return [build_game("A1"),
+            build_game("B2", TagSetID=9, **{"Date - Start": "Mon Jan 06 18:00:00 2025", "Away Player": "Other"})]
+
+
+@pytest.fixture
+def index(tmp_path, games):
+    index = CorpusIndex(str(tmp_path / "index"))
+    index.add(games)
+    return index
+
+
+def _per_game(games, facet, *args):
+    return {(stat.gameID(), num) for stat in games
+            for num in getattr(EventSearch(stat), facet)(*args)}
+
+
+FACETS = [
+    ("hitResultEvents",), ("pitchTypeEvents", "Curve"), ("strikeEvents", -1),
+    ("runnerOnBaseEvents", [-1, -2, 0]), ("inningEvents", 1), ("awayScoreEvents", 1),
+    ("characterAtBatEvents", "Mario"), ("characterPitchingEvents", "Bowser"),
+    ("characterFieldingEvents", "King Boo"), ("walkoffEvents",), ("leadChangedEvents",),
+    ("playerBattingEvents", "awayuser"), ("playerPitchingEvents", "HomeUser"),
+    ("ballPositionStrikezoneEvents", 0.3),
+]
+
+
+@pytest.mark.parametrize("facet", FACETS, ids=lambda f: f[0])
+def test_facets_are_the_union_of_the_per_game_answers(index, games, facet):
+    name, *args = facet
+    assert getattr(index, name)(*args) == _per_game(games, name, *args)
+
+
+def test_reopened_index_is_memory_mapped_and_answers_the_same(index, games):
+    reopened = CorpusIndex(index.path)
+    assert len(reopened) == 2
+    assert isinstance(reopened._compiled.inning, np.memmap)
+    q = Q.strikes(-1) & Q.pitch_type("Charge")
+    assert reopened.query(q) == index.query(q)
+    assert reopened.query(q) == _per_game(games, "query", q)
+
+
+def test_incremental_add_skips_known_games_and_compacts(index, games):
+    assert index.add(games) == 0
+    assert index.add([build_game("C3")]) == 1
+    assert len(index._segment_names) == 2
+    before = index.hitResultEvents()
+    assert (int("C3", 16), 6) in before
+    # only the columns a query reads are joined across segments
+    assert index._compiled.as_dict().built() == ["result_of_ab"]
+    index.compact()
+    assert len(index._segment_names) == 1
+    assert CorpusIndex(index.path).hitResultEvents() == before
+
+
+def test_game_level_facets(index):
+    a1, b2 = int("A1", 16), int("B2", 16)
+    assert {g for g, _ in index.tagSetEvents(9)} == {b2}
+    assert {g for g, _ in index.dateRangeEvents(datetime(2025, 2, 1))} == {a1}
+    assert index.gameEvents(a1) == {(a1, n) for n in range(7)}
+    assert a1 in index and 0xFF not in index
+
+
+def test_masks_round_trip_through_keys(index):
+    mask = index.hitResultEvents(as_mask=True)
+    assert mask.shape == (14,)
+    assert np.array_equal(index.mask_from_events(index.events_from_mask(mask)), mask)
@@ -0,0 +1,93 @@
+"""CorpusStore: the Parquet tables hold exactly what StatObj reads.
+
+Each table is checked against the StatObj/CompiledGame view of the same
+games, and appends must add only new games without rewriting old parts.
+"""
+import json
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from conftest import build_game
+from pyrio.corpus_store import TABLES, CorpusStore, game_tables
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CorpusStore(str(tmp_path / "store"))
+    store.append([build_game("A1"), build_game("B2", version="1.9.1")])
+    return store
+
+
+def test_tables_match_the_stat_objs(store, stat):
+    games = store.read("games")
+    assert games["game_id"].tolist() == [0xA1, 0xB2]
+    assert games["stadium"].tolist() == [stat.stadium()] * 2
+    assert games["away_player"].tolist() == [build_game("A1").player(0), build_game("B2", "1.9.1").player(0)]
+
+    rosters = store.read("rosters", filters=[("game_id", "==", 0xB2)])
+    # the flipped 1.9.1 layout is stored as away/home like every other version
+    assert rosters[rosters.team == 0]["char_id"].tolist() == stat.characterName(0)
+    assert rosters["hits"].sum() == stat.hits(0) + stat.hits(1)
+
+    cg = stat.compiled()
+    events = store.read("events", filters=[("game_id", "==", 0xA1)])
+    assert np.array_equal(events["inning"], cg.inning)
+    for table, mask in (("pitches", cg.has_pitch), ("contacts", cg.has_contact),
+                        ("fielding", cg.has_fielder)):
+        rows = store.read(table, columns=["game_id", "event_num"], filters=[("game_id", "==", 0xA1)])
+        assert rows["event_num"].tolist() == np.flatnonzero(mask).tolist()
+
+    runners = store.read("runners", filters=[("game_id", "==", 0xA1)])
+    expected = sum(1 for ev in stat.events() for key in
+                   ("Runner Batter", "Runner 1B", "Runner 2B", "Runner 3B") if key in ev)
+    assert len(runners) == expected
+
+
+def test_append_adds_only_new_games_as_new_parts(store):
+    before = {table: os.listdir(store.table_path(table)) for table in TABLES}
+    assert store.append([build_game("A1")]) == 0
+    assert store.append([build_game("A1"), build_game("C3")]) == 1
+    assert store.game_ids() == {0xA1, 0xB2, 0xC3}
+    for table in TABLES:
+        after = os.listdir(store.table_path(table))
+        assert set(before[table]) < set(after) and len(after) == 2
+
+
+def test_interrupted_append_is_invisible_and_cleaned_up(store):
+    events = store.read("events")
+    # a crash mid-append: a temp file, and an events part without its games part
+    orphan = os.path.join(store.table_path("events"), "part-00007.parquet")
+    with open(os.path.join(store.table_path("pitches"), ".part-00007.parquet.tmp"), "wb") as f:
+        f.write(b"PAR1 truncated")
+    events.to_parquet(orphan)
+    assert len(store.read("events")) == len(events)
+    assert len(store.read("pitches")) > 0 and len(store) == 2
+
+    assert store.append([build_game("C3")]) == 1
+    assert not os.path.exists(orphan)
+    assert sorted(os.listdir(store.table_path("pitches"))) == ["part-00000.parquet", "part-00001.parquet"]
+    assert len(store.read("events")) == len(events) * 3 // 2
+
+
+def test_add_directory_skips_unloadable_files(tmp_path):
+    stat_dir = tmp_path / "stats"
+    stat_dir.mkdir()
+    for game_id in ("1", "2", "3"):
+        (stat_dir / f"{game_id}.decoded.json").write_text(json.dumps(build_game(game_id).statJson))
+    (stat_dir / "4.decoded.json").write_text("{")
+    store = CorpusStore(str(tmp_path / "store"))
+    assert store.add_directory(stat_dir, workers=2, games_per_part=2) == 3
+    assert len(os.listdir(store.table_path("games"))) == 2
+    assert len(store.read("events")) == 3 * len(game_tables(build_game("1"))["events"])
+
+
+def test_empty_store_reads_empty_tables(tmp_path):
+    store = CorpusStore(str(tmp_path / "empty"))
+    assert store.read("pitches").empty
+    assert len(store) == 0
+    with pytest.raises(ValueError):
+        store.read("innings")
@@ -0,0 +1,54 @@
+"""Binary event files: the compiled columns, read back without parsing.
+
+Every column must round-trip (floats to float32 precision), per-game views
+must be zero-copy slices of the memory map, and lookups must address the
+right game and event.
+"""
+import numpy as np
+import pytest
+
+from conftest import build_game
+from pyrio.compiled_game import SCHEMA
+from pyrio.event_file import RECORD_DTYPE, EventFile, write_event_file
+
+
+@pytest.fixture
+def event_file(tmp_path):
+    path = tmp_path / "corpus.rioev"
+    assert write_event_file(path, [build_game("A1"), build_game("B2"), build_game("A1")]) == 2
+    return EventFile(path)
+
+
+def test_columns_round_trip(event_file, stat):
+    cg = stat.compiled()
+    stored = event_file.compiled(0xB2)
+    assert len(stored) == len(cg)
+    for name, dtype in SCHEMA.items():
+        if dtype.kind == "f":
+            np.testing.assert_array_equal(stored[name], cg[name].astype(np.float32))
+        else:
+            np.testing.assert_array_equal(stored[name], cg[name])
+
+
+def test_views_are_memory_mapped_not_copied(event_file):
+    column = event_file.compiled(0xA1).inning
+    assert isinstance(column.base, np.memmap) or isinstance(column, np.memmap)
+    assert not column.flags.writeable
+    assert RECORD_DTYPE.itemsize == sum(RECORD_DTYPE[name].itemsize for name in RECORD_DTYPE.names)
+
+
+def test_records_and_the_game_table(event_file, stat):
+    assert event_file.game_ids() == [0xA1, 0xB2]
+    assert len(event_file.compiled()) == 2 * len(stat.compiled())
+    assert event_file.record(0xB2, 6)["rbi"] == stat.compiled().rbi[6]
+    with pytest.raises(IndexError):
+        event_file.record(0xB2, 7)
+    with pytest.raises(KeyError):
+        event_file.compiled(0xFF)
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "not-events.bin"
+    path.write_bytes(b"\0" * 5000)
+    with pytest.raises(ValueError):
+        EventFile(path)
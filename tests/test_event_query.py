@@ -0,0 +1,85 @@
+"""Q expressions: same answers as chaining the facet methods, less work.
+
+Results are compared with the set algebra users write by hand today; the
+planner tests check evaluation order and short-circuiting.
+"""
+import numpy as np
+import pytest
+
+from pyrio.event_query import Q
+from pyrio.stat_file_parser import EventSearch
+
+
+@pytest.fixture
+def search(stat):
+    return EventSearch(stat)
+
+
+def test_and_or_not_match_set_algebra(search):
+    q = Q.inning(1) & Q.pitch_type("Charge") & ~Q.star_chance()
+    assert search.query(q) == (search.inningEvents(1) & search.pitchTypeEvents("Charge")
+                               - search.starChanceEvents())
+    q = Q.hit(4) | Q.contact_type("sour") | Q.steal()
+    assert search.query(q) == search.hitResultEvents(4) | search.contactTypeEvents("sour") | search.stealEvents()
+    q = ~(Q.half_inning(0) | Q.star_chance())
+    assert search.query(q) == {6}
+
+
+def test_query_honours_as_mask(stat, search):
+    q = Q.swing_type("slap") & Q.first_pitch_of_ab()
+    mask = search.query(q, as_mask=True)
+    assert mask.dtype == bool and not mask.any()
+    assert EventSearch(stat, as_mask=True).query(Q.walkoff()).tolist() == [False] * 6 + [True]
+
+
+def test_generic_facet_leaf(search):
+    assert search.query(Q.facet("contactFrameEvents", 2)) == search.contactFrameEvents(2)
+    assert search.query(Q.facet("niceContactTypeEvents", side="l")) == {6}
+
+
+def test_operands_flatten_and_double_negation_cancels():
+    q = Q.inning(1) & (Q.balls(0) & Q.strikes(0))
+    assert len(q.operands) == 3
+    leaf = Q.steal()
+    assert ~~leaf is leaf
+
+
+def test_plan_puts_the_most_selective_operand_first():
+    q = Q.half_inning(0) & Q.pitch_type("Curve") & Q.star_chance()
+    assert [op.method_name for op in q.plan().operands] == [
+        "starChanceEvents", "pitchTypeEvents", "halfInningEvents"]
+
+
+def test_empty_intersection_short_circuits(search, monkeypatch):
+    called = []
+    original = EventSearch.halfInningEvents
+    monkeypatch.setattr(EventSearch, "halfInningEvents",
+                        lambda self, *a, **kw: called.append(a) or original(self, *a, **kw))
+    q = Q.walkoff() & Q.inning(1) & Q.half_inning(0)
+    assert search.query(q) == set()
+    assert called == []
+
+
+def test_repeated_facets_are_evaluated_once(search, monkeypatch):
+    called = []
+    original = EventSearch.inningEvents
+    monkeypatch.setattr(EventSearch, "inningEvents",
+                        lambda self, *a, **kw: called.append(a) or original(self, *a, **kw))
+    search.query((Q.inning(1) & Q.star_chance()) | (Q.inning(1) & Q.steal()))
+    assert called == [(1,)]
+
+
+def test_python_boolean_operators_are_rejected():
+    with pytest.raises(TypeError):
+        Q.inning(1) and Q.steal()
+
+
+def test_q_is_abstract():
+    with pytest.raises(TypeError):
+        Q()
+
+    class Partial(Q):
+        def selectivity(self):
+            return 1.0
+    with pytest.raises(TypeError):
+        Partial()
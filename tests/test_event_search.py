@@ -0,0 +1,152 @@
+"""EventSearch facets: bitmaps underneath, the same event sets on top.
+
+Each facet is checked against the EventObj accessors it used to be built from,
+then against the masks it hands out when asked for them.
+"""
+import numpy as np
+import pytest
+
+from pyrio.stat_file_parser import EventObj, EventSearch, StatObj
+
+
+@pytest.fixture
+def search(stat):
+    return EventSearch(stat)
+
+
+def _where(stat, predicate):
+    return {i for i in range(len(stat.events())) if predicate(EventObj(stat, i))}
+
+
+# --- facets vs. EventObj ----------------------------------------------------
+
+def test_result_facets(stat, search):
+    assert search.hitResultEvents() == {2, 3, 6}
+    assert search.hitResultEvents(4) == {6}
+    assert search.caughtResultEvents() == {5}
+    assert search.allOutResultEvents() == {5}
+    assert search.noneResultEvents() == _where(stat, lambda e: e.result_of_AB() == "None")
+
+
+def test_count_and_score_facets(stat, search):
+    assert search.ballEvents(1) == _where(stat, lambda e: e.balls() == 1)
+    assert search.ballEvents(-2) == _where(stat, lambda e: e.balls() >= 2)
+    assert search.strikeEvents([0, 2]) == _where(stat, lambda e: e.strikes() in (0, 2))
+    assert search.inningEvents(2) == {6}
+    assert search.awayScoreEvents(1) == _where(stat, lambda e: e.score(0) == 1)
+    assert search.homeScoreEvents(0) == _where(stat, lambda e: e.score(1) == 0)
+    assert search.pitcherStaminaEvents(-10) == _where(stat, lambda e: e.pitcher_stamina() < 10)
+    assert search.outsInInningEvents(1) == {6}
+
+
+def test_pitch_and_contact_facets(stat, search):
+    assert search.curvePitchTypeEvents() == _where(stat, lambda e: bool(e.pitch_dict()) and e.pitch_type() == "Curve")
+    assert search.pitchTypeEvents(["slider", "perfect"]) == {1, 3, 6}
+    assert search.swingTypeEvents("slap") == {1, 5}
+    assert search.firstPitchOfABEvents() == {0, 3}
+    assert search.lastPitchOfABEvents() == {2, 3, 5, 6}
+    assert search.starPitchEvents() == {5}
+    assert search.contactTypeEvents("nice") == {2, 6}
+    assert search.sourContactTypeEvents("l") == {5}
+    assert search.contactFrameEvents(2) == {2, 6}
+    assert search.fiveStarDingerEvents() == {6}
+    assert search.ballPositionStrikezoneEvents(0.4) == {0, 5}
+    assert search.inputDirectionEvents("Right") == {2, 3, 5, 6}
+
+
+def test_fielding_facets(search):
+    assert search.bobbleEvents() == {3}
+    assert search.slidingCatchEvents() == {3}
+    assert search.manualCharacterSelectionEvents() == {5}
+    assert search.positionFieldingEvents("lf") == {2}
+    assert search.firstFielderPositionEvents("3B") == {5}
+
+
+def test_character_facets(stat, search):
+    for char in ("Mario", "Luigi", "Bowser", "Bowser Jr"):
+        assert search.characterAtBatEvents(char) == _where(stat, lambda e: e.batter() == char)
+        assert search.characterPitchingEvents(char) == _where(stat, lambda e: e.pitcher() == char)
+    assert search.characterFieldingEvents("King Boo") == {3}
+    assert search.characterFieldingEvents("Yoshi") == {5}
+    assert search.characterAtBatEvents("Not In Game") == set()
+
+
+def test_game_state_facets(stat, search):
+    assert search.runnerOnBaseEvents([0]) == {0, 1, 2, 5}
+    assert search.runnerOnBaseEvents([1]) == {3}
+    assert search.runnerOnBaseEvents([-1, -2, 0]) == {0, 1, 2, 3, 4, 5}
+    assert search.stealEvents() == {3}
+    assert search.leadChangedEvents() == {3, 6}
+    assert search.walkoffEvents() == {6}
+    assert search.awayTeamWinningEvents() == {4, 5, 6}
+    assert search.playerBattingEvents("homeuser") == search.halfInningEvents(1)
+
+
+# --- behavior changed from the set-based EventSearch ------------------------
+# Each of these facets raised or gave a wrong answer before the rewrite.
+
+def test_away_score_reads_the_away_score(stat, search):
+    # used to read the home score index
+    for score in (0, 1, 2):
+        assert search.awayScoreEvents(score) == _where(stat, lambda e: e.score(0) == score)
+    assert search.awayScoreEvents(1) != search.homeScoreEvents(1)
+
+
+def test_runner_on_base_no_runners_and_no_debug_output(stat, search, capsys):
+    # [0] used to raise KeyError('None'); required bases printed
+    # 'required_bases' and then raised AttributeError (no eventFinal())
+    assert search.runnerOnBaseEvents([0]) == _where(stat, lambda e: not e.bool_runner_on_base(-1))
+    assert search.runnerOnBaseEvents([1, -2]) == _where(
+        stat, lambda e: bool(e.bool_runner_on_base(1)) and not e.bool_runner_on_base(3))
+    assert capsys.readouterr().out == ""
+
+
+def test_pitcher_stamina_reads_the_stamina_index(stat, search):
+    # used to pass the string 'Pitcher Stamina' as the index and raise TypeError
+    stamina = stat.events()[0]["Pitcher Stamina"]
+    assert search.pitcherStaminaEvents(stamina) == _where(stat, lambda e: e.pitcher_stamina() == stamina)
+
+
+# --- masks ------------------------------------------------------------------
+
+def test_masks_match_the_sets_and_combine_bitwise(search):
+    hits = search.hitResultEvents(as_mask=True)
+    charge = search.chargePitchTypeEvents(as_mask=True)
+    assert hits.dtype == bool and hits.shape == (7,)
+    assert EventSearch.events_from_mask(hits) == search.hitResultEvents()
+    assert EventSearch.events_from_mask(hits & charge) == search.hitResultEvents() & search.chargePitchTypeEvents()
+    assert EventSearch.events_from_mask(hits & ~charge) == search.hitResultEvents() - search.chargePitchTypeEvents()
+    assert np.array_equal(search.mask_from_events({2, 3, 6}), hits)
+
+
+def test_instance_default_can_be_masks(stat):
+    search = EventSearch(stat, as_mask=True)
+    assert isinstance(search.starChanceEvents(), np.ndarray)
+    assert search.starChanceEvents(as_mask=False) == {5}
+
+
+def test_index_masks_are_read_only(search):
+    with pytest.raises(ValueError):
+        search.hitResultEvents(1, as_mask=True)[0] = True
+
+
+# --- lazy indexes -----------------------------------------------------------
+
+def test_indexes_are_built_on_first_use_and_cached(stat):
+    search = EventSearch(stat)
+    assert "_pitch_type_dict" not in vars(search)
+    search.curvePitchTypeEvents()
+    built = vars(search)["_pitch_type_dict"]
+    assert "_contact_type_dict" not in vars(search)
+    assert "character_action_dict" not in vars(search)
+    search.chargePitchTypeEvents()
+    assert vars(search)["_pitch_type_dict"] is built
+
+
+def test_a_facet_decodes_only_its_own_columns(stat_json):
+    stat = StatObj(stat_json)
+    search = EventSearch(stat)
+    search.strikeEvents(2)
+    assert stat.compiled().as_dict().built() == ["strikes"]
+    search.curvePitchTypeEvents()
+    assert stat.compiled().as_dict().built() == ["strikes", "pitch_type"]
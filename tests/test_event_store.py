@@ -0,0 +1,88 @@
+"""EventStore: EventsParameterList answers from a local SQLite database.
+
+Filters over stat-file events must agree with EventSearch on the same game;
+API rows are matched on the same columns, and filters the store can't
+answer are refused rather than silently ignored.
+"""
+import json
+
+import pandas as pd
+import pytest
+
+from conftest import build_game
+from pyrio.api import EventsParameterList
+from pyrio.event_store import EventStore
+from pyrio.lookup import LookupDicts
+from pyrio.stat_file_parser import EventSearch
+
+
+def _code(table, label):
+    return next(code for code, name in table.items() if name == label)
+
+
+@pytest.fixture
+def store(stat):
+    with EventStore() as store:
+        store.add_stats([stat])
+        yield store
+
+
+def _events(df):
+    return set(df["event_num"])
+
+
+def test_filters_agree_with_event_search(store, stat):
+    search = EventSearch(stat)
+    mario = _code(LookupDicts.CHAR_NAME, "Mario")
+    curve = _code(LookupDicts.PITCH_TYPE, "Curve")
+    assert _events(store.query(EventsParameterList(batter_char=[mario]))) == search.characterAtBatEvents("Mario")
+    assert _events(store.query(EventsParameterList(pitch=[curve], inning=[1]))) == \
+        search.pitchTypeEvents("Curve") & search.inningEvents(1)
+    assert _events(store.query(EventsParameterList(strikes=[2], half_inning=[1]))) == \
+        search.strikeEvents(2) & search.halfInningEvents(1)
+    assert _events(store.query(star_chance=[1])) == search.starChanceEvents()
+
+
+def test_user_and_game_filters(store, stat):
+    assert _events(store.query(users_as_batter=["awayuser"])) == EventSearch(stat).playerBattingEvents("AwayUser")
+    assert len(store.query(EventsParameterList(username=["HomeUser"]))) == 7
+    assert store.query(EventsParameterList(exclude_username=["HomeUser"])).empty
+    assert len(store.query(start_time=0, end_time=2**31)) == 7
+    assert store.query(games=[12345]).empty
+    assert len(store.query(limit_events=3)) == 3
+
+
+def test_readding_a_game_replaces_its_rows(store, stat):
+    store.add_stats([stat])
+    assert len(store) == 7
+
+
+def test_api_rows_are_matched_and_keep_their_payload(tmp_path):
+    rows = pd.DataFrame([
+        {"game_id": 1, "event_num": 0, "batter_char_id": 0, "pitch_type": 1, "strikes": 2,
+         "batter_user_id": 44, "ball_power": 120},
+        {"game_id": 1, "event_num": 1, "batter_char_id": 3, "pitch_type": 0, "strikes": 0,
+         "batter_user_id": 45, "ball_power": None},
+    ])
+    path = tmp_path / "events.sqlite"
+    with EventStore(str(path)) as store:
+        assert store.add_events(rows) == 2
+    with EventStore(str(path)) as store:
+        df = store.query(EventsParameterList(batter_char=[0], strikes=[2]), include_payload=True)
+        assert df["event_num"].tolist() == [0]
+        assert df["ball_power"].tolist() == [120]
+        assert _events(store.query(users_as_batter=[45])) == {1}
+        assert store.add_events({"Events": json.loads(rows.to_json(orient="records"))}) == 2
+
+
+def test_unsupported_filters_are_refused(store):
+    with pytest.raises(ValueError, match="tag"):
+        store.query(EventsParameterList(tag=["Ranked"]))
+
+
+def test_add_directory(tmp_path):
+    for game_id in ("A1", "B2"):
+        (tmp_path / f"{game_id}.decoded.json").write_text(json.dumps(build_game(game_id).statJson))
+    with EventStore() as store:
+        assert store.add_directory(tmp_path, workers=0) == 2
+        assert set(store.query()["game_id"]) == {0xA1, 0xB2}
@@ -0,0 +1,111 @@
+"""Duplicate games: each game is ingested once, however many copies exist.
+
+Copies are the same GameID with the same events, whatever their formatting
+or header metadata; they must be dropped before their events are parsed,
+and the index must remember owners across runs without re-reading files.
+"""
+import json
+import os
+
+import pytest
+
+from conftest import build_game
+from pyrio import game_dedup, pitch_csv
+from pyrio.game_dedup import DedupIndex, game_identity
+from pyrio.hit_simulator import hit_sim_validation
+from pyrio.stat_file_parser import StatObj
+
+
+def _write(directory, name, game_id="A1", indent=None, **header):
+    path = directory / f"{name}.decoded.json"
+    path.write_text(json.dumps(build_game(game_id, **header).statJson, indent=indent))
+    return path
+
+
+@pytest.fixture
+def stat_dir(tmp_path):
+    directory = tmp_path / "stats"
+    directory.mkdir()
+    _write(directory, "a-away", "A1")
+    _write(directory, "a-home", "A1", indent=2, **{"Home Player": "Uploader"})
+    _write(directory, "b", "B2")
+    return directory
+
+
+# --- identity ---------------------------------------------------------------
+
+def test_copies_match_and_different_games_do_not(stat_dir, tmp_path):
+    away, home = game_identity(stat_dir / "a-away.decoded.json"), game_identity(stat_dir / "a-home.decoded.json")
+    assert away == home and away[0] == 0xA1
+
+    stat_json = build_game("A1").statJson
+    stat_json["Events"][0]["Balls"] = 3
+    (tmp_path / "other.json").write_text(json.dumps(stat_json))
+    assert game_identity(tmp_path / "other.json")[1] != away[1]
+
+
+def test_unique_keeps_first_copy_and_unreadable_files(stat_dir):
+    (stat_dir / "z.decoded.json").write_text("{")
+    paths = sorted(stat_dir.iterdir())
+    index = DedupIndex()
+    assert [p.name for p in index.unique(paths)] == ["a-away.decoded.json", "b.decoded.json", "z.decoded.json"]
+    assert [(os.path.basename(copy), os.path.basename(original)) for copy, original in index.duplicates] == \
+        [("a-home.decoded.json", "a-away.decoded.json")]
+
+
+# --- persistence ------------------------------------------------------------
+
+def test_index_remembers_owners_without_rereading(stat_dir, tmp_path, monkeypatch):
+    index_path = tmp_path / "dedup.json"
+    with DedupIndex(index_path) as index:
+        index.unique(sorted(stat_dir.iterdir()))
+
+    identified = []
+    original = game_dedup.game_identity
+    monkeypatch.setattr(game_dedup, "game_identity", lambda path: identified.append(path) or original(path))
+    later = tmp_path / "later"
+    later.mkdir()
+    copy = _write(later, "reexport", "B2", indent=4)
+    with DedupIndex(index_path) as index:
+        assert index.unique(sorted(stat_dir.iterdir())) == [stat_dir / "a-away.decoded.json", stat_dir / "b.decoded.json"]
+        assert index.unique([copy]) == []
+    assert identified == [str(copy)]
+
+    # the owner is gone: the copy takes its place
+    os.remove(stat_dir / "b.decoded.json")
+    with DedupIndex(index_path) as index:
+        assert index.unique([copy]) == [copy]
+
+
+def test_corrupt_index_is_empty(stat_dir, tmp_path):
+    index_path = tmp_path / "dedup.json"
+    index_path.write_text("[")
+    assert len(DedupIndex(index_path).unique(sorted(stat_dir.iterdir()))) == 2
+
+
+# --- jobs -------------------------------------------------------------------
+
+def test_duplicates_are_not_parsed(stat_dir, monkeypatch):
+    parsed = []
+    original = StatObj.from_path.__func__
+    monkeypatch.setattr(StatObj, "from_path",
+                        classmethod(lambda cls, path, **kw: parsed.append(os.path.basename(path))
+                                    or original(cls, path, **kw)))
+    stats = list(pitch_csv.load_statobjs_from_directory(stat_dir, dedup=True))
+    assert sorted(parsed) == ["a-away.decoded.json", "b.decoded.json"]
+    assert sorted(stat.gameID() for stat in stats) == [0xA1, 0xB2]
+
+
+def test_jobs_count_each_game_once(stat_dir, tmp_path):
+    unique = tmp_path / "unique"
+    unique.mkdir()
+    _write(unique, "a-away", "A1")
+    _write(unique, "b", "B2")
+
+    opts = {"active_tags": frozenset()}
+    assert hit_sim_validation.validate_directory(stat_dir, dedup=tmp_path / "v.json", **opts).summary() == \
+        hit_sim_validation.validate_directory(unique, **opts).summary()
+
+    pitch_csv.write_pitch_csv(str(stat_dir), tmp_path / "dedup.csv", dedup=True, workers=2, files_per_shard=1)
+    pitch_csv.write_pitch_csv(str(unique), tmp_path / "unique.csv", workers=0)
+    assert (tmp_path / "dedup.csv").read_text() == (tmp_path / "unique.csv").read_text()
@@ -0,0 +1,53 @@
+"""HudObj.diff: only what changed between consecutive HUD snapshots.
+
+Each reported value must match the HudObj accessors, unchanged fields must be
+absent, and diffing must not build RosterObjs.
+"""
+import pytest
+
+from conftest import build_hud_json
+from pyrio import stat_file_parser
+from pyrio.stat_file_parser import HudObj
+
+
+@pytest.fixture
+def rosters_built(monkeypatch):
+    calls = []
+    original = stat_file_parser.RosterObj
+    monkeypatch.setattr(stat_file_parser, "RosterObj", lambda slots: calls.append(1) or original(slots))
+    return calls
+
+
+def test_first_snapshot_reports_everything(hud_json):
+    hud = HudObj(hud_json)
+    changes = hud.diff(None)
+    assert set(changes) == {"inning", "score", "count", "runners", "batter", "pitcher",
+                            "inning_scores", "defensive_diamond"}
+    assert changes["defensive_diamond"] == {0: hud.defensive_diamond(0), 1: hud.defensive_diamond(1)}
+    assert changes["runners"] == ((1, "Bowser Jr"), None, None)
+    # bottom of the inning: home bats, away pitches
+    assert changes["batter"] == (1, 2, "DK")
+    assert changes["pitcher"] == (0, 0, "Mario")
+
+
+def test_a_pitch_changes_only_the_count(rosters_built):
+    before, after = build_hud_json("50a"), build_hud_json("51a")
+    after["Strikes"] = 2
+    after["Home Roster 2"]["Offensive Stats"]["At Bats"] += 1
+    assert HudObj(after).diff(HudObj(before)) == {"count": (0, 2, 1)}
+    assert rosters_built == []
+
+
+def test_a_play_and_a_defensive_swap():
+    before, after = build_hud_json("51a"), build_hud_json("52a")
+    after.update({"Home Score": 2, "Home Inning Scores": [1, 1], "Batter Roster Loc": 3,
+                  "Runner 1B": None})
+    positions = after["Away Roster 6"]["Fielding Position"], after["Away Roster 7"]["Fielding Position"]
+    after["Away Roster 6"]["Fielding Position"], after["Away Roster 7"]["Fielding Position"] = positions[::-1]
+
+    after_hud = HudObj(after)
+    changes = after_hud.diff(HudObj(before))
+    assert changes == {"score": (0, 2), "inning_scores": ((0, 0, 0), (1, 1)),
+                       "runners": (None, None, None), "batter": (1, 3, "Diddy"),
+                       "defensive_diamond": {0: after_hud.defensive_diamond(0)}}
+    assert changes["defensive_diamond"][0][6:8] == [7, 6]
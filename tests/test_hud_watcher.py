@@ -0,0 +1,196 @@
+"""HudTailer: a snapshot per content change, never an error mid-write.
+
+An unchanged file must not be re-parsed, a change must be seen (in place or
+by rename, with inotify or by polling), and a half-written file must be
+skipped until the write completes.
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from conftest import build_hud_json
+from pyrio import hud_watcher
+from pyrio.hud_watcher import HudTailer, Inotify
+
+
+def _write(path, event_num, atomic=False):
+    path = Path(path)
+    data = json.dumps(build_hud_json(event_num))
+    target = path.with_suffix(".tmp") if atomic else path
+    target.write_text(data)
+    if atomic:
+        os.replace(target, path)
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    calls = []
+    original = hud_watcher.json_backend.loads
+    monkeypatch.setattr(hud_watcher.json_backend, "loads", lambda data: calls.append(1) or original(data))
+    return calls
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def tailer(request, tmp_path):
+    if request.param and Inotify.create() is None:
+        pytest.skip("inotify unavailable")
+    with HudTailer(tmp_path / "decoded.hud.json", interval=0.01, use_inotify=request.param) as tailer:
+        yield tailer
+
+
+def test_poll_parses_only_changes(tailer, parses):
+    assert tailer.poll() is None
+    _write(tailer.path, "1a")
+    assert tailer.poll().event_number == "1a"
+    assert tailer.poll() is None
+    # touched, or rewritten with the same content: no new snapshot, no parse
+    os.utime(tailer.path, ns=(1, 1))
+    _write(tailer.path, "1a")
+    assert tailer.poll() is None and tailer.latest.event_number == "1a"
+    assert len(parses) == 1
+
+
+def test_partial_writes_are_skipped(tailer):
+    text = json.dumps(build_hud_json("2b"))
+    Path(tailer.path).write_text(text[:len(text) // 2])
+    assert tailer.poll() is None
+    Path(tailer.path).write_text(text)
+    assert tailer.poll().event_number == "2b"
+
+
+def test_snapshots_missing_diff_fields_are_skipped(tailer):
+    Path(tailer.path).write_text(json.dumps({"Event Num": "51a"}))
+    assert tailer.poll() is None and tailer.latest is None
+    _write(tailer.path, "52a")
+    assert tailer.poll().event_number == "52a"
+
+
+@pytest.mark.parametrize("atomic", [False, True])
+def test_wait_follows_a_writer(tailer, atomic):
+    _write(tailer.path, "1a")
+    assert tailer.wait(timeout=1).event_number == "1a"
+
+    def writer():
+        for n in range(2, 5):
+            time.sleep(0.02)
+            _write(tailer.path, f"{n}a", atomic=atomic)
+    thread = threading.Thread(target=writer)
+    thread.start()
+    seen = []
+    while not seen or seen[-1] != "4a":
+        hud = tailer.wait(timeout=2)
+        assert hud is not None
+        seen.append(hud.event_number)
+    thread.join()
+    assert seen[-1] == "4a" and set(seen) <= {"2a", "3a", "4a"}
+    assert tailer.wait(timeout=0.05) is None
+
+
+# --- asyncio watcher --------------------------------------------------------
+
+from pyrio.hud_watcher import AsyncHudWatcher  # noqa: E402
+
+
+def _run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, 5))
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def use_inotify(request):
+    if request.param and Inotify.create() is None:
+        pytest.skip("inotify unavailable")
+    return request.param
+
+
+def test_many_streams_one_parse_per_change(tmp_path, use_inotify, parses):
+    paths = {f"setup{n}": tmp_path / f"setup{n}.hud.json" for n in range(3)}
+
+    async def main():
+        async with AsyncHudWatcher(paths, interval=0.01, use_inotify=use_inotify) as watcher:
+            everything = watcher.subscribe()
+            only_one = watcher.subscribe(streams=["setup1"])
+            for path in paths.values():
+                _write(path, "1a")
+            seen = {(await everything.get()).stream for _ in range(3)}
+            one = await only_one.get()
+        assert [update async for update in only_one] == []
+        return seen, one
+
+    seen, one = _run(main())
+    assert seen == set(paths)
+    assert (one.stream, one.hud.event_number, one.changes) == ("setup1", "1a", None)
+    assert len(parses) == 3
+
+
+def test_diff_subscribers_get_changes_only(tmp_path, use_inotify):
+    path = tmp_path / "decoded.hud.json"
+
+    async def main():
+        async with AsyncHudWatcher([path], interval=0.01, use_inotify=use_inotify) as watcher:
+            diffs = watcher.subscribe(diffs=True)
+            _write(path, "1a")
+            first = await diffs.get()
+            hud = build_hud_json("2a")      # nothing diff() reports changed
+            path.write_text(json.dumps(hud))
+            hud = build_hud_json("3a")
+            hud["Balls"] = 1
+            path.write_text(json.dumps(hud))
+            return first, await diffs.get()
+
+    first, second = _run(main())
+    assert "defensive_diamond" in first.changes
+    assert (second.hud.event_number, second.changes) == ("3a", {"count": (1, 1, 1)})
+
+
+def test_a_failing_diff_does_not_end_the_stream(tmp_path, monkeypatch):
+    path = tmp_path / "decoded.hud.json"
+    original = hud_watcher.HudObj.diff
+
+    def diff(hud, previous):
+        if hud.event_number == "1a":
+            raise KeyError("Half Inning")
+        return original(hud, previous)
+    monkeypatch.setattr(hud_watcher.HudObj, "diff", diff)
+
+    async def main():
+        async with AsyncHudWatcher([path], interval=0.01, use_inotify=False) as watcher:
+            diffs = watcher.subscribe(diffs=True)
+            _write(path, "1a")
+            await asyncio.sleep(0.05)
+            _write(path, "2a")
+            return await diffs.get()
+
+    update = _run(main())
+    assert update.hud.event_number == "2a" and "count" in update.changes
+
+
+def test_wait_holds_back_the_stream_and_latest_conflates(tmp_path):
+    path = tmp_path / "decoded.hud.json"
+
+    async def main():
+        async with AsyncHudWatcher([path], interval=0.005, use_inotify=False) as watcher:
+            lossless = watcher.subscribe(maxsize=1)
+            latest = watcher.subscribe(overflow="latest", diffs=True)
+            for n, balls in enumerate((1, 2, 3), start=1):
+                hud = build_hud_json(f"{n}a")
+                hud["Balls"] = balls
+                path.write_text(json.dumps(hud))
+                await asyncio.sleep(0.05)
+            # the publisher is parked on the full lossless buffer
+            assert len(lossless) == 1
+            first = await lossless.get()
+            await asyncio.sleep(0.05)
+            pending = len(latest)
+            merged = await latest.get()
+            return first, pending, merged, latest.replaced
+
+    first, pending, merged, replaced = _run(main())
+    assert first.hud.event_number == "1a"
+    assert pending == 1 and replaced >= 1
+    assert merged.hud.event_number == "2a"
+    assert "defensive_diamond" in merged.changes and merged.changes["count"] == (2, 1, 1)
@@ -0,0 +1,133 @@
+"""Ingest manifests: a rerun does only the new work, and gives the same output.
+
+Unchanged files must be reused without parsing, changed or new files must be
+reprocessed, and a job run with a manifest must write exactly what a full
+run writes.
+"""
+import json
+import os
+
+import pytest
+
+from conftest import build_game
+from pyrio import pitch_csv
+from pyrio.hit_simulator import hit_sim_validation
+from pyrio.ingest_manifest import IngestManifest
+from pyrio.stat_file_parser import StatObj
+
+
+def _write_game(directory, game_id, away_score=1):
+    path = directory / f"{game_id}.decoded.json"
+    path.write_text(json.dumps(build_game(game_id, **{"Away Score": away_score}).statJson))
+    return path
+
+
+@pytest.fixture
+def stat_dir(tmp_path):
+    directory = tmp_path / "stats"
+    directory.mkdir()
+    for game_id in ("A1", "B2", "C3"):
+        _write_game(directory, game_id)
+    return directory
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    paths = []
+    original = StatObj.from_path.__func__
+    monkeypatch.setattr(StatObj, "from_path",
+                        classmethod(lambda cls, path, **kw: paths.append(os.path.basename(path))
+                                    or original(cls, path, **kw)))
+    return paths
+
+
+# --- manifest -------------------------------------------------------------
+
+def test_unchanged_files_are_hits_and_changed_files_misses(stat_dir, tmp_path):
+    manifest_path = tmp_path / "m.json"
+    path = stat_dir / "A1.decoded.json"
+    with IngestManifest(manifest_path) as manifest:
+        assert manifest.lookup(path) is None
+        manifest.record(path, {"rows": 3})
+
+    assert IngestManifest(manifest_path).lookup(path) == {"rows": 3}
+    # touched but identical content is still a hit
+    os.utime(path, ns=(1, 1))
+    assert IngestManifest(manifest_path).lookup(path) == {"rows": 3}
+    _write_game(stat_dir, "A1", away_score=5)
+    assert IngestManifest(manifest_path).lookup(path) is None
+
+
+def test_changed_params_and_corrupt_manifests_are_empty(stat_dir, tmp_path):
+    manifest_path = tmp_path / "m.json"
+    path = stat_dir / "A1.decoded.json"
+    with IngestManifest(manifest_path, params={"tags": {"b", "a"}}) as manifest:
+        manifest.record(path, 1)
+    assert IngestManifest(manifest_path, params={"tags": {"a", "b"}}).lookup(path) == 1
+    assert IngestManifest(manifest_path, params={"tags": {"a"}}).lookup(path) is None
+    manifest_path.write_text("{not json")
+    assert IngestManifest(manifest_path).lookup(path) is None
+
+
+def test_outputs_live_outside_the_manifest(stat_dir, tmp_path):
+    manifest_path = tmp_path / "m.json"
+    a1, b2 = stat_dir / "A1.decoded.json", stat_dir / "B2.decoded.json"
+    with IngestManifest(manifest_path) as manifest:
+        manifest.record(a1, {"rows": list(range(100))})
+        manifest.record(b2, {"rows": [1]})
+    files = json.loads(manifest_path.read_text())["files"]
+    assert all(set(entry) == {"size", "mtime_ns", "hash"} for entry in files.values())
+    outputs = tmp_path / "m.json.d"
+    assert sorted(os.listdir(outputs)) == sorted(entry["hash"] + ".json" for entry in files.values())
+
+    # a changed file's old output, and a dropped file's, are removed on save
+    _write_game(stat_dir, "A1", away_score=5)
+    with IngestManifest(manifest_path) as manifest:
+        assert manifest.lookup(a1) is None
+        manifest.record(a1, {"rows": [2]})
+    assert len(os.listdir(outputs)) == 1
+    assert IngestManifest(manifest_path).lookup(a1) == {"rows": [2]}
+
+    # a missing output is a miss, not an error
+    for name in os.listdir(outputs):
+        os.remove(outputs / name)
+    assert IngestManifest(manifest_path).lookup(a1) is None
+
+
+# --- jobs -----------------------------------------------------------------
+
+def test_pitch_csv_rerun_parses_only_new_and_changed_files(stat_dir, tmp_path, parsed):
+    manifest_path = tmp_path / "pitches.manifest.json"
+    full, incremental = tmp_path / "full.csv", tmp_path / "incremental.csv"
+
+    pitch_csv.write_pitch_csv(str(stat_dir), incremental, manifest=manifest_path)
+    assert sorted(parsed) == ["A1.decoded.json", "B2.decoded.json", "C3.decoded.json"]
+
+    parsed.clear()
+    _write_game(stat_dir, "D4")
+    _write_game(stat_dir, "B2", away_score=4)
+    pitch_csv.write_pitch_csv(str(stat_dir), incremental, manifest=manifest_path)
+    assert sorted(parsed) == ["B2.decoded.json", "D4.decoded.json"]
+
+    pitch_csv.write_pitch_csv(sorted(pitch_csv.load_statobjs_from_directory(stat_dir),
+                                     key=lambda sf: sf.gameID()), full)
+    assert incremental.read_text() == full.read_text()
+
+
+def test_pitch_csv_manifest_needs_a_directory(stat, tmp_path):
+    with pytest.raises(ValueError):
+        pitch_csv.write_pitch_csv([stat], tmp_path / "out.csv", manifest=tmp_path / "m.json")
+
+
+def test_validate_directory_rerun_reuses_reports(stat_dir, tmp_path, parsed):
+    manifest_path = tmp_path / "validation.manifest.json"
+    (stat_dir / "Z9.decoded.json").write_text("{")
+    opts = {"active_tags": frozenset()}
+    expected = hit_sim_validation.validate_directory(stat_dir, **opts).summary()
+
+    parsed.clear()
+    assert hit_sim_validation.validate_directory(stat_dir, manifest=manifest_path, **opts).summary() == expected
+    parsed.clear()
+    assert hit_sim_validation.validate_directory(stat_dir, manifest=manifest_path, **opts).summary() == expected
+    # only the file that failed to load is tried again
+    assert parsed == ["Z9.decoded.json"]
@@ -0,0 +1,78 @@
+"""JSON backends: interchangeable, whichever one is installed.
+
+Every available backend must give the same dicts, raise the same error type,
+and load StatObjs that compare equal; the typed decode must agree with the
+dict accessors.
+"""
+import json
+
+import pytest
+
+from pyrio import json_backend
+from pyrio.stat_file_parser import EventObj, StatObj
+
+BACKENDS = json_backend.available_backends()
+
+
+@pytest.fixture(autouse=True)
+def _restore_backend():
+    yield
+    json_backend.set_backend()
+
+
+@pytest.fixture
+def stat_path(tmp_path, stat_json):
+    path = tmp_path / "decoded.test.json"
+    path.write_text(json.dumps(stat_json))
+    return str(path)
+
+
+def test_stdlib_is_always_available():
+    assert BACKENDS[-1] == "json"
+    assert json_backend.get_backend() in BACKENDS
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_decode_identically(backend, stat_json, stat_path):
+    json_backend.set_backend(backend)
+    assert json_backend.get_backend() == backend
+    assert json_backend.loads(json.dumps(stat_json)) == stat_json
+    assert json_backend.load_path(stat_path) == stat_json
+    assert StatObj.from_path(stat_path).statJson == stat_json
+    lazy = StatObj.from_path(stat_path, lazy_events=True)
+    assert lazy.events() == stat_json["Events"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_raise_jsondecodeerror(backend):
+    json_backend.set_backend(backend)
+    with pytest.raises(json.JSONDecodeError):
+        json_backend.loads('{"GameID": ')
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        json_backend.set_backend("yaml")
+
+
+def test_benchmark_times_every_backend(stat_path):
+    timings = json_backend.benchmark([stat_path], repeat=1)
+    assert set(timings) == set(BACKENDS)
+    assert all(seconds >= 0 for seconds in timings.values())
+
+
+def test_typed_decode_matches_the_dict_accessors(stat, stat_json):
+    pytest.importorskip("msgspec")
+    game = json_backend.decode_stat_file_typed(json.dumps(stat_json))
+    assert (game.away_player, game.home_score) == (stat.player(0), stat.score(1))
+    assert game.character_game_stats == stat_json["Character Game Stats"]
+    assert len(game.events) == len(stat.events())
+    for i, typed in enumerate(game.events):
+        ev = EventObj(stat, i)
+        assert (typed.inning, typed.balls, typed.rbi) == (ev.inning(), ev.balls(), ev.rbi())
+        assert (typed.pitch is None) == (not ev.pitch_dict())
+        if typed.pitch is not None and typed.pitch.contact is not None:
+            assert typed.pitch.contact.rng1 == "4,552"
+            assert (typed.pitch.contact.first_fielder is None) == (not ev.first_fielder_dict())
+    assert game.events[3].runner_1b.steal == "Normal"
+    assert not hasattr(game.events[0], "__dict__")
@@ -0,0 +1,71 @@
+"""Parallel directory loading: same answers as the serial loop, just sooner.
+
+Whatever the worker count, chunk size or in-flight bound, every file is
+loaded exactly once, ``ordered=True`` preserves input order, and unloadable
+files are reported rather than silently dropped.
+"""
+import json
+import operator
+
+import pytest
+
+from conftest import build_game
+from pyrio import pitch_csv
+from pyrio.parallel_loader import decoded_paths, load_directory, map_stat_files
+
+GAME_IDS = [f"{n:X}" for n in range(1, 12)]
+
+
+@pytest.fixture
+def stat_dir(tmp_path):
+    for game_id in GAME_IDS:
+        (tmp_path / f"game{int(game_id, 16):02d}.decoded.json").write_text(json.dumps(build_game(game_id).statJson))
+    (tmp_path / "notes.txt").write_text("not a stat file")
+    return tmp_path
+
+
+game_id = operator.methodcaller("gameID")
+
+
+def test_decoded_paths_are_sorted_and_filtered(stat_dir):
+    paths = decoded_paths(stat_dir)
+    assert len(paths) == len(GAME_IDS)
+    assert paths == sorted(paths)
+
+
+@pytest.mark.parametrize("workers, chunksize, max_in_flight", [(0, 4, None), (2, 1, 1), (3, 2, None)])
+def test_ordered_results_match_the_serial_loop(stat_dir, workers, chunksize, max_in_flight):
+    results = list(load_directory(stat_dir, game_id, workers=workers, chunksize=chunksize,
+                                  max_in_flight=max_in_flight, ordered=True))
+    assert [path for path, _ in results] == decoded_paths(stat_dir)
+    assert [gid for _, gid in results] == [int(g, 16) for g in GAME_IDS]
+
+
+def test_unordered_results_cover_every_file_once(stat_dir):
+    results = list(load_directory(stat_dir, game_id, workers=2, chunksize=3))
+    assert sorted(gid for _, gid in results) == [int(g, 16) for g in GAME_IDS]
+
+
+def test_without_fn_the_stat_objs_come_back(stat_dir):
+    stats = list(pitch_csv.load_statobjs_from_directory(stat_dir, workers=2))
+    assert [stat.gameID() for stat in stats] == [int(g, 16) for g in GAME_IDS]
+    assert stats[0].characterName(0, 0) == "Mario"
+
+
+def test_load_errors_raise_or_go_to_on_error(stat_dir):
+    broken = stat_dir / "game99.decoded.json"
+    broken.write_text("{not json")
+    with pytest.raises(json.JSONDecodeError):
+        list(load_directory(stat_dir, game_id, workers=2))
+
+    failed = []
+    results = list(map_stat_files(decoded_paths(stat_dir), game_id, workers=2, ordered=True,
+                                  on_error=lambda path, ex: failed.append(path)))
+    assert failed == [str(broken)]
+    assert len(results) == len(GAME_IDS)
+
+
+def test_stopping_early_shuts_the_pool_down(stat_dir):
+    results = load_directory(stat_dir, game_id, workers=2, chunksize=1)
+    assert next(results)[1] in {int(g, 16) for g in GAME_IDS}
+    results.close()
@@ -0,0 +1,122 @@
+"""Pitch rows: one per pitch, in the header's order, whatever the output.
+
+The per-game context is resolved once, so the rows must not depend on the
+stat-file layout, and the CSV and Parquet writers must hold the same rows.
+"""
+
+import numpy as np
+import pytest
+
+from conftest import build_game, build_stat_json
+from pyrio import pitch_csv
+from pyrio.stat_file_parser import StatObj
+
+
+@pytest.mark.parametrize("include_character_attributes", [False, True])
+def test_one_row_per_pitch_matching_the_header(stat, include_character_attributes):
+    rows = list(pitch_csv.pitch_rows_from_statobj(stat, include_character_attributes))
+    header = pitch_csv.make_header(include_character_attributes)
+    assert [row[0] for row in rows] == np.flatnonzero(stat.compiled().has_pitch).tolist()
+    assert {len(row) for row in rows} == {len(header)}
+
+    first = dict(zip(header, rows[3]))
+    assert (first["pitchingCharacter"], first["battingCharacter"]) == ("Bowser", "Luigi")
+    assert first["runners"] == 1 and first["stadium"] == stat.stadium()
+
+
+def test_rows_do_not_depend_on_the_layout_version(stat):
+    assert list(pitch_csv.pitch_rows_from_statobj(StatObj(build_stat_json("1.9.3")))) == \
+        list(pitch_csv.pitch_rows_from_statobj(stat))
+
+
+def test_parquet_holds_the_csv_rows(stat, tmp_path):
+    pytest.importorskip("pyarrow")
+    import pandas as pd
+
+    pitch_csv.write_pitch_csv([stat, stat], tmp_path / "pitches.csv")
+    pitch_csv.write_pitch_parquet([stat, stat], tmp_path / "pitches.parquet", rows_per_group=4)
+    from_csv = pd.read_csv(tmp_path / "pitches.csv", keep_default_na=False)
+    from_parquet = pd.read_parquet(tmp_path / "pitches.parquet")
+    assert list(from_parquet.columns) == list(from_csv.columns)
+    pd.testing.assert_frame_equal(from_parquet, from_csv, check_dtype=False)
+
+
+def test_parquet_with_starred_attributes_keeps_one_schema(stat_json, tmp_path):
+    pytest.importorskip("pyarrow")
+    import pandas as pd
+    import pyarrow.parquet as pq
+
+    stat_json["Events"][2]["Batter Roster Loc"] = 2    # the starred slot bats
+    stat = StatObj(stat_json)
+    path = tmp_path / "pitches.parquet"
+    pitch_csv.write_pitch_parquet([stat, stat, stat], path, include_character_attributes=True,
+                                  rows_per_group=4)
+    parquet_file = pq.ParquetFile(path)
+    assert parquet_file.metadata.num_row_groups > 1
+    assert parquet_file.schema_arrow.field("batter_Speed").type == "int64"
+
+    pitch_csv.write_pitch_csv([stat, stat, stat], tmp_path / "pitches.csv", include_character_attributes=True)
+    from_csv = pd.read_csv(tmp_path / "pitches.csv", keep_default_na=False)
+    from_parquet = pd.read_parquet(path)
+    pd.testing.assert_frame_equal(from_parquet, from_csv, check_dtype=False)
+    starred = from_parquet["batterStarred"]
+    assert starred.any() and (from_parquet.loc[starred, "batter_Speed"] > 50).all()
+
+
+# --- parallel export --------------------------------------------------------
+
+@pytest.fixture
+def stat_dir(tmp_path):
+    import json
+    directory = tmp_path / "stats"
+    directory.mkdir()
+    for n in range(1, 6):
+        (directory / f"{n}.decoded.json").write_text(json.dumps(build_game(f"{n:X}").statJson))
+    return directory
+
+
+def _serial_csv(stat_dir, path, include_character_attributes=False):
+    stats = sorted(pitch_csv.load_statobjs_from_directory(stat_dir), key=lambda sf: sf.gameID())
+    pitch_csv.write_pitch_csv(stats, path, include_character_attributes)
+    return path.read_text()
+
+
+@pytest.mark.parametrize("include_character_attributes", [False, True])
+def test_sharded_export_merges_to_the_serial_file(stat_dir, tmp_path, include_character_attributes):
+    out = tmp_path / "pitches.csv"
+    pitch_csv.write_pitch_csv(str(stat_dir), out, include_character_attributes,
+                              workers=2, files_per_shard=2)
+    assert out.read_text() == _serial_csv(stat_dir, tmp_path / "serial.csv", include_character_attributes)
+    assert not list(tmp_path.glob(".pitch-shards-*"))
+
+
+def test_zero_workers_shards_in_process(stat_dir, tmp_path, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("workers=0 must not start a pool")
+    monkeypatch.setattr(pitch_csv, "ProcessPoolExecutor", no_pool)
+    out = tmp_path / "pitches.csv"
+    pitch_csv.write_pitch_csv(str(stat_dir), out, True, workers=0, files_per_shard=2)
+    assert out.read_text() == _serial_csv(stat_dir, tmp_path / "serial.csv", True)
+
+
+def test_partitioned_export_keeps_one_headed_part_per_shard(stat_dir, tmp_path):
+    import pandas as pd
+    out = tmp_path / "pitches"
+    pitch_csv.write_pitch_csv(str(stat_dir), out, workers=2, partitioned=True, files_per_shard=2)
+    parts = sorted(out.glob("part-*.csv"))
+    assert len(parts) == 3
+    merged = pd.concat([pd.read_csv(part, keep_default_na=False) for part in parts], ignore_index=True)
+    _serial_csv(stat_dir, tmp_path / "serial.csv")
+    pd.testing.assert_frame_equal(merged, pd.read_csv(tmp_path / "serial.csv", keep_default_na=False))
+
+
+def test_manifest_rerun_in_the_pool(stat_dir, tmp_path):
+    out = tmp_path / "pitches.csv"
+    for _ in range(2):
+        pitch_csv.write_pitch_csv(str(stat_dir), out, manifest=tmp_path / "m.json", workers=2)
+        assert out.read_text() == _serial_csv(stat_dir, tmp_path / "serial.csv")
+
+
+def test_parallel_export_needs_a_directory(stat, tmp_path):
+    with pytest.raises(ValueError):
+        pitch_csv.write_pitch_csv([stat], tmp_path / "out.csv", workers=2)
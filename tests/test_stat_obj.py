@@ -0,0 +1,255 @@
+"""StatObj roster resolution: resolved once, and never a different answer.
+
+Team-total methods used to rebuild the roster nine times per call. These tests
+pin down that the memoized path gives the same numbers as summing the slots
+by hand, across the old and new stat-file layouts.
+"""
+import json
+import math
+from datetime import datetime
+
+import pytest
+
+from pyrio import stat_file_parser
+from pyrio.stat_file_parser import EventObj, StatObj
+
+TEAM_TOTAL_METHODS = [
+    "battersFaced", "runsAllowed", "battersWalkedBallFour", "battersHitByPitch",
+    "hitsAllowed", "homerunsAllowed", "pitchesThrown", "stamina", "strikeoutsPitched",
+    "starPitchesThrown", "bigPlays", "outsPitched",
+    "atBats", "hits", "singles", "doubles", "triples", "homeruns", "buntsLanded",
+    "sacFlys", "strikeouts", "walksBallFour", "walksHitByPitch", "rbi",
+    "basesStolen", "starHitsUsed",
+]
+
+
+def test_roster_is_built_once_per_team(stat, monkeypatch):
+    calls = []
+    original = stat_file_parser.RosterObj
+    monkeypatch.setattr(stat_file_parser, "RosterObj",
+                        lambda *a: calls.append(a) or original(*a))
+    for team in (0, 1):
+        stat.hits(team)
+        stat.battersFaced(team)
+        stat.characterName(team)
+        for slot in range(9):
+            stat.atBats(team, slot)
+    assert len(calls) == 2
+    assert stat.roster_obj(0) is stat.roster_obj(0)
+
+
+@pytest.mark.parametrize("method", TEAM_TOTAL_METHODS)
+@pytest.mark.parametrize("team", [0, 1])
+def test_team_totals_equal_the_sum_of_the_slots(stat, method, team):
+    fn = getattr(stat, method)
+    assert fn(team) == sum(fn(team, slot) for slot in range(9))
+
+
+@pytest.mark.parametrize("version", ["1.9.1", "1.9.3"])
+def test_old_layouts_resolve_to_the_same_rosters(stat, version):
+    from conftest import build_stat_json
+    old = StatObj(build_stat_json(version))
+    for team in (0, 1):
+        assert old.characterName(team) == stat.characterName(team)
+        assert old.captain(team) == stat.captain(team)
+        assert old.isStarred(team, 2) == stat.isStarred(team, 2)
+
+
+# --- canonical layout -----------------------------------------------------
+
+@pytest.mark.parametrize("version", ["Pre 0.1.7", "1.9.1", "1.9.3", "1.9.5"])
+def test_every_version_normalizes_to_the_same_layout(stat, version):
+    from conftest import build_stat_json
+    stat_json = build_stat_json(version)
+    if version == "Pre 0.1.7":
+        del stat_json["Version"]
+    old = StatObj(stat_json)
+    assert old.version() == version
+    for team in (0, 1):
+        assert old.teamNumVersionCorrection(team) == (1 - team if version in ("Pre 0.1.7", "1.9.1") else team)
+        assert old.characterName(team) == stat.characterName(team)
+        for slot in range(9):
+            assert old.getTeamString(team, slot) in stat_json["Character Game Stats"]
+    assert (old.gameID(), old.startDate(), old.endDate()) == (stat.gameID(), stat.startDate(), stat.endDate())
+
+
+def test_header_fields_are_parsed_once(stat_json):
+    stat_json.update({"GameID": "1A,2B3C", "StadiumID": "Wario's Palace"})
+    stat = StatObj(stat_json)
+    stat_json.update({"GameID": "FF", "StadiumID": "Mario Stadium", "Date - Start": "garbage"})
+    assert stat.gameID() == 0x1A2B3C
+    assert stat.stadium() == "Wario Palace"
+    assert stat.startDate() == datetime(2025, 3, 1, 20, 0)
+
+
+def test_missing_header_fields_raise_when_asked_for(stat_json):
+    del stat_json["Date - End"]
+    stat_json["GameID"] = "not hex"
+    stat = StatObj(stat_json)
+    with pytest.raises(KeyError):
+        stat.endDate()
+    with pytest.raises(ValueError):
+        stat.gameID()
+    with pytest.raises(Exception):
+        stat.getTeamString(2, 0)
+
+
+# --- box score ------------------------------------------------------------
+
+BOX_SCORE_METHODS = {
+    "at_bats": "atBats", "hits": "hits", "singles": "singles", "doubles": "doubles",
+    "triples": "triples", "homeruns": "homeruns", "walks_bb": "walksBallFour",
+    "walks_hbp": "walksHitByPitch", "strikeouts": "strikeouts", "rbi": "rbi",
+    "stolen_bases": "basesStolen", "bunts": "buntsLanded", "sac_flys": "sacFlys",
+    "star_hits": "starHitsUsed", "batters_faced": "battersFaced",
+    "outs_pitched": "outsPitched", "runs_allowed": "runsAllowed",
+    "hits_allowed": "hitsAllowed", "hrs_allowed": "homerunsAllowed",
+    "strikeouts_pitched": "strikeoutsPitched", "total_pitches": "pitchesThrown",
+    "star_pitches": "starPitchesThrown", "stamina": "stamina", "big_plays": "bigPlays",
+    "avg": "battingAvg", "obp": "obp", "slg": "slg", "ops": "ops",
+    "innings_pitched": "inningsPitched",
+}
+
+
+def test_box_score_has_one_row_per_roster_slot(stat):
+    df = stat.box_score()
+    assert len(df) == 18
+    assert list(df["team"]) == [0] * 9 + [1] * 9
+    assert list(df["roster"]) == list(range(9)) * 2
+    assert list(df["char_id"]) == stat.characterName(0) + stat.characterName(1)
+    assert list(df["player"].unique()) == [stat.player(0), stat.player(1)]
+
+
+@pytest.mark.parametrize("column, method", sorted(BOX_SCORE_METHODS.items()))
+def test_box_score_matches_the_per_character_methods(stat, column, method):
+    df = stat.box_score()
+    for row in df.itertuples():
+        try:
+            expected = getattr(stat, method)(row.team, row.roster)
+        except ZeroDivisionError:
+            assert math.isnan(getattr(row, column))
+            continue
+        assert getattr(row, column) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("version", ["1.9.1", "1.9.3"])
+def test_box_score_and_the_methods_agree_on_old_layouts(stat, version):
+    # Flipped versions used to correct the team twice in the stat methods.
+    from conftest import build_stat_json
+    old = StatObj(build_stat_json(version))
+    df = old.box_score()
+    assert df.drop(columns="player").equals(stat.box_score().drop(columns="player"))
+    for column, method in BOX_SCORE_METHODS.items():
+        for row in df.itertuples():
+            try:
+                expected = getattr(old, method)(row.team, row.roster)
+            except ZeroDivisionError:
+                assert math.isnan(getattr(row, column))
+                continue
+            assert getattr(row, column) == pytest.approx(expected)
+            assert expected == pytest.approx(getattr(stat, method)(row.team, row.roster))
+
+
+def test_box_score_rates_are_nan_rather_than_raising(stat):
+    df = stat.box_score()
+    non_pitchers = df[df["outs_pitched"] == 0]
+    assert len(non_pitchers) > 0
+    assert non_pitchers["era"].isna().all()
+    pitchers = df[df["outs_pitched"] > 0]
+    for row in pitchers.itertuples():
+        assert row.era == pytest.approx(stat.era(row.team, row.roster))
+
+
+# --- lazy loading -----------------------------------------------------------
+
+@pytest.fixture
+def stat_path(tmp_path, stat_json):
+    path = tmp_path / "decoded.test.json"
+    path.write_text(json.dumps(stat_json, indent=4))
+    return str(path)
+
+
+def test_lazy_load_parses_the_header_without_the_events(stat_path, stat):
+    lazy = StatObj.from_path(stat_path, lazy_events=True)
+    assert "Events" not in lazy.statJson
+    assert lazy.player(1) == stat.player(1)
+    assert lazy.stadium() == stat.stadium()
+    assert lazy.characterName(0) == stat.characterName(0)
+    assert lazy.box_score().equals(stat.box_score())
+    assert "Events" not in lazy.statJson
+
+
+def test_lazy_events_are_decoded_on_first_use(stat_path, stat):
+    lazy = StatObj.from_path(stat_path, lazy_events=True)
+    assert lazy.events() == stat.events()
+    assert lazy.events() is lazy.statJson["Events"]
+    assert lazy.final_event() == stat.final_event()
+
+
+def test_eager_and_lazy_loads_agree(stat_path, stat_json):
+    assert StatObj.from_path(stat_path).statJson == stat_json
+    lazy = StatObj.from_path(stat_path, lazy_events=True)
+    lazy.events()
+    assert lazy.statJson == stat_json
+
+
+def test_events_not_last_falls_back_to_a_full_parse(tmp_path, stat_json):
+    reordered = {"Events": stat_json["Events"],
+                 **{k: v for k, v in stat_json.items() if k != "Events"}}
+    path = tmp_path / "decoded.reordered.json"
+    path.write_text(json.dumps(reordered))
+    lazy = StatObj.from_path(str(path), lazy_events=True)
+    assert lazy.player(0) == "AwayUser"
+    assert lazy.events() == stat_json["Events"]
+
+
+@pytest.mark.parametrize("escaped", [False, True])
+def test_only_a_trailing_events_array_is_split(tmp_path, stat_json, escaped):
+    # Events first and another array last: the file still ends in "]}"
+    reordered = {"Events": stat_json["Events"],
+                 **{k: v for k, v in stat_json.items() if k != "Events"},
+                 "Notes": ['replay "[1]"' if escaped else "replay [1]", "]"]}
+    path = tmp_path / "decoded.list_last.json"
+    path.write_text(json.dumps(reordered))
+    lazy = StatObj.from_path(str(path), lazy_events=True)
+    assert lazy.gameID() == StatObj(stat_json).gameID()
+    assert lazy.events() == stat_json["Events"]
+
+    # a bracket inside a string doesn't end a trailing Events array early
+    stat_json["Events"][0]["Notes"] = "]] [["
+    path.write_text(json.dumps(stat_json))
+    lazy = StatObj.from_path(str(path), lazy_events=True)
+    assert "Events" not in lazy.statJson
+    assert lazy.events() == stat_json["Events"]
+
+
+# --- event cursor -----------------------------------------------------------
+
+EVENT_ACCESSORS = ["inning", "half_inning", "balls", "strikes", "rbi", "result_of_AB",
+                   "batter", "pitcher", "pitch_dict", "contact_dict", "first_fielder_dict",
+                   "pitch_type", "type_of_contact", "ball_velocity", "ball_landing_position",
+                   "first_fielder_location", "first_fielder_position"]
+
+
+def test_iter_events_moves_one_cursor_over_every_event(stat):
+    seen = []
+    for i, cursor in enumerate(stat.iter_events()):
+        fresh = EventObj(stat, i)
+        assert cursor.eventIndex == i
+        for accessor in EVENT_ACCESSORS:
+            assert getattr(cursor, accessor)() == getattr(fresh, accessor)(), accessor
+        seen.append(cursor)
+    assert len(seen) == len(stat.events())
+    assert all(cursor is seen[0] for cursor in seen)
+
+
+def test_iter_events_visits_only_the_requested_events(stat):
+    assert [ev.eventIndex for ev in stat.iter_events([6, 2, 3])] == [6, 2, 3]
+    assert [ev.result_of_AB() for ev in stat.iter_events([6, 2])] == ["HR", "Single"]
+
+
+def test_event_obj_is_slotted(stat):
+    ev = EventObj(stat, 0)
+    assert not hasattr(ev, "__dict__")
+    assert ev.pitch_dict() is stat.events()[0]["Pitch"]
+    assert ev.contact_dict() == {} and ev.ball_velocity() == (None, None, None)
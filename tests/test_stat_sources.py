@@ -0,0 +1,129 @@
+"""Stat files read in place from compressed files and zip/tar bundles.
+
+Every source must load the same game as the extracted file, in the pool and
+in-process, and the directory jobs must give the same output on a folder of
+bundles as on the extracted folder. Damaged archives are load errors.
+"""
+import gzip
+import io
+import json
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from conftest import build_game
+from pyrio import pitch_csv, stat_sources
+from pyrio.hit_simulator import hit_sim_validation
+from pyrio.ingest_manifest import IngestManifest
+from pyrio.parallel_loader import decoded_paths, load_directory
+from pyrio.stat_file_parser import StatObj
+from pyrio.stat_sources import SEP, list_sources, read_source
+
+
+def _game(game_id):
+    return json.dumps(build_game(game_id).statJson).encode()
+
+
+def _tar(target, mode, members):
+    opened = tarfile.open(fileobj=target, mode=mode) if isinstance(target, io.BytesIO) else tarfile.open(target, mode)
+    with opened as tar:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+@pytest.fixture
+def bundles(tmp_path):
+    """A folder of bundles, and the same games extracted."""
+    directory, extracted = tmp_path / "archived", tmp_path / "extracted"
+    directory.mkdir()
+    extracted.mkdir()
+    games = {f"{n:X}": _game(f"{n:X}") for n in range(1, 9)}
+    for game_id, data in games.items():
+        (extracted / f"{game_id}.decoded.json").write_bytes(data)
+
+    (directory / "1.decoded.json").write_bytes(games["1"])
+    (directory / "2.decoded.json.gz").write_bytes(gzip.compress(games["2"]))
+    with zipfile.ZipFile(directory / "a.zip", "w", zipfile.ZIP_DEFLATED) as bundle:
+        bundle.writestr("season/3.decoded.json", games["3"])
+        bundle.writestr("season/4.decoded.json.gz", gzip.compress(games["4"]))
+        bundle.writestr("season/readme.txt", b"not a stat file")
+    _tar(directory / "b.tar", "w", {"5.decoded.json": games["5"]})
+    _tar(directory / "c.tar.gz", "w:gz", {"8.decoded.json": games["8"], "6.decoded.json": games["6"],
+                                          "7.decoded.json": games["7"]})
+    return directory, extracted
+
+
+def test_sources_list_bundle_members(bundles):
+    directory, _ = bundles
+    names = [os.path.relpath(source, directory) for source in list_sources(directory)]
+    assert names == ["1.decoded.json", "2.decoded.json.gz",
+                     f"a.zip{SEP}season/3.decoded.json", f"a.zip{SEP}season/4.decoded.json.gz",
+                     f"b.tar{SEP}5.decoded.json",
+                     # compressed tars keep archive order, so they are read front to back
+                     f"c.tar.gz{SEP}8.decoded.json", f"c.tar.gz{SEP}6.decoded.json",
+                     f"c.tar.gz{SEP}7.decoded.json"]
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+@pytest.mark.parametrize("lazy_events", [False, True])
+def test_every_source_loads_its_game(bundles, workers, lazy_events):
+    directory, extracted = bundles
+    loaded = {stat.gameID(): stat for _, stat in load_directory(directory, workers=workers,
+                                                                 lazy_events=lazy_events, chunksize=2)}
+    assert sorted(loaded) == list(range(1, 9))
+    for game_id, stat in loaded.items():
+        assert stat.events() == StatObj.from_path(extracted / f"{game_id:X}.decoded.json").events()
+
+
+def test_compressed_tar_members_read_out_of_order(bundles):
+    directory, _ = bundles
+    sources = list_sources(directory)[-3:]
+    for source in reversed(sources):
+        assert json.loads(read_source(source))["GameID"] == source.split(SEP)[1][0]
+
+
+def test_jobs_match_the_extracted_folder(bundles, tmp_path):
+    directory, extracted = bundles
+    opts = {"active_tags": frozenset()}
+    assert hit_sim_validation.validate_directory(directory, workers=2, **opts).summary() == \
+        hit_sim_validation.validate_directory(extracted, **opts).summary()
+
+    def rows(source):
+        return sorted(pitch_csv.load_statobjs_from_directory(source), key=lambda sf: sf.gameID())
+    pitch_csv.write_pitch_csv(rows(directory), tmp_path / "archived.csv")
+    pitch_csv.write_pitch_csv(rows(extracted), tmp_path / "extracted.csv")
+    assert (tmp_path / "archived.csv").read_text() == (tmp_path / "extracted.csv").read_text()
+
+
+def test_manifest_reuses_bundle_members(bundles, tmp_path):
+    directory, _ = bundles
+    manifest_path = tmp_path / "m.json"
+    with IngestManifest(manifest_path) as manifest:
+        for source in decoded_paths(directory):
+            manifest.record(source, 1)
+    manifest = IngestManifest(manifest_path)
+    assert [manifest.lookup(source) for source in decoded_paths(directory)] == [1] * 8
+
+
+def test_damaged_files_are_load_errors(tmp_path):
+    (tmp_path / "1.decoded.json.gz").write_bytes(b"\x1f\x8b not gzip")
+    (tmp_path / "broken.zip").write_bytes(b"PK not a zip")
+    (tmp_path / "2.decoded.zip").write_bytes(b"PK not a zip")
+    errors = []
+    assert list(load_directory(tmp_path, workers=0, on_error=lambda path, ex: errors.append(path))) == []
+    assert sorted(os.path.basename(path) for path in errors) == ["1.decoded.json.gz", "2.decoded.zip"]
+
+
+def test_zstd_sources(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    compressor = zstandard.ZstdCompressor()
+    (tmp_path / "1.decoded.json.zst").write_bytes(compressor.compress(_game("1")))
+    with open(tmp_path / "bundle.tar.zst", "wb") as f, compressor.stream_writer(f) as writer:
+        buffer = io.BytesIO()
+        _tar(buffer, "w", {"2.decoded.json": _game("2")})
+        writer.write(buffer.getvalue())
+    assert sorted(stat.gameID() for _, stat in load_directory(tmp_path, workers=0)) == [1, 2]